@@ -1,14 +1,66 @@
 """Algorithms module containing sorting and other algorithmic implementations."""
 
-from .sorting import merge_sort, quick_sort, partition, QsPivot, Comparable
-from .inversion import inversions_fast, inversion_slow
+from .backend import Backend
+from .sorting import (
+    merge_sort,
+    merge_sort_bottom_up,
+    quick_sort,
+    quick_sort_iter,
+    heap_sort,
+    adaptive_sort,
+    counting_sort,
+    radix_sort,
+    partition,
+    partition3,
+    block_partition,
+    QsPivot,
+    QsPartition,
+    Comparable,
+)
+from .inversion import (
+    inversions_fast,
+    inversion_slow,
+    count_inversions,
+    InversionCount,
+)
+from .fenwick import FenwickTree, InversionCounter
+from .parallel import parallel_sort, parallel_inversions
+from .external import external_sort
+from .selection import nth_element, select_k, top_k
+from .merge import kway_merge
+from .instrument import instrument, SortReport
+from .sorted_list import SortedList
 
 __all__ = [
+    'Backend',
     'merge_sort',
+    'merge_sort_bottom_up',
     'quick_sort',
+    'quick_sort_iter',
+    'heap_sort',
+    'adaptive_sort',
+    'counting_sort',
+    'radix_sort',
     'partition',
+    'partition3',
+    'block_partition',
     'QsPivot',
+    'QsPartition',
     'Comparable',
     'inversions_fast',
     'inversion_slow',
+    'count_inversions',
+    'InversionCount',
+    'FenwickTree',
+    'InversionCounter',
+    'parallel_sort',
+    'parallel_inversions',
+    'external_sort',
+    'nth_element',
+    'select_k',
+    'top_k',
+    'kway_merge',
+    'instrument',
+    'SortReport',
+    'SortedList',
 ]
@@ -0,0 +1,294 @@
+"""Backend selection between the pure-Python kernels and NumPy."""
+
+import array
+from collections.abc import Buffer
+from enum import Enum
+from typing import Any, Callable, Optional, Sequence, overload
+
+import numpy as np
+
+
+class Backend(Enum):
+    Auto = 1
+    Python = 2
+    NumPy = 3
+
+
+# Auto keeps lists shorter than this on the pure-Python path, where the
+# conversion to and from an ndarray would cost more than the sort itself
+NUMPY_MIN_LENGTH = 64
+# Largest value range counting sort accepts, bounding its table of counts
+COUNTING_SORT_MAX_SPAN = 1 << 22
+
+
+def numeric_array(values: Sequence[Any] | np.ndarray) -> Optional[np.ndarray]:
+    """
+    Return values as a numeric ndarray, or None if they are not numeric.
+
+    An ndarray with an integer or floating dtype is returned as is. A list
+    qualifies only if every element is exactly int or exactly float, so that
+    converting back with tolist() gives the same Python objects. Mixed
+    int/float lists, bools and ints that do not all fit in int64 or uint64
+    stay on the Python path, and so does float input holding NaN: it has no
+    consistent order, and the kernels and NumPy treat it differently.
+
+    Args:
+        values: The ndarray or list to inspect
+
+    Returns:
+        The numeric ndarray, or None for generic objects
+    """
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind == 'f':
+            return None if np.isnan(values).any() else values
+        return values if values.dtype.kind in 'iu' else None
+    if not isinstance(values, list) or not values:
+        return None
+
+    element_types = set(map(type, values))
+    if element_types != {int} and element_types != {float}:
+        return None
+    array = np.array(values)
+    if element_types == {int}:
+        # Ints mixing values >= 2**63 with negatives only fit in float64
+        return array if array.dtype.kind in 'iu' else None
+    if array.dtype.kind != 'f' or np.isnan(array).any():
+        return None
+    return array
+
+
+@overload
+def buffer_view[T](
+    arr: list[T] | np.ndarray, writable: bool = True
+) -> list[T] | np.ndarray: ...
+
+
+@overload
+def buffer_view[T](
+    arr: Sequence[T] | Buffer, writable: bool = True
+) -> Sequence[T] | np.ndarray: ...
+
+
+def buffer_view[T](
+    arr: Sequence[T] | Buffer, writable: bool = True
+) -> Sequence[T] | np.ndarray:
+    """
+    Return array.array and buffer-protocol inputs as an ndarray view.
+
+    The view shares memory with arr, so sorting it sorts arr in place and
+    the elements are never boxed into Python objects. Lists and ndarrays are
+    returned unchanged, and so are array.array typecodes NumPy cannot view
+    as numbers, such as 'u', which the pure-Python kernels sort in place.
+
+    Args:
+        arr: The list, ndarray, array.array or memoryview to process
+        writable: Whether the caller writes through the view
+
+    Returns:
+        An ndarray view of arr if it is a numeric buffer, arr itself
+        otherwise
+
+    Raises:
+        ValueError: If a buffer other than an array.array is not
+            one-dimensional and numeric, or the buffer is read-only while
+            writable is requested
+    """
+    if isinstance(arr, (list, np.ndarray)) or not isinstance(arr, Buffer):
+        return arr
+
+    try:
+        view = np.asarray(memoryview(arr))
+    except (TypeError, ValueError, NotImplementedError):
+        view = None
+    if view is None or view.ndim != 1 or view.dtype.kind not in 'iuf':
+        if isinstance(arr, array.array):
+            return arr
+        raise ValueError('buffer input must be one-dimensional and numeric')
+    if writable and not view.flags.writeable:
+        raise ValueError('buffer input is read-only')
+    return view
+
+
+def select_numeric[T](
+    arr: Sequence[T] | np.ndarray,
+    start: int,
+    end: int,
+    key: Optional[Callable[[T], Any]],
+    backend: Backend,
+) -> Optional[np.ndarray]:
+    """
+    Decide whether arr[start:end] is processed by the NumPy backend.
+
+    Args:
+        arr: The list or ndarray to process
+        start: The start index of the range (inclusive)
+        end: The end index of the range (exclusive)
+        key: The key function of the sort, NumPy cannot vectorize it
+        backend: The requested backend
+
+    Returns:
+        The range as a numeric ndarray if the NumPy backend is used, or None
+
+    Raises:
+        ValueError: If the NumPy backend is requested for unsupported input
+    """
+    if not isinstance(backend, Backend):
+        raise ValueError('backend must be a Backend enum value')
+    if backend == Backend.Python:
+        return None
+
+    values = None
+    if key is None:
+        is_array = isinstance(arr, np.ndarray)
+        if is_array or backend == Backend.NumPy or end - start >= NUMPY_MIN_LENGTH:
+            values = numeric_array(arr[start:end])
+
+    if values is None and backend == Backend.NumPy:
+        raise ValueError('NumPy backend requires numeric input and no key')
+    return values
+
+
+def int_span(values: np.ndarray) -> int:
+    """Return max - min of a non-empty integer array, as a Python int."""
+    return int(values.max()) - int(values.min())
+
+
+def numpy_counting_sort(values: np.ndarray) -> np.ndarray:
+    """
+    Sort an integer array by counting the occurrences of every value.
+
+    O(n + span) time and O(span) memory, where span is max - min.
+
+    Raises:
+        ValueError: If the values are not integers or their span exceeds
+            COUNTING_SORT_MAX_SPAN
+    """
+    if values.dtype.kind not in 'iu':
+        raise ValueError('counting sort requires integer values')
+    if len(values) == 0:
+        return values.copy()
+    if int_span(values) > COUNTING_SORT_MAX_SPAN:
+        raise ValueError('value range too large for counting sort')
+
+    # Offsets are computed in wrapping unsigned arithmetic, so they are exact
+    # for any integer dtype, and wrapped back to the dtype at the end
+    low = values.min().astype(np.uint64)
+    counts = np.bincount((values.astype(np.uint64) - low).astype(np.intp))
+    distinct = (np.arange(len(counts), dtype=np.uint64) + low).astype(values.dtype)
+    return np.repeat(distinct, counts)
+
+
+def numpy_radix_sort(values: np.ndarray, radix_bits: int = 8) -> np.ndarray:
+    """
+    Sort an integer array with byte-wise LSD radix passes.
+
+    The values are offset by their minimum, so negative values work, and one
+    stable bucket pass (np.argsort on the digit, which NumPy runs as a radix
+    sort for 8 and 16 bit digits) is made per radix_bits of the span.
+
+    Raises:
+        ValueError: If the values are not integers or radix_bits is not in
+            [1, 16]
+    """
+    if values.dtype.kind not in 'iu':
+        raise ValueError('radix sort requires integer values')
+    if not 1 <= radix_bits <= 16:
+        raise ValueError('radix_bits must be in [1, 16]')
+    if len(values) == 0:
+        return values.copy()
+
+    # Offsets are computed in wrapping unsigned arithmetic, as in counting sort
+    keys = values.astype(np.uint64) - values.min().astype(np.uint64)
+    digit_type = np.uint8 if radix_bits <= 8 else np.uint16
+    mask = np.uint64((1 << radix_bits) - 1)
+    order = np.arange(len(values))
+    for shift in range(0, int_span(values).bit_length(), radix_bits):
+        digits = ((keys[order] >> np.uint64(shift)) & mask).astype(digit_type)
+        order = order[np.argsort(digits, kind='stable')]
+    return values[order]
+
+
+def numpy_sort[T](
+    arr: list[T] | np.ndarray,
+    start: int,
+    end: int,
+    values: np.ndarray,
+    reverse: bool,
+) -> None:
+    """
+    Stable-sort values and write them back to arr[start:end].
+
+    The result is the same as a stable sort of the range. Equal integers are
+    indistinguishable, so integer ranges use counting sort when their span
+    is small compared to their length and NumPy's fastest, unstable sort
+    otherwise. Floats, where -0.0 and 0.0 compare equal, use np.sort with
+    kind='stable', reversed for descending order like
+    sorted(..., reverse=True).
+
+    Args:
+        arr: The list or ndarray that receives the sorted range
+        start: The start index of the range (inclusive)
+        end: The end index of the range (exclusive)
+        values: The numeric values of arr[start:end]
+        reverse: Sort in descending order
+    """
+    if values.dtype.kind in 'iu':
+        span = int_span(values)
+        if span <= COUNTING_SORT_MAX_SPAN and span <= 2 * len(values):
+            result = numpy_counting_sort(values)
+        else:
+            result = np.sort(values)
+        if reverse:
+            result = result[::-1]
+    elif reverse:
+        result = np.sort(values[::-1], kind='stable')[::-1]
+    else:
+        result = np.sort(values, kind='stable')
+
+    if isinstance(arr, np.ndarray):
+        arr[start:end] = result
+    else:
+        arr[start:end] = result.tolist()
+
+
+def numpy_inversions(values: np.ndarray) -> int:
+    """
+    Count the inversions of a numeric array with vectorized block merges.
+
+    The values are replaced by their dense ranks and padded to a power of two
+    with a rank larger than all others. Level by level, each row holds two
+    sorted blocks; np.searchsorted over the left blocks, offset per row so
+    that all rows form one sorted array, counts the left elements greater
+    than each right element. Sorting every row then merges the two runs for
+    the next level.
+
+    Args:
+        values: The numeric array to count inversions in
+
+    Returns:
+        The number of inversions
+    """
+    length = len(values)
+    if length < 2:
+        return 0
+
+    _, ranks = np.unique(values, return_inverse=True)
+    size = 1 << (length - 1).bit_length()
+    pad = length
+    blocks = np.full(size, pad, dtype=np.int64)
+    blocks[:length] = ranks.ravel()
+
+    total = 0
+    width = 1
+    while width < size:
+        rows = blocks.reshape(-1, 2 * width)
+        nb_rows = rows.shape[0]
+        offsets = np.arange(nb_rows, dtype=np.int64)[:, None] * (pad + 1)
+        left = (rows[:, :width] + offsets).ravel()
+        right = (rows[:, width:] + offsets).ravel()
+        not_greater = np.searchsorted(left, right, side='right')
+        not_greater -= np.repeat(np.arange(nb_rows, dtype=np.int64) * width, width)
+        total += int(width * len(right) - not_greater.sum())
+        rows.sort(axis=1, kind='stable')
+        width *= 2
+    return total
@@ -0,0 +1,293 @@
+"""Benchmark harness for the sorting and inversion routines."""
+
+import json
+import math
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+from .backend import Backend
+from .inversion import inversions_fast
+from .sorting import (
+    QsPartition,
+    adaptive_sort,
+    counting_sort,
+    heap_sort,
+    merge_sort,
+    merge_sort_bottom_up,
+    quick_sort,
+    radix_sort,
+)
+
+DEFAULT_SIZES = (1000, 10000)
+DEFAULT_WARMUP = 1
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.1
+
+
+def _random(size: int, rng: random.Random) -> list[int]:
+    return [rng.randrange(size) for _ in range(size)]
+
+
+def _sorted(size: int, rng: random.Random) -> list[int]:
+    return list(range(size))
+
+
+def _reversed(size: int, rng: random.Random) -> list[int]:
+    return list(range(size, 0, -1))
+
+
+def _few_unique(size: int, rng: random.Random) -> list[int]:
+    return [rng.randrange(5) for _ in range(size)]
+
+
+def _sawtooth(size: int, rng: random.Random) -> list[int]:
+    period = max(1, int(math.sqrt(size)))
+    return [i % period for i in range(size)]
+
+
+def _organ_pipe(size: int, rng: random.Random) -> list[int]:
+    half = size // 2
+    return list(range(half)) + list(range(size - half, 0, -1))
+
+
+def _nearly_sorted(size: int, rng: random.Random) -> list[int]:
+    data = list(range(size))
+    for _ in range(max(1, size // 100)):
+        i = rng.randrange(size)
+        j = rng.randrange(size)
+        data[i], data[j] = data[j], data[i]
+    return data
+
+
+# Input generators, each taking the size and a seeded random generator
+DISTRIBUTIONS: dict[str, Callable[[int, random.Random], list[int]]] = {
+    'random': _random,
+    'sorted': _sorted,
+    'reversed': _reversed,
+    'few_unique': _few_unique,
+    'sawtooth': _sawtooth,
+    'organ_pipe': _organ_pipe,
+    'nearly_sorted': _nearly_sorted,
+}
+
+# Routines under test, each taking a list it may modify
+ROUTINES: dict[str, Callable[[list[int]], Any]] = {
+    'merge_sort': lambda a: merge_sort(a, backend=Backend.Python),
+    'merge_sort_bottom_up': lambda a: merge_sort_bottom_up(
+        a, backend=Backend.Python
+    ),
+    'quick_sort': lambda a: quick_sort(a, backend=Backend.Python, seed=0),
+    'quick_sort_hoare': lambda a: quick_sort(
+        a, backend=Backend.Python, scheme=QsPartition.Hoare, seed=0
+    ),
+    'quick_sort_block': lambda a: quick_sort(
+        a, backend=Backend.Python, scheme=QsPartition.Block, seed=0
+    ),
+    'heap_sort': lambda a: heap_sort(a, backend=Backend.Python),
+    'adaptive_sort': lambda a: adaptive_sort(a, backend=Backend.Python),
+    'merge_sort_numpy': lambda a: merge_sort(a, backend=Backend.NumPy),
+    'counting_sort': counting_sort,
+    'radix_sort': radix_sort,
+    'inversions_fast': lambda a: inversions_fast(a, backend=Backend.Python),
+    'inversions_numpy': lambda a: inversions_fast(a, backend=Backend.NumPy),
+}
+
+
+class BenchmarkResult(NamedTuple):
+    """Timing and memory statistics of one routine on one input."""
+
+    routine: str
+    distribution: str
+    size: int
+    repeats: int
+    median: float
+    p95: float
+    peak_memory: int
+
+
+class Regression(NamedTuple):
+    """A result whose median got slower than the baseline beyond a threshold."""
+
+    routine: str
+    distribution: str
+    size: int
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of values, fraction in (0, 1]."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(
+    func: Callable[[list[int]], Any],
+    data: list[int],
+    warmup: int = DEFAULT_WARMUP,
+    repeats: int = DEFAULT_REPEATS,
+) -> tuple[list[float], int]:
+    """
+    Time func on fresh copies of data and measure its peak allocation.
+
+    Args:
+        func: The routine to run, it may modify its argument
+        data: The input, copied before every run
+        warmup: Number of untimed runs before timing
+        repeats: Number of timed runs
+
+    Returns:
+        The run times in seconds and the peak traced allocation in bytes of
+        one extra run under tracemalloc, which is not timed since tracing
+        slows it down
+
+    Raises:
+        ValueError: If warmup or repeats are invalid
+    """
+    if warmup < 0 or repeats < 1:
+        raise ValueError('warmup must be >= 0 and repeats >= 1')
+
+    for _ in range(warmup):
+        func(data.copy())
+
+    times = []
+    for _ in range(repeats):
+        arr = data.copy()
+        start = time.perf_counter()
+        func(arr)
+        times.append(time.perf_counter() - start)
+
+    arr = data.copy()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        func(arr)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return times, peak
+
+
+def run_suite(
+    routines: Optional[Iterable[str]] = None,
+    distributions: Optional[Iterable[str]] = None,
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    warmup: int = DEFAULT_WARMUP,
+    repeats: int = DEFAULT_REPEATS,
+    seed: int = 0,
+) -> list[BenchmarkResult]:
+    """
+    Benchmark every routine on every distribution and size.
+
+    Args:
+        routines: Names from ROUTINES, all of them by default
+        distributions: Names from DISTRIBUTIONS, all of them by default
+        sizes: Input sizes
+        warmup: Number of untimed runs per case
+        repeats: Number of timed runs per case
+        seed: Seed of the input generators, so runs are comparable
+
+    Returns:
+        One result per (routine, distribution, size)
+
+    Raises:
+        ValueError: If a routine or distribution name is unknown
+    """
+    routine_names = list(ROUTINES if routines is None else routines)
+    distribution_names = list(
+        DISTRIBUTIONS if distributions is None else distributions
+    )
+    for name in routine_names:
+        if name not in ROUTINES:
+            raise ValueError(f'Unknown routine {name!r}')
+    for name in distribution_names:
+        if name not in DISTRIBUTIONS:
+            raise ValueError(f'Unknown distribution {name!r}')
+
+    results = []
+    for size in sizes:
+        for distribution in distribution_names:
+            data = DISTRIBUTIONS[distribution](size, random.Random(seed))
+            for routine in routine_names:
+                times, peak = measure(ROUTINES[routine], data, warmup, repeats)
+                results.append(BenchmarkResult(
+                    routine, distribution, size, repeats,
+                    statistics.median(times), percentile(times, 0.95), peak,
+                ))
+    return results
+
+
+def load_history(path: str) -> list[dict[str, Any]]:
+    """
+    Load the benchmark history file, an empty history if it does not exist.
+
+    Every entry holds a label, a timestamp and the list of results.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        history: list[dict[str, Any]] = json.load(f)
+    return history
+
+
+def append_history(
+    path: str, results: list[BenchmarkResult], label: str = ''
+) -> None:
+    """Append a run of results to the benchmark history file."""
+    history = load_history(path)
+    history.append({
+        'label': label,
+        'timestamp': time.time(),
+        'results': [result._asdict() for result in results],
+    })
+    with open(path, 'w') as f:
+        json.dump(history, f, indent=2)
+
+
+def compare(
+    baseline: Iterable[BenchmarkResult],
+    current: Iterable[BenchmarkResult],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """
+    Find the cases whose median is slower than the baseline by > threshold.
+
+    Cases present in only one of the two runs are ignored.
+
+    Args:
+        baseline: The reference results
+        current: The results to check
+        threshold: Allowed relative slowdown, 0.1 for 10%
+
+    Returns:
+        The regressions, worst first
+    """
+    reference = {(r.routine, r.distribution, r.size): r for r in baseline}
+    regressions = []
+    for result in current:
+        base = reference.get((result.routine, result.distribution, result.size))
+        if base is not None and result.median > base.median * (1 + threshold):
+            regressions.append(Regression(
+                result.routine, result.distribution, result.size,
+                base.median, result.median,
+            ))
+    regressions.sort(key=lambda r: r.ratio, reverse=True)
+    return regressions
+
+
+def results_of(entry: dict[str, Any]) -> list[BenchmarkResult]:
+    """Convert one history entry back into results."""
+    return [BenchmarkResult(**result) for result in entry['results']]
@@ -0,0 +1,167 @@
+"""External (out-of-core) merge sort of newline-delimited record files."""
+
+import heapq
+import mmap
+import os
+import tempfile
+from typing import Any, Callable, Iterator, Optional
+
+from .sorting import merge_sort
+
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+DEFAULT_FAN_IN = 64
+IO_BUFFER_SIZE = 1024 * 1024
+
+# Rough per-record cost of a bytes object and its list slot on top of its
+# payload, used to keep a run within the memory budget
+RECORD_OVERHEAD = 48
+
+
+def field_key(
+    field: int, separator: bytes = b'\t', numeric: bool = False
+) -> Callable[[bytes], Any]:
+    """
+    Build a key function that sorts records on one separated field.
+
+    Args:
+        field: Index of the field to sort on
+        separator: Field separator of the records
+        numeric: Compare the field as a float instead of as bytes
+
+    Returns:
+        The key function, taking a record with its trailing newline
+    """
+    def key(record: bytes) -> Any:
+        value = record.rstrip(b'\r\n').split(separator)[field]
+        return float(value) if numeric else value
+
+    return key
+
+
+def _read_runs(
+    input_path: str, memory_limit: int
+) -> Iterator[list[bytes]]:
+    """Yield the records of input_path in chunks that fit the memory budget."""
+    with open(input_path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+        run: list[bytes] = []
+        size = 0
+        for record in f:
+            if not record.endswith(b'\n'):
+                record += b'\n'
+            run.append(record)
+            size += len(record) + RECORD_OVERHEAD
+            if size >= memory_limit:
+                yield run
+                run = []
+                size = 0
+        if run:
+            yield run
+
+
+def _iter_records(path: str) -> Iterator[bytes]:
+    """Yield the records of a run file through a read-only memory map."""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter(mm.readline, b'')
+
+
+def _merge_runs(
+    paths: list[str],
+    output_path: str,
+    key: Optional[Callable[[bytes], Any]],
+    reverse: bool,
+) -> None:
+    """
+    K-way merge the sorted run files into output_path with a heap.
+
+    heapq.merge prefers the earlier run on ties, so the merge is stable as
+    long as the runs are given in input order.
+    """
+    with open(output_path, 'wb', buffering=IO_BUFFER_SIZE) as out:
+        out.writelines(
+            heapq.merge(
+                *(_iter_records(path) for path in paths), key=key, reverse=reverse
+            )
+        )
+
+
+def _new_run_path(tmp_dir: Optional[str]) -> str:
+    fd, path = tempfile.mkstemp(prefix='run-', suffix='.txt', dir=tmp_dir)
+    os.close(fd)
+    return path
+
+
+def external_sort(
+    input_path: str,
+    output_path: str,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    fan_in: int = DEFAULT_FAN_IN,
+    key: Optional[Callable[[bytes], Any]] = None,
+    reverse: bool = False,
+    tmp_dir: Optional[str] = None,
+) -> int:
+    """
+    Sort a newline-delimited file that may be larger than memory.
+
+    The input is read in runs of about memory_limit bytes, each run is sorted
+    with merge_sort and spilled to a temporary file. The runs are then
+    merged at most fan_in at a time, reading them through memory maps, until
+    a single pass writes output_path. The sort is stable. A missing newline
+    on the last record is added.
+
+    Args:
+        input_path: The file to sort
+        output_path: The file receiving the sorted records
+        memory_limit: Approximate number of bytes of records held in memory
+        fan_in: Maximum number of runs merged in one pass
+        key: Function computing the sort key of a record (bytes including
+            its newline), e.g. built with field_key
+        reverse: Sort in descending order
+        tmp_dir: Directory for the run files, the system default if None
+
+    Returns:
+        The number of records sorted
+
+    Raises:
+        ValueError: If memory_limit or fan_in are invalid
+    """
+    if memory_limit < 1:
+        raise ValueError('memory_limit must be a positive integer')
+    if fan_in < 2:
+        raise ValueError('fan_in must be at least 2')
+
+    created: list[str] = []
+    runs: list[str] = []
+    nb_records = 0
+    try:
+        for run in _read_runs(input_path, memory_limit):
+            merge_sort(run, key=key, reverse=reverse)
+            path = _new_run_path(tmp_dir)
+            created.append(path)
+            with open(path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                f.writelines(run)
+            runs.append(path)
+            nb_records += len(run)
+            del run
+
+        while len(runs) > fan_in:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                group = runs[i:i + fan_in]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                path = _new_run_path(tmp_dir)
+                created.append(path)
+                _merge_runs(group, path, key, reverse)
+                for old in group:
+                    os.remove(old)
+                merged.append(path)
+            runs = merged
+
+        _merge_runs(runs, output_path, key, reverse)
+    finally:
+        for path in created:
+            if os.path.exists(path):
+                os.remove(path)
+    return nb_records
@@ -0,0 +1,317 @@
+"""Fenwick tree (binary indexed tree) and a streaming inversion counter."""
+
+from collections import deque
+from typing import Iterable, Iterator
+
+from .sorting import Comparable
+
+
+class FenwickTree:
+    """Prefix sums over a fixed number of integer counters."""
+
+    def __init__(self, size: int) -> None:
+        """
+        Create a tree of size counters, all zero.
+
+        Args:
+            size: The number of counters
+
+        Raises:
+            ValueError: If size is negative
+        """
+        if size < 0:
+            raise ValueError('size must not be negative')
+        self._tree = [0] * (size + 1)
+
+    @classmethod
+    def from_counts(cls, counts: Iterable[int]) -> 'FenwickTree':
+        """
+        Create a tree holding the given counters in O(n).
+
+        Args:
+            counts: The initial value of every counter
+
+        Returns:
+            The new tree
+        """
+        counts = list(counts)
+        tree = cls(len(counts))
+        nodes = tree._tree
+        nodes[1:] = counts
+        for i in range(1, len(nodes)):
+            parent = i + (i & -i)
+            if parent < len(nodes):
+                nodes[parent] += nodes[i]
+        return tree
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    def add(self, index: int, delta: int) -> None:
+        """
+        Add delta to the counter at index in O(log n).
+
+        Args:
+            index: The counter index, in [0, size)
+            delta: The amount to add
+
+        Raises:
+            IndexError: If index is out of range
+        """
+        size = len(self._tree) - 1
+        if index < 0 or index >= size:
+            raise IndexError('FenwickTree index out of range')
+        tree = self._tree
+        i = index + 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, end: int) -> int:
+        """
+        Sum the counters in [0, end) in O(log n).
+
+        Args:
+            end: The end index (exclusive), clamped to [0, size]
+
+        Returns:
+            The sum of the counters before end
+        """
+        tree = self._tree
+        i = min(max(end, 0), len(tree) - 1)
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def search(self, target: int) -> tuple[int, int]:
+        """
+        Find the counter where the running sum passes target, in O(log n).
+
+        The counters must not be negative. The tree is descended from the
+        largest power of two, as in a binary search over the prefix sums.
+
+        Args:
+            target: The running sum to locate, in [0, total)
+
+        Returns:
+            The smallest index with prefix_sum(index + 1) > target, and
+            target - prefix_sum(index)
+
+        Raises:
+            IndexError: If target is negative or not below the total
+        """
+        if target < 0:
+            raise IndexError('FenwickTree search target out of range')
+        tree = self._tree
+        size = len(tree) - 1
+        position = 0
+        step = 1 << (size.bit_length() - 1) if size else 0
+        while step:
+            following = position + step
+            if following <= size and tree[following] <= target:
+                position = following
+                target -= tree[following]
+            step >>= 1
+        if position >= size:
+            raise IndexError('FenwickTree search target out of range')
+        return position, target
+
+
+class _GridTree:
+    """
+    Point counts on a width x height grid, with dominance counts.
+
+    A Fenwick tree over the columns whose nodes are Fenwick trees over the
+    rows. The inner trees are dicts holding only the nodes ever touched, so
+    memory follows the points added rather than width * height.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self._height = height
+        self._columns: list[dict[int, int]] = [{} for _ in range(width + 1)]
+
+    def add(self, x: int, y: int, delta: int) -> None:
+        """Add delta to the point count at (x, y) in O(log w log h)."""
+        columns = self._columns
+        height = self._height
+        i = x + 1
+        while i <= self.width:
+            column = columns[i]
+            j = y + 1
+            while j <= height:
+                column[j] = column.get(j, 0) + delta
+                j += j & -j
+            i += i & -i
+
+    def count(self, x_end: int, y_end: int) -> int:
+        """Count the points with x < x_end and y < y_end in O(log w log h)."""
+        columns = self._columns
+        total = 0
+        i = x_end
+        while i > 0:
+            column = columns[i]
+            j = y_end
+            while j > 0:
+                total += column.get(j, 0)
+                j -= j & -j
+            i -= i & -i
+        return total
+
+
+class InversionCounter[T: Comparable]:
+    """
+    Inversion count of a sliding window of values, maintained incrementally.
+
+    Values are coordinate-compressed against a fixed universe (for example
+    the reference ordering) and their multiplicities are kept in a Fenwick
+    tree, so appending at the back and popping from the front cost
+    O(log m) for a universe of m values, and count() is O(1).
+
+    Replacing a value in place also needs the number of smaller values
+    before it. The first replace() builds a 2D Fenwick tree over (position,
+    rank) in O(n log n log m) for that, after which replace(), append() and
+    pop_front() cost O(log n log m), amortized over the rebuilds that give
+    the positions of appended values room.
+    """
+
+    def __init__(self, universe: Iterable[T], values: Iterable[T] = ()) -> None:
+        """
+        Create a counter over the given universe of values.
+
+        Args:
+            universe: Every value that may ever be added
+            values: Initial contents of the window
+
+        Raises:
+            ValueError: If an initial value is not in the universe
+        """
+        ordered = sorted(set(universe))
+        self._ranks = {value: rank for rank, value in enumerate(ordered)}
+        self._tree = FenwickTree(len(ordered))
+        self._window: deque[T] = deque()
+        self._count = 0
+        # Built by the first replace(), the window starts at position _offset
+        self._grid: _GridTree | None = None
+        self._offset = 0
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._window)
+
+    def __getitem__(self, index: int) -> T:
+        return self._window[index]
+
+    def count(self) -> int:
+        """Return the number of inversions in the window in O(1)."""
+        return self._count
+
+    def _rank(self, value: T) -> int:
+        try:
+            return self._ranks[value]
+        except KeyError:
+            raise ValueError(f'{value!r} is not in the universe') from None
+
+    def append(self, value: T) -> None:
+        """
+        Append a value at the back of the window in O(log m).
+
+        Raises:
+            ValueError: If the value is not in the universe
+        """
+        rank = self._rank(value)
+        # Every element already in the window greater than value is inverted
+        self._count += len(self._window) - self._tree.prefix_sum(rank + 1)
+        self._tree.add(rank, 1)
+        self._window.append(value)
+        if self._grid is not None:
+            position = self._offset + len(self._window) - 1
+            if position < self._grid.width:
+                self._grid.add(position, rank, 1)
+            else:
+                self._build_grid()
+
+    def pop_front(self) -> T:
+        """
+        Remove and return the value at the front of the window in O(log m).
+
+        Raises:
+            IndexError: If the window is empty
+        """
+        if not self._window:
+            raise IndexError('pop_front from an empty InversionCounter')
+        value = self._window.popleft()
+        rank = self._ranks[value]
+        self._tree.add(rank, -1)
+        if self._grid is not None:
+            self._grid.add(self._offset, rank, -1)
+        self._offset += 1
+        # Every remaining element smaller than value was inverted with it
+        self._count -= self._tree.prefix_sum(rank)
+        return value
+
+    def replace(self, index: int, value: T) -> T:
+        """
+        Replace the value at index and return the previous one.
+
+        Args:
+            index: Position in the window, negative values count from the back
+            value: The new value
+
+        Returns:
+            The replaced value
+
+        Raises:
+            IndexError: If index is out of range
+            ValueError: If the value is not in the universe
+        """
+        length = len(self._window)
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError('InversionCounter index out of range')
+
+        rank = self._rank(value)
+        old_value = self._window[index]
+        old_rank = self._ranks[old_value]
+        if rank == old_rank:
+            self._window[index] = value
+            return old_value
+
+        grid = self._grid if self._grid is not None else self._build_grid()
+        position = self._offset + index
+        self._tree.add(old_rank, -1)
+        grid.add(position, old_rank, -1)
+        self._count -= self._inversions_at(grid, index, old_rank)
+        self._window[index] = value
+        self._count += self._inversions_at(grid, index, rank)
+        self._tree.add(rank, 1)
+        grid.add(position, rank, 1)
+        return old_value
+
+    def _build_grid(self) -> _GridTree:
+        """Build the (position, rank) tree, with room for as many appends."""
+        self._offset = 0
+        grid = _GridTree(2 * len(self._window) + 16, len(self._ranks))
+        for position, value in enumerate(self._window):
+            grid.add(position, self._ranks[value], 1)
+        self._grid = grid
+        return grid
+
+    def _inversions_at(self, grid: _GridTree, index: int, rank: int) -> int:
+        """
+        Count the inversions of the value of rank at index with the others.
+
+        Neither the tree nor the grid may contain the element at index.
+        """
+        position = self._offset + index
+        before_less = grid.count(position, rank)
+        before_greater = index - grid.count(position, rank + 1)
+        after_less = self._tree.prefix_sum(rank) - before_less
+        return before_greater + after_less
@@ -0,0 +1,294 @@
+"""Opt-in instrumentation of the sorting kernels."""
+
+import inspect
+import sys
+import time
+import tracemalloc
+from types import FrameType
+from typing import Any, Callable, NamedTuple
+
+from .backend import Backend
+
+_PACKAGE = __name__.rpartition('.')[0] + '.'
+
+
+class _Counters:
+    __slots__ = ('comparisons', 'moves')
+
+    def __init__(self) -> None:
+        self.comparisons = 0
+        self.moves = 0
+
+
+class _Counted:
+    """Element proxy counting the comparisons made on it."""
+
+    __slots__ = ('value', 'counters')
+
+    def __init__(self, value: Any, counters: _Counters) -> None:
+        self.value = value
+        self.counters = counters
+
+    def __lt__(self, other: '_Counted') -> bool:
+        self.counters.comparisons += 1
+        return bool(self.value < other.value)
+
+    def __le__(self, other: '_Counted') -> bool:
+        self.counters.comparisons += 1
+        return bool(self.value <= other.value)
+
+    def __gt__(self, other: '_Counted') -> bool:
+        self.counters.comparisons += 1
+        return bool(self.value > other.value)
+
+    def __ge__(self, other: '_Counted') -> bool:
+        self.counters.comparisons += 1
+        return bool(self.value >= other.value)
+
+    def __eq__(self, other: object) -> bool:
+        self.counters.comparisons += 1
+        return isinstance(other, _Counted) and bool(self.value == other.value)
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+
+class _CountedDescending(_Counted):
+    """Proxy of a (key, position) pair ordered by descending key."""
+
+    __slots__ = ()
+
+    def __lt__(self, other: '_Counted') -> bool:
+        self.counters.comparisons += 1
+        (key, position), (other_key, other_position) = self.value, other.value
+        return bool((other_key, position) < (key, other_position))
+
+    def __le__(self, other: '_Counted') -> bool:
+        return not other < self
+
+    def __gt__(self, other: '_Counted') -> bool:
+        return other < self
+
+    def __ge__(self, other: '_Counted') -> bool:
+        return not self < other
+
+
+class _CountingList(list):
+    """List counting the element writes and the elements copied by slicing."""
+
+    def __init__(self, iterable: Any, counters: _Counters) -> None:
+        super().__init__(iterable)
+        self.counters = counters
+
+    def __getitem__(self, index: Any) -> Any:
+        result = super().__getitem__(index)
+        if isinstance(index, slice):
+            self.counters.moves += len(result)
+            return _CountingList(result, self.counters)
+        return result
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            value = list(value)
+            self.counters.moves += len(value)
+        else:
+            self.counters.moves += 1
+        super().__setitem__(index, value)
+
+
+class SortReport(NamedTuple):
+    """
+    What one sort call did, as measured by instrument.
+
+    comparisons and moves count element comparisons and element writes
+    (including elements copied into scratch buffers sliced from the input).
+    max_depth is the deepest nesting of the index ranges package functions
+    are called on, so the recursive kernels and the explicit stack of
+    quick_sort alike report how many times a range was split. phase_times
+    maps every package function to its self time, excluding the package
+    functions it calls, and phase_calls to its number of calls; these are
+    measured under a profile hook, so they are inflated but their
+    proportions hold.
+    total_time and allocated_bytes (peak traced allocation) come from
+    separate runs without any hook.
+    """
+
+    routine: str
+    length: int
+    comparisons: int
+    moves: int
+    max_depth: int
+    allocated_bytes: int
+    total_time: float
+    phase_times: dict[str, float]
+    phase_calls: dict[str, int]
+
+    def summary(self) -> str:
+        """Format the report as a human-readable block of text."""
+        lines = [
+            f'{self.routine} on {self.length} elements:',
+            f'  comparisons: {self.comparisons}',
+            f'  moves:       {self.moves}',
+            f'  max depth:   {self.max_depth}',
+            f'  allocated:   {self.allocated_bytes} bytes',
+            f'  time:        {self.total_time * 1000:.3f} ms',
+            '  phases (profiled):',
+        ]
+        phases = sorted(self.phase_times.items(), key=lambda p: p[1], reverse=True)
+        for name, seconds in phases:
+            lines.append(
+                f'    {name:<24} {self.phase_calls[name]:>8} calls'
+                f' {seconds * 1000:>10.3f} ms'
+            )
+        return '\n'.join(lines)
+
+
+def _profile(
+    sort_func: Callable[..., Any], arr: list[Any], args: Any, kwargs: Any
+) -> tuple[int, dict[str, float], dict[str, int]]:
+    """Run sort_func under a profile hook scoped to the package's frames."""
+    phase_times: dict[str, float] = {}
+    phase_calls: dict[str, int] = {}
+    # [start time, time spent in package callees] of every active call
+    active: list[list[float]] = []
+    # The chain of nested (start, end) ranges leading to the current call
+    ranges: list[tuple[int, int]] = []
+    max_depth = 0
+
+    def hook(frame: FrameType, event: str, arg: Any) -> None:
+        nonlocal max_depth
+        if event not in ('call', 'return'):
+            return
+        module = frame.f_globals.get('__name__', '')
+        if not module.startswith(_PACKAGE) or module == __name__:
+            return
+        if event == 'call':
+            active.append([time.perf_counter(), 0.0])
+            lo = frame.f_locals.get('start')
+            hi = frame.f_locals.get('end')
+            if isinstance(lo, int) and isinstance(hi, int):
+                # Ranges are split depth first, so a range outside the last
+                # one is a sibling of it or of one of its ancestors
+                while ranges and not ranges[-1][0] <= lo <= hi <= ranges[-1][1]:
+                    ranges.pop()
+                if not ranges or ranges[-1] != (lo, hi):
+                    ranges.append((lo, hi))
+                    max_depth = max(max_depth, len(ranges))
+        elif active:
+            start, callees = active.pop()
+            elapsed = time.perf_counter() - start
+            if active:
+                active[-1][1] += elapsed
+            name = frame.f_code.co_qualname
+            phase_times[name] = phase_times.get(name, 0.0) + elapsed - callees
+            phase_calls[name] = phase_calls.get(name, 0) + 1
+
+    previous = sys.getprofile()
+    sys.setprofile(hook)
+    try:
+        sort_func(arr, *args, **kwargs)
+    finally:
+        sys.setprofile(previous)
+    return max_depth, phase_times, phase_calls
+
+
+def _decorate(
+    sort_func: Callable[..., Any],
+    arr: list[Any],
+    args: Any,
+    kwargs: Any,
+    counters: _Counters,
+) -> _CountingList:
+    """
+    Pair every element with its key and position, for a key= or reverse= run.
+
+    Equal keys keep their positions in ascending order, so sorting the pairs
+    without key or reverse gives the same stable order as the kernels. The
+    writes of the decorated range and of the undecorated result are counted.
+    """
+    key = kwargs.get('key')
+    counted = _CountedDescending if kwargs.get('reverse') else _Counted
+    keys = arr if key is None else [key(x) for x in arr]
+    decorated = _CountingList(
+        (counted((k, i), counters) for i, k in enumerate(keys)), counters
+    )
+    bound = inspect.signature(sort_func).bind(arr, *args, **kwargs).arguments
+    start = bound.get('start') or 0
+    end = len(arr) if bound.get('end') is None else bound['end']
+    counters.moves += 2 * max(end - start, 0)
+    return decorated
+
+
+def instrument(
+    sort_func: Callable[..., Any], arr: list[Any], *args: Any, **kwargs: Any
+) -> SortReport:
+    """
+    Run a sort on arr and report what it did.
+
+    The kernels themselves carry no counters, so sorting without instrument
+    costs nothing extra. instrument runs sort_func(arr, *args, **kwargs)
+    three times: on a copy whose elements and list count comparisons and
+    moves under a profile hook, on a plain copy under tracemalloc, and
+    finally, timed, on arr itself, which ends up sorted as usual.
+
+    With key= or reverse=, the counted run decorates the elements itself,
+    as the kernels do: it sorts (key, position) pairs, each compared as one
+    element, and counts the writes decorating and undecorating the range.
+
+    Proxied elements are not numeric, so unless another backend is given,
+    all three runs use Backend.Python to measure the same kernel, and
+    integer-only sorts such as counting_sort cannot be instrumented.
+
+    Args:
+        sort_func: The sort or partition function to run
+        arr: The list to sort
+        *args: Further positional arguments of sort_func
+        **kwargs: Keyword arguments of sort_func
+
+    Returns:
+        The report of the run
+    """
+    if (
+        'backend' not in kwargs
+        and 'backend' in inspect.signature(sort_func).parameters
+    ):
+        kwargs['backend'] = Backend.Python
+
+    counters = _Counters()
+    key = kwargs.get('key')
+    reverse = kwargs.get('reverse', False)
+    if key is None and not reverse:
+        proxied = _CountingList((_Counted(x, counters) for x in arr), counters)
+        proxied_kwargs = kwargs
+    else:
+        proxied = _decorate(sort_func, arr, args, kwargs, counters)
+        proxied_kwargs = {
+            name: value for name, value in kwargs.items()
+            if name not in ('key', 'reverse')
+        }
+    max_depth, phase_times, phase_calls = _profile(
+        sort_func, proxied, args, proxied_kwargs
+    )
+
+    copy = list(arr)
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        sort_func(copy, *args, **kwargs)
+        allocated = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    start = time.perf_counter()
+    sort_func(arr, *args, **kwargs)
+    total_time = time.perf_counter() - start
+
+    return SortReport(
+        getattr(sort_func, '__name__', repr(sort_func)), len(arr),
+        counters.comparisons, counters.moves, max_depth, allocated, total_time,
+        phase_times, phase_calls,
+    )
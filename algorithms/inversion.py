@@ -1,26 +1,156 @@
 import unittest
-from typing import Optional
-from .sorting import Comparable, merge_sort
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .backend import Backend, buffer_view, numpy_inversions, select_numeric
+from .sorting import INSERTION_SORT_CUTOFF, Comparable
+
+
+class InversionCount[T](NamedTuple):
+    """Result of count_inversions."""
+
+    total: int
+    sorted: list[T]
+    per_element: Optional[list[int]]
+
+
+def _insertion_count[T: Comparable](arr: list[T], start: int, end: int) -> int:
+    """Insertion sort arr[start:end] and return the number of shifts made."""
+    count = 0
+    for i in range(start + 1, end):
+        item = arr[i]
+        j = i
+        while j > start and item < arr[j - 1]:
+            arr[j] = arr[j - 1]
+            j -= 1
+        arr[j] = item
+        count += i - j
+    return count
+
+
+def _merge_count[T: Comparable](
+    src: list[T], dst: list[T], start: int, middle: int, end: int
+) -> int:
+    """Merge the sorted runs of src into dst and return the cross inversions."""
+    count = 0
+    i = start
+    j = middle
+    for k in range(start, end):
+        if i < middle and (j >= end or not src[j] < src[i]):
+            dst[k] = src[i]
+            i += 1
+        else:
+            # src[j] is smaller than every element left in the first run
+            dst[k] = src[j]
+            count += middle - i
+            j += 1
+    return count
+
+
+def _count_into[T: Comparable](
+    src: list[T], dst: list[T], start: int, end: int
+) -> int:
+    """
+    Sort dst[start:end] with src as scratch and return its inversion count.
+
+    This is the ping-pong merge sort of merge_sort: both buffers hold the same
+    elements in [start, end) on entry and swap roles at every level.
+    """
+    if end - start <= INSERTION_SORT_CUTOFF:
+        return _insertion_count(dst, start, end)
+
+    middle = start + (end - start) // 2
+    count = _count_into(dst, src, start, middle)
+    count += _count_into(dst, src, middle, end)
+    if not src[middle] < src[middle - 1]:
+        dst[start:end] = src[start:end]
+        return count
+    return count + _merge_count(src, dst, start, middle, end)
+
+
+def _count_into_indexed[T: Comparable](
+    values: list[T],
+    src: list[int],
+    dst: list[int],
+    start: int,
+    end: int,
+    per_element: list[int],
+) -> int:
+    """
+    Same as _count_into over positions into values, also filling per_element.
+
+    per_element[p] is incremented once for every inversion the element at
+    position p takes part in, on either side of the pair.
+    """
+    count = 0
+    if end - start <= INSERTION_SORT_CUTOFF:
+        for i in range(start + 1, end):
+            position = dst[i]
+            item = values[position]
+            j = i
+            while j > start and item < values[dst[j - 1]]:
+                per_element[dst[j - 1]] += 1
+                dst[j] = dst[j - 1]
+                j -= 1
+            dst[j] = position
+            per_element[position] += i - j
+            count += i - j
+        return count
+
+    middle = start + (end - start) // 2
+    count += _count_into_indexed(values, dst, src, start, middle, per_element)
+    count += _count_into_indexed(values, dst, src, middle, end, per_element)
+    if not values[src[middle]] < values[src[middle - 1]]:
+        dst[start:end] = src[start:end]
+        return count
+
+    i = start
+    j = middle
+    for k in range(start, end):
+        if i < middle and (j >= end or not values[src[j]] < values[src[i]]):
+            # Every element taken from the second run so far is smaller
+            per_element[src[i]] += j - middle
+            dst[k] = src[i]
+            i += 1
+        else:
+            per_element[src[j]] += middle - i
+            count += middle - i
+            dst[k] = src[j]
+            j += 1
+    return count
 
 
 def inversions_fast[T: Comparable](
-    arr: list[T], start: Optional[int] = None, end: Optional[int] = None
+    arr: list[T] | np.ndarray,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    backend: Backend = Backend.Auto,
 ) -> int:
     """
     Count the number of inversions in the input list using divide-and-conquer.
 
+    The count is collected while merge sorting a copy of the range in one
+    O(n log n) pass, with a single scratch buffer. Numeric lists and ndarrays
+    can be counted by the NumPy backend with vectorized block merges instead.
+    array.array and memoryview inputs are read through an ndarray view.
+
     Args:
-        arr: The list to count inversions in
+        arr: The list, ndarray, array.array or memoryview to process
         start: The start index of the list to be processed (inclusive)
         end: The end index of the list to be processed (exclusive)
+        backend: Backend.NumPy counts numeric input vectorized, Backend.Auto
+            does so when the input is numeric, Backend.Python always uses the
+            pure-Python merge sort
 
     Returns:
         The number of inversions in the list
 
     Raises:
-        ValueError: If start/end indices are invalid
+        ValueError: If start/end indices or backend are invalid
     """
-    total_length = len(arr)
+    view = buffer_view(arr, writable=False)
+    total_length = len(view)
     if start is None:
         start = 0
     if end is None:
@@ -32,28 +162,58 @@ def inversions_fast[T: Comparable](
 
     if length <= 1:
         return 0
-    elif length == 2:
-        return 1 if arr[start] > arr[end - 1] else 0
-    else:
-        middle = start + length // 2
-        a_res = inversions_fast(arr, start, middle)
-        b_res = inversions_fast(arr, middle, end)
-        a = arr[start:middle]
-        b = arr[middle:end]
-        merge_sort(a)
-        merge_sort(b)
-        merge_res = 0
-        i = 0
-        j = 0
-        while j < len(b):
-            if i >= len(a):
-                break
-            elif b[j] < a[i]:
-                merge_res += len(a) - i
-                j += 1
-            else:
-                i += 1
-        return merge_res + a_res + b_res
+
+    values = select_numeric(view, start, end, None, backend)
+    if values is not None:
+        return numpy_inversions(values)
+
+    work = list(view[start:end])
+    return _count_into(work[:], work, 0, length)
+
+
+def count_inversions[T: Comparable](
+    arr: list[T],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    per_element: bool = False,
+) -> InversionCount[T]:
+    """
+    Count the inversions of the input list and return it sorted as well.
+
+    Args:
+        arr: The list to count inversions in, it is not modified
+        start: The start index of the list to be processed (inclusive)
+        end: The end index of the list to be processed (exclusive)
+        per_element: Also count, for every element of the range, the number
+            of inversions it takes part in. These counts add up to twice the
+            total, since every inversion involves two elements.
+
+    Returns:
+        The inversion count, the sorted range and the per-element counts
+        (None unless per_element is set)
+
+    Raises:
+        ValueError: If start/end indices are invalid
+    """
+    total_length = len(arr)
+    if start is None:
+        start = 0
+    if end is None:
+        end = total_length
+
+    length = end - start
+    if start < 0 or length < 0 or end > total_length:
+        raise ValueError('Invalid start/end arguments for count_inversions')
+
+    work = list(arr[start:end])
+    if not per_element:
+        count = _count_into(work[:], work, 0, length)
+        return InversionCount(count, work, None)
+
+    counts = [0] * length
+    order = list(range(length))
+    count = _count_into_indexed(work, order[:], order, 0, length, counts)
+    return InversionCount(count, [work[i] for i in order], counts)
 
 
 def inversion_slow[T: Comparable](arr: list[T]) -> int:
@@ -0,0 +1,136 @@
+"""Lazy k-way merge of sorted iterables with a loser tree."""
+
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+# Number of elements pulled from a source at a time
+DEFAULT_MERGE_BATCH = 256
+
+
+def kway_merge[T](
+    *iterables: Iterable[T],
+    key: Optional[Callable[[T], Any]] = None,
+    reverse: bool = False,
+    batch_size: int = DEFAULT_MERGE_BATCH,
+) -> Iterator[T]:
+    """
+    Lazily merge sorted iterables into a single sorted iterator.
+
+    The current head of every source is a leaf of a loser tree: every
+    internal node keeps the source that lost the match played there, and
+    the overall winner is the next element. Once it is emitted, only the
+    matches on the path from its leaf to the root are replayed, which costs
+    exactly ceil(log2 k) comparisons per element for k sources, about half
+    of what a binary heap needs. Ties go to the earlier source, so the merge
+    is stable like heapq.merge.
+
+    Sources are read batch_size elements at a time and keys are computed
+    per batch, so memory stays bounded by k * batch_size elements and the
+    sources may be unbounded.
+
+    Args:
+        *iterables: The sorted iterables to merge
+        key: Function computing the sort key of an element, the sources must
+            be sorted by it
+        reverse: The sources are sorted in descending order
+        batch_size: Number of elements prefetched from a source at a time
+
+    Returns:
+        An iterator over the merged elements
+
+    Raises:
+        ValueError: If batch_size is not positive
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be a positive integer')
+    return _kway_merge(
+        [iter(iterable) for iterable in iterables], key, reverse, batch_size
+    )
+
+
+def _kway_merge[T](
+    sources: list[Iterator[T]],
+    key: Optional[Callable[[T], Any]],
+    reverse: bool,
+    batch_size: int,
+) -> Iterator[T]:
+    nb_sources = len(sources)
+    if nb_sources == 0:
+        return
+
+    items: list[list[T]] = [[] for _ in range(nb_sources)]
+    keys: list[list[Any]] = [[] for _ in range(nb_sources)]
+    positions = [0] * nb_sources
+    heads: list[Any] = [None] * nb_sources
+    done = [False] * nb_sources
+
+    def refill(source: int) -> None:
+        batch = list(islice(sources[source], batch_size))
+        if not batch:
+            done[source] = True
+            return
+        items[source] = batch
+        keys[source] = batch if key is None else [key(item) for item in batch]
+        positions[source] = 0
+        heads[source] = keys[source][0]
+
+    def beats(a: int, b: int) -> bool:
+        """Whether the head of source a comes out before the head of b."""
+        if done[b]:
+            return True
+        if done[a]:
+            return False
+        # A single comparison decides, ties going to the lower source index
+        if reverse:
+            if a < b:
+                return not heads[a] < heads[b]
+            return bool(heads[b] < heads[a])
+        if a < b:
+            return not heads[b] < heads[a]
+        return bool(heads[a] < heads[b])
+
+    for source in range(nb_sources):
+        refill(source)
+
+    # Node n has children 2n and 2n + 1, leaves sit at nb_sources + source
+    losers = [0] * nb_sources
+    winners = [0] * nb_sources + list(range(nb_sources))
+    for node in range(nb_sources - 1, 0, -1):
+        left, right = winners[2 * node], winners[2 * node + 1]
+        if beats(left, right):
+            winners[node], losers[node] = left, right
+        else:
+            winners[node], losers[node] = right, left
+    winner = winners[1] if nb_sources > 1 else 0
+    del winners
+
+    while not done[winner]:
+        position = positions[winner]
+        yield items[winner][position]
+
+        position += 1
+        if position < len(items[winner]):
+            positions[winner] = position
+            heads[winner] = keys[winner][position]
+        else:
+            refill(winner)
+
+        # Replay the matches on the path to the root, beats() inlined
+        node = (winner + nb_sources) >> 1
+        while node:
+            loser = losers[node]
+            if not done[loser]:
+                if done[winner]:
+                    wins = True
+                else:
+                    if reverse:
+                        first, second = heads[winner], heads[loser]
+                    else:
+                        first, second = heads[loser], heads[winner]
+                    if loser < winner:
+                        wins = not second < first
+                    else:
+                        wins = first < second
+                if wins:
+                    losers[node], winner = winner, loser
+            node >>= 1
@@ -0,0 +1,272 @@
+"""Multiprocess sorting and inversion counting over shared memory."""
+
+import multiprocessing
+import os
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional
+
+import numpy as np
+
+from .backend import Backend, numeric_array
+from .inversion import inversions_fast
+
+# Inputs shorter than this are sorted in the calling process, where starting
+# the pool would cost more than the sort itself
+PARALLEL_MIN_LENGTH = 100_000
+
+
+def _attach(name: str, dtype: str, length: int) -> tuple[SharedMemory, np.ndarray]:
+    """Map the shared block called name as an ndarray without copying."""
+    shm = SharedMemory(name=name)
+    return shm, np.ndarray((length,), dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _create(values: np.ndarray) -> tuple[SharedMemory, np.ndarray]:
+    """Allocate a shared block of the size of values and map it."""
+    shm = SharedMemory(create=True, size=max(values.nbytes, 1))
+    return shm, np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)
+
+
+def _sort_chunk(task: tuple[str, str, int, int, int]) -> None:
+    """Pool task: sort the shared array slice [start, end) in place."""
+    name, dtype, length, start, end = task
+    shm, data = _attach(name, dtype, length)
+    try:
+        data[start:end].sort(kind='stable')
+    finally:
+        del data
+        shm.close()
+
+
+def _merge_part(
+    task: tuple[str, str, str, int, list[tuple[int, int]], int]
+) -> None:
+    """
+    Pool task: merge one value range of every sorted chunk into the output.
+
+    The pieces are consecutive sorted runs, which the stable sort (timsort
+    for wide types, radix sort for narrow ones) merges in close to linear
+    time.
+    """
+    src_name, dst_name, dtype, length, pieces, offset = task
+    src_shm, src = _attach(src_name, dtype, length)
+    dst_shm, dst = _attach(dst_name, dtype, length)
+    try:
+        merged = np.concatenate([src[lo:hi] for lo, hi in pieces])
+        merged.sort(kind='stable')
+        dst[offset:offset + len(merged)] = merged
+    finally:
+        del src, dst
+        src_shm.close()
+        dst_shm.close()
+
+
+def _count_chunk(task: tuple[str, str, int, int, int]) -> int:
+    """
+    Pool task: count the inversions within [start, end) of the shared array.
+
+    The slice is left sorted in place for the cross-chunk phase.
+    """
+    name, dtype, length, start, end = task
+    shm, data = _attach(name, dtype, length)
+    try:
+        count = inversions_fast(data, start, end, Backend.NumPy)
+        data[start:end].sort(kind='stable')
+        return count
+    finally:
+        del data
+        shm.close()
+
+
+def _merge_count(task: tuple[str, str, int, int, int, int]) -> int:
+    """
+    Pool task: count the pairs x > y with x in the sorted run [start, middle)
+    and y in the sorted run [middle, end) of the shared array, then merge the
+    two runs in place.
+    """
+    name, dtype, length, start, middle, end = task
+    shm, data = _attach(name, dtype, length)
+    try:
+        not_greater = np.searchsorted(
+            data[start:middle], data[middle:end], side='right'
+        )
+        count = (middle - start) * (end - middle) - int(not_greater.sum())
+        data[start:end].sort(kind='stable')
+        return count
+    finally:
+        del data
+        shm.close()
+
+
+def _chunk_bounds(length: int, nb_chunks: int) -> list[tuple[int, int]]:
+    """Split [0, length) into nb_chunks contiguous ranges of near-equal size."""
+    edges = [length * i // nb_chunks for i in range(nb_chunks + 1)]
+    return [(edges[i], edges[i + 1]) for i in range(nb_chunks)]
+
+
+def parallel_sort(
+    arr: list[Any] | np.ndarray, workers: Optional[int] = None
+) -> None:
+    """
+    Sort a numeric list or ndarray in-place with a pool of worker processes.
+
+    The values are copied once into a shared memory block. Every worker sorts
+    one chunk of it in place, receiving only the block name and its bounds,
+    so the payload is never pickled. The chunks are then merged in parallel
+    by regular sampling: workers - 1 splitters taken from the sorted chunks
+    cut every chunk into value ranges, and each worker merges one value
+    range of all chunks straight into its final position of a second shared
+    block.
+
+    Args:
+        arr: The numeric list or ndarray to sort
+        workers: Number of worker processes, os.cpu_count() by default
+
+    Raises:
+        ValueError: If arr is not numeric or workers is not positive
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('workers must be a positive integer')
+    if len(arr) == 0:
+        return
+
+    values = numeric_array(arr)
+    if values is None:
+        raise ValueError('parallel_sort requires a numeric list or ndarray')
+
+    length = len(values)
+    workers = min(workers, length)
+    if workers == 1 or length < PARALLEL_MIN_LENGTH:
+        result = np.sort(values, kind='stable')
+    else:
+        result = _parallel_sort_values(values, workers)
+
+    if isinstance(arr, np.ndarray):
+        arr[:] = result
+    else:
+        arr[:] = result.tolist()
+
+
+def _parallel_sort_values(values: np.ndarray, workers: int) -> np.ndarray:
+    """Sort values with workers processes and return the sorted copy."""
+    length = len(values)
+    dtype = values.dtype.str
+    src_shm, src = _create(values)
+    dst_shm, dst = _create(values)
+    try:
+        src[:] = values
+        chunks = _chunk_bounds(length, workers)
+        with multiprocessing.get_context().Pool(workers) as pool:
+            pool.map(
+                _sort_chunk,
+                [(src_shm.name, dtype, length, lo, hi) for lo, hi in chunks],
+            )
+
+            # Regular sampling: workers samples per chunk, splitters are the
+            # evenly spaced quantiles of all samples
+            samples = np.sort(np.concatenate([
+                src[lo:hi][np.linspace(0, hi - lo - 1, workers, dtype=np.int64)]
+                for lo, hi in chunks
+            ]))
+            splitters = samples[workers::workers][:workers - 1]
+            cuts = [
+                [lo, *(lo + np.searchsorted(src[lo:hi], splitters)), hi]
+                for lo, hi in chunks
+            ]
+
+            tasks = []
+            offset = 0
+            for part in range(workers):
+                pieces = [(int(c[part]), int(c[part + 1])) for c in cuts]
+                tasks.append(
+                    (src_shm.name, dst_shm.name, dtype, length, pieces, offset)
+                )
+                offset += sum(hi - lo for lo, hi in pieces)
+            pool.map(_merge_part, tasks)
+        return dst.copy()
+    finally:
+        del src, dst
+        src_shm.close()
+        src_shm.unlink()
+        dst_shm.close()
+        dst_shm.unlink()
+
+
+def parallel_inversions(
+    arr: list[Any] | np.ndarray,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> int:
+    """
+    Count the inversions of a numeric list or ndarray with worker processes.
+
+    The values are copied once into a shared memory block and split into
+    chunks. In the first phase every worker counts the inversions within a
+    chunk with inversions_fast and leaves the chunk sorted in place. The
+    sorted runs are then merged pairwise, level by level as in a bottom-up
+    merge sort: every merge counts the inversions across its two adjacent
+    runs with a vectorized np.searchsorted and sorts them together in
+    place. The log2(chunks) levels keep the total work O(n log n) however
+    small the chunks. Workers only receive the block name and bounds, and
+    the result is exactly the sequential count.
+
+    Args:
+        arr: The numeric list or ndarray to count inversions in
+        workers: Number of worker processes, os.cpu_count() by default
+        chunk_size: Number of elements per chunk, length / workers by default
+
+    Returns:
+        The number of inversions
+
+    Raises:
+        ValueError: If arr is not numeric or workers/chunk_size are invalid
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('workers must be a positive integer')
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer')
+    if len(arr) < 2:
+        return 0
+
+    values = numeric_array(arr)
+    if values is None:
+        raise ValueError('parallel_inversions requires a numeric list or ndarray')
+
+    length = len(values)
+    if workers == 1 or length < PARALLEL_MIN_LENGTH:
+        return inversions_fast(values, backend=Backend.NumPy)
+
+    if chunk_size is None:
+        chunk_size = -(-length // workers)
+    chunks = _chunk_bounds(length, -(-length // chunk_size))
+
+    dtype = values.dtype.str
+    shm, data = _create(values)
+    try:
+        data[:] = values
+        with multiprocessing.get_context().Pool(workers) as pool:
+            total = sum(pool.map(
+                _count_chunk,
+                [(shm.name, dtype, length, lo, hi) for lo, hi in chunks],
+            ))
+            runs = chunks
+            while len(runs) > 1:
+                merges = [
+                    (runs[i][0], runs[i][1], runs[i + 1][1])
+                    for i in range(0, len(runs) - 1, 2)
+                ]
+                total += sum(pool.map(
+                    _merge_count,
+                    [(shm.name, dtype, length, *merge) for merge in merges],
+                ))
+                merged = [(start, end) for start, _, end in merges]
+                runs = merged + runs[2 * len(merges):]
+        return total
+    finally:
+        del data
+        shm.close()
+        shm.unlink()
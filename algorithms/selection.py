@@ -0,0 +1,194 @@
+"""Selection algorithms built on partition: quickselect, introselect, top-k."""
+
+import heapq
+from typing import Any, Callable, Iterable, Optional
+
+from .sorting import (
+    Comparable,
+    QsPivot,
+    _insertion_sort,
+    _select_pivot,
+    _sort_decorated,
+    partition3,
+)
+
+# Ranges at or below this length are finished with insertion sort
+SELECT_CUTOFF = 16
+# Size of the groups whose medians are taken by median-of-medians
+MEDIAN_GROUP_SIZE = 5
+
+
+def _median_of_medians[T: Comparable](arr: list[T], start: int, end: int) -> int:
+    """
+    Return the index of a pivot in [start, end) with a guaranteed split.
+
+    The median of every group of MEDIAN_GROUP_SIZE elements is moved to the
+    front of the range, and the median of those medians is selected
+    recursively. At least 30% of the range is on either side of it.
+    """
+    nb_groups = 0
+    for group_start in range(start, end, MEDIAN_GROUP_SIZE):
+        group_end = min(group_start + MEDIAN_GROUP_SIZE, end)
+        _insertion_sort(arr, group_start, group_end)
+        median = group_start + (group_end - group_start - 1) // 2
+        arr[start + nb_groups], arr[median] = arr[median], arr[start + nb_groups]
+        nb_groups += 1
+
+    middle = start + (nb_groups - 1) // 2
+    _select(arr, start, start + nb_groups, middle, median_of_medians=True)
+    return middle
+
+
+def _select[T: Comparable](
+    arr: list[T], start: int, end: int, k: int, median_of_medians: bool = False
+) -> None:
+    """
+    Introselect: move the k-th smallest element of arr[start:end] to index k.
+
+    Quickselect with median-of-three pivots and three-way partitions runs
+    until two partitions in a row fail to halve the range; from there on the
+    pivots come from median-of-medians, which bounds the time to O(n).
+    """
+    steps = 0
+    checkpoint = end - start
+    while end - start > SELECT_CUTOFF:
+        if median_of_medians:
+            i_pivot = _median_of_medians(arr, start, end)
+        else:
+            i_pivot = _select_pivot(arr, start, end, QsPivot.MedianOfThree)
+
+        lt, gt = partition3(arr, start, end, i_pivot)
+        if k < lt:
+            end = lt
+        elif k >= gt:
+            start = gt
+        else:
+            return
+
+        steps += 1
+        if steps == 2:
+            if end - start > checkpoint // 2:
+                median_of_medians = True
+            steps = 0
+            checkpoint = end - start
+    _insertion_sort(arr, start, end)
+
+
+def nth_element[T: Comparable](
+    arr: list[T],
+    k: int,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    *,
+    key: Optional[Callable[[T], Any]] = None,
+) -> None:
+    """
+    Partially sort the input list in-place around its k-th position.
+
+    On return arr[k] is the element that would be there if arr[start:end]
+    were sorted, no element before it is greater and no element after it is
+    smaller. Runs in O(n) time, also in the worst case.
+
+    Args:
+        arr: The list to rearrange
+        k: The index to settle, in [start, end)
+        start: The start index of the list to be processed (inclusive)
+        end: The end index of the list to be processed (exclusive)
+        key: Function computing the sort key of an element, called once per
+            element
+
+    Raises:
+        ValueError: If start/end indices or k are invalid
+    """
+    total_length = len(arr)
+    if start is None:
+        start = 0
+    if end is None:
+        end = total_length
+
+    if start < 0 or start >= end or end > total_length:
+        raise ValueError('Invalid start/end arguments for nth_element')
+    if k < start or k >= end:
+        raise ValueError('k must be in range [start, end)')
+
+    if key is not None:
+        _sort_decorated(
+            arr, start, end, key, False,
+            lambda a, lo, hi: _select(a, lo, hi, k - start),
+        )
+    else:
+        _select(arr, start, end, k)
+
+
+def select_k[T: Comparable](
+    arr: list[T], k: int, *, key: Optional[Callable[[T], Any]] = None
+) -> T:
+    """
+    Return the k-th smallest element (0-based) of the input list in O(n).
+
+    Args:
+        arr: The list to select from, it is not modified
+        k: The rank of the element to return
+        key: Function computing the sort key of an element
+
+    Returns:
+        The element at index k of the sorted list
+
+    Raises:
+        ValueError: If k is out of range
+    """
+    if k < 0 or k >= len(arr):
+        raise ValueError('k must be in range [0, len(arr))')
+    work = list(arr)
+    nth_element(work, k, key=key)
+    return work[k]
+
+
+def top_k[T: Comparable](
+    iterable: Iterable[T],
+    k: int,
+    *,
+    key: Optional[Callable[[T], Any]] = None,
+    largest: bool = True,
+) -> list[T]:
+    """
+    Return the k largest (or smallest) elements, best first.
+
+    The result is sorted(iterable, key=key, reverse=largest)[:k], ties
+    included. A list is handled by quickselect on a copy followed by a sort
+    of the k selected elements, O(n + k log k). Any other iterable is
+    consumed as a stream through a heap of k elements, O(n log k) time and
+    O(k) memory, so it never has to be materialized.
+
+    Args:
+        iterable: The elements to select from
+        k: The number of elements to return
+        key: Function computing the sort key of an element
+        largest: Return the largest elements if True, the smallest otherwise
+
+    Returns:
+        The selected elements, in order
+    """
+    if k <= 0:
+        return []
+    if not isinstance(iterable, list):
+        select = heapq.nlargest if largest else heapq.nsmallest
+        if key is None:
+            return select(k, iterable)
+        return select(k, iterable, key=key)
+
+    items = iterable
+    length = len(items)
+    keys = items if key is None else [key(item) for item in items]
+    # The position breaks ties so earlier elements win, as with sorted()
+    if largest:
+        decorated = list(zip(keys, range(0, -length, -1)))
+    else:
+        decorated = list(zip(keys, range(length)))
+
+    if k < length:
+        boundary = length - k if largest else k - 1
+        _select(decorated, 0, length, boundary)
+        decorated = decorated[boundary:] if largest else decorated[:k]
+    decorated.sort(reverse=largest)
+    return [items[abs(i)] for _, i in decorated]
@@ -0,0 +1,346 @@
+"""Sorted container kept as a list of sorted blocks."""
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, islice
+from typing import Iterable, Iterator, Optional, overload
+
+from .fenwick import FenwickTree
+from .sorting import Comparable, adaptive_sort
+
+# Target number of elements per block; blocks are split at twice this size
+DEFAULT_LOAD = 1000
+
+
+class SortedList[T: Comparable]:
+    """
+    A list that keeps its values sorted, with fast inserts and rank queries.
+
+    The values are stored in sorted blocks of about load elements, with the
+    maximum of every block kept aside. A value is placed by a binary search
+    over the maxima then one within its block, so add and remove cost
+    O(log n + load) and stay O(sqrt(n)) for load ~ sqrt(n). A block grown to
+    2 * load elements is split in two, and one shrunk below load / 2 is
+    joined to its neighbour. Positions are resolved through a Fenwick tree
+    of the block lengths, which is updated in O(log n) per insert or remove
+    and rebuilt lazily when blocks are split or joined.
+    """
+
+    def __init__(
+        self, iterable: Iterable[T] = (), load: int = DEFAULT_LOAD
+    ) -> None:
+        """
+        Create a sorted list of the values of iterable.
+
+        The values are sorted with adaptive_sort, which runs in close to
+        O(n) when they come out of one of the sorts already.
+
+        Args:
+            iterable: The initial values, in any order
+            load: The target block size
+
+        Raises:
+            ValueError: If load is less than 2
+        """
+        if load < 2:
+            raise ValueError('load must be at least 2')
+        self._load = load
+        self._blocks: list[list[T]] = []
+        self._maxes: list[T] = []
+        self._index: Optional[FenwickTree] = None
+        self._length = 0
+        self.update(iterable)
+
+    @classmethod
+    def from_sorted(
+        cls, values: Iterable[T], load: int = DEFAULT_LOAD
+    ) -> 'SortedList[T]':
+        """
+        Bulk-load a sorted list from values already in ascending order.
+
+        The values are cut into blocks in O(n) without any comparison, so
+        this is the fastest way to wrap the output of merge_sort and the
+        other sorts. The order is not checked.
+
+        Args:
+            values: The values, sorted in ascending order
+            load: The target block size
+
+        Returns:
+            The new sorted list
+        """
+        result = cls(load=load)
+        result._build(list(values))
+        return result
+
+    def _build(self, values: list[T]) -> None:
+        """Replace the content with the sorted values, cut into blocks."""
+        load = self._load
+        self._blocks = [values[i:i + load] for i in range(0, len(values), load)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._index = None
+        self._length = len(values)
+
+    def _positions(self) -> FenwickTree:
+        """Return the tree of block lengths, rebuilding it if needed."""
+        if self._index is None:
+            self._index = FenwickTree.from_counts(map(len, self._blocks))
+        return self._index
+
+    def _resize(self, i: int, delta: int) -> None:
+        """Record that block i changed by delta elements."""
+        self._length += delta
+        if self._index is not None:
+            self._index.add(i, delta)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[T]:
+        return chain.from_iterable(self._blocks)
+
+    def __reversed__(self) -> Iterator[T]:
+        return chain.from_iterable(map(reversed, reversed(self._blocks)))
+
+    def __contains__(self, value: T) -> bool:
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return False
+        block = self._blocks[i]
+        return block[bisect_left(block, value)] == value
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({list(self)!r})'
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self._build([])
+
+    def update(self, iterable: Iterable[T]) -> None:
+        """
+        Add all values of iterable.
+
+        The current content and the new values are sorted together with
+        adaptive_sort, which merges the existing sorted run with the new
+        values, and the blocks are rebuilt.
+
+        Args:
+            iterable: The values to add, in any order
+        """
+        values = list(iterable)
+        if not values:
+            return
+        if self._length:
+            values = list(self) + values
+        adaptive_sort(values)
+        self._build(values)
+
+    def add(self, value: T) -> None:
+        """
+        Insert value after any equal values, in O(log n + load).
+
+        Args:
+            value: The value to insert
+        """
+        maxes = self._maxes
+        if not maxes:
+            self._build([value])
+            return
+
+        i = bisect_right(maxes, value)
+        if i == len(maxes):
+            i -= 1
+            self._blocks[i].append(value)
+            maxes[i] = value
+        else:
+            insort(self._blocks[i], value)
+        self._resize(i, 1)
+
+        block = self._blocks[i]
+        if len(block) >= 2 * self._load:
+            half = len(block) // 2
+            self._blocks[i:i + 1] = [block[:half], block[half:]]
+            maxes[i:i + 1] = [block[half - 1], block[-1]]
+            self._index = None
+
+    def remove(self, value: T) -> None:
+        """
+        Remove one occurrence of value, in O(log n + load).
+
+        Args:
+            value: The value to remove
+
+        Raises:
+            ValueError: If value is not in the list
+        """
+        if not self.discard(value):
+            raise ValueError(f'{value!r} not in SortedList')
+
+    def discard(self, value: T) -> bool:
+        """
+        Remove one occurrence of value if present.
+
+        Args:
+            value: The value to remove
+
+        Returns:
+            True if a value was removed
+        """
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return False
+        block = self._blocks[i]
+        j = bisect_left(block, value)
+        if not block[j] == value:
+            return False
+        self._delete(i, j)
+        return True
+
+    def _delete(self, i: int, j: int) -> None:
+        """Delete the value at offset j of block i, rebalancing blocks."""
+        blocks = self._blocks
+        maxes = self._maxes
+        block = blocks[i]
+        del block[j]
+        self._resize(i, -1)
+
+        if not block:
+            del blocks[i]
+            del maxes[i]
+            self._index = None
+        elif len(block) < self._load // 2 and len(blocks) > 1:
+            # Join the block to a neighbour, then split again if too large
+            if i == len(blocks) - 1:
+                i -= 1
+            joined = blocks[i] + blocks[i + 1]
+            if len(joined) >= 2 * self._load:
+                half = len(joined) // 2
+                blocks[i:i + 2] = [joined[:half], joined[half:]]
+                maxes[i:i + 2] = [joined[half - 1], joined[-1]]
+            else:
+                blocks[i:i + 2] = [joined]
+                maxes[i:i + 2] = [joined[-1]]
+            self._index = None
+        else:
+            maxes[i] = block[-1]
+
+    def pop(self, index: int = -1) -> T:
+        """
+        Remove and return the value at position index, in O(log n + load).
+
+        Raises:
+            IndexError: If index is out of range
+        """
+        i, j = self._locate(index)
+        value = self._blocks[i][j]
+        self._delete(i, j)
+        return value
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """Return the block and offset of position index."""
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError('SortedList index out of range')
+        if index < len(self._blocks[0]):
+            return 0, index
+        return self._positions().search(index)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        """
+        Return the value at a position in O(log n), or a list for a slice.
+
+        Contiguous slices only visit the blocks they cover.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return list(self.islice(start, stop))
+        i, j = self._locate(index)
+        return self._blocks[i][j]
+
+    def islice(self, start: int = 0, stop: Optional[int] = None) -> Iterator[T]:
+        """
+        Iterate over the values at positions [start, stop).
+
+        Args:
+            start: The first position (inclusive)
+            stop: The last position (exclusive), the end by default
+
+        Returns:
+            An iterator over the values
+        """
+        if stop is None or stop > self._length:
+            stop = self._length
+        start = max(start, 0)
+        if start >= stop:
+            return iter(())
+        i, j = self._locate(start)
+        values = chain(islice(self._blocks[i], j, None), *self._blocks[i + 1:])
+        return islice(values, stop - start)
+
+    def irange(
+        self,
+        minimum: Optional[T] = None,
+        maximum: Optional[T] = None,
+        inclusive: tuple[bool, bool] = (True, True),
+    ) -> Iterator[T]:
+        """
+        Iterate over the values between minimum and maximum, in order.
+
+        Args:
+            minimum: The lower bound, unbounded if None
+            maximum: The upper bound, unbounded if None
+            inclusive: Whether the lower and upper bounds are included
+
+        Returns:
+            An iterator over the values in range
+        """
+        if minimum is None:
+            start = 0
+        elif inclusive[0]:
+            start = self.bisect_left(minimum)
+        else:
+            start = self.bisect_right(minimum)
+
+        if maximum is None:
+            stop = self._length
+        elif inclusive[1]:
+            stop = self.bisect_right(maximum)
+        else:
+            stop = self.bisect_left(maximum)
+        return self.islice(start, stop)
+
+    def bisect_left(self, value: T) -> int:
+        """Return the insertion position of value before equal values."""
+        maxes = self._maxes
+        i = bisect_left(maxes, value)
+        if i == len(maxes):
+            return self._length
+        offset = bisect_left(self._blocks[i], value)
+        return self._positions().prefix_sum(i) + offset
+
+    def bisect_right(self, value: T) -> int:
+        """Return the insertion position of value after equal values."""
+        maxes = self._maxes
+        i = bisect_right(maxes, value)
+        if i == len(maxes):
+            return self._length
+        offset = bisect_right(self._blocks[i], value)
+        return self._positions().prefix_sum(i) + offset
+
+    bisect = bisect_right
+
+    def rank(self, value: T) -> int:
+        """Return the number of values strictly less than value, in O(log n)."""
+        return self.bisect_left(value)
+
+    def count(self, value: T) -> int:
+        """Return the number of occurrences of value."""
+        return self.bisect_right(value) - self.bisect_left(value)
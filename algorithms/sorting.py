@@ -1,5 +1,19 @@
+import random
+from bisect import bisect_left, bisect_right
 from enum import Enum
-from typing import Protocol, Any, Optional
+from typing import Protocol, Any, Callable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from .backend import (
+    Backend,
+    buffer_view,
+    numeric_array,
+    numpy_counting_sort,
+    numpy_radix_sort,
+    numpy_sort,
+    select_numeric,
+)
 
 
 class Comparable(Protocol):
@@ -10,21 +24,212 @@ class Comparable(Protocol):
     def __le__(self, other: Any) -> bool: ...
 
 
+# Ranges at or below this length are finished with insertion sort
+INSERTION_SORT_CUTOFF = 16
+
+
+def _sort_decorated[T](
+    arr: list[T],
+    start: int,
+    end: int,
+    key: Optional[Callable[[T], Any]],
+    reverse: bool,
+    sort_func: Callable[[list[tuple[Any, int]], int, int], None],
+) -> None:
+    """
+    Decorate-sort-undecorate arr[start:end] with sort_func.
+
+    Every key is computed once and paired with the element position, so the
+    sort compares (key, position) tuples in C instead of calling __lt__ on
+    the elements themselves. The position also breaks ties, which keeps equal
+    keys in their original order even for unstable sorts. For reverse order
+    the positions are negated and the ascending result is reversed, matching
+    sorted(..., reverse=True).
+    """
+    items = arr[start:end]
+    keys = items if key is None else [key(item) for item in items]
+    positions = range(0, -len(items), -1) if reverse else range(len(items))
+    decorated: list[tuple[Any, int]] = list(zip(keys, positions))
+    sort_func(decorated, 0, len(decorated))
+    if reverse:
+        decorated.reverse()
+        arr[start:end] = [items[-i] for _, i in decorated]
+    else:
+        arr[start:end] = [items[i] for _, i in decorated]
+
+
+def _sort_with_backend[T](
+    arr: list[T] | np.ndarray,
+    start: int,
+    end: int,
+    key: Optional[Callable[[T], Any]],
+    reverse: bool,
+    backend: Backend,
+    sort_func: Callable[[list[T]], None],
+) -> bool:
+    """
+    Sort arr[start:end] wherever the pure-Python kernels cannot run on arr.
+
+    Numeric input selected for the NumPy backend is sorted there. An ndarray
+    on the Python backend is sorted as a list copy with sort_func, since
+    slicing an ndarray gives views rather than the copies the kernels use.
+
+    Returns:
+        True if the range is sorted, False if the kernels should sort arr.
+        Views made by buffer_view are ndarrays, always sorted here, so on
+        False arr is the caller's own list
+    """
+    values = select_numeric(arr, start, end, key, backend)
+    if values is not None:
+        numpy_sort(arr, start, end, values, reverse)
+        return True
+    if isinstance(arr, np.ndarray):
+        work = arr[start:end].tolist()
+        sort_func(work)
+        arr[start:end] = work
+        return True
+    return False
+
+
+def _insertion_sort[T: Comparable](arr: list[T], start: int, end: int) -> None:
+    """Stable insertion sort of arr[start:end] in-place."""
+    for i in range(start + 1, end):
+        item = arr[i]
+        j = i
+        while j > start and item < arr[j - 1]:
+            arr[j] = arr[j - 1]
+            j -= 1
+        arr[j] = item
+
+
+def insertion_sort[T: Comparable](
+    arr: list[T],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    *,
+    key: Optional[Callable[[T], Any]] = None,
+    reverse: bool = False,
+    backend: Backend = Backend.Auto,
+) -> None:
+    """
+    Stable insertion sort of the input list in-place.
+
+    Args:
+        arr: The list, ndarray, array.array or memoryview to sort
+        start: The start index of the list to be sorted (inclusive)
+        end: The end index of the list to be sorted (exclusive)
+        key: Function computing the sort key of an element, called once per
+            element
+        reverse: Sort in descending order, keeping equal elements stable
+        backend: Backend.NumPy sorts numeric lists and ndarrays vectorized,
+            Backend.Auto does so when the input is numeric and no key is
+            given, Backend.Python always uses the pure-Python kernel
+
+    Raises:
+        ValueError: If start/end indices or backend are invalid
+    """
+    view = buffer_view(arr)
+    if len(arr) == 0:
+        return
+
+    total_length = len(arr)
+    if start is None:
+        start = 0
+    if end is None:
+        end = total_length
+
+    if start < 0 or start >= end or end > total_length:
+        raise ValueError('Invalid start/end arguments for insertion_sort')
+
+    if _sort_with_backend(
+        view, start, end, key, reverse, backend,
+        lambda a: insertion_sort(
+            a, key=key, reverse=reverse, backend=Backend.Python
+        ),
+    ):
+        return
+
+    if key is not None or reverse:
+        _sort_decorated(arr, start, end, key, reverse, _insertion_sort)
+    else:
+        _insertion_sort(arr, start, end)
+
+
+def _merge[T: Comparable](
+    src: list[T], dst: list[T], start: int, middle: int, end: int
+) -> None:
+    """Merge the sorted runs src[start:middle] and src[middle:end] into dst."""
+    i = start
+    j = middle
+    for k in range(start, end):
+        if i < middle and (j >= end or not src[j] < src[i]):
+            dst[k] = src[i]
+            i += 1
+        else:
+            dst[k] = src[j]
+            j += 1
+
+
+def _merge_sort_into[T: Comparable](
+    src: list[T], dst: list[T], start: int, end: int, cutoff: int
+) -> None:
+    """
+    Sort dst[start:end], using src[start:end] as scratch space.
+
+    Both buffers must hold the same elements in [start, end) on entry. The
+    roles of the two buffers swap at every level, so the merged output of one
+    level is the input of the next and no data is copied back.
+    """
+    if end - start <= cutoff:
+        _insertion_sort(dst, start, end)
+        return
+
+    middle = start + (end - start) // 2
+    _merge_sort_into(dst, src, start, middle, cutoff)
+    _merge_sort_into(dst, src, middle, end, cutoff)
+    if not src[middle] < src[middle - 1]:
+        # The two halves are already in order, skip the merge
+        dst[start:end] = src[start:end]
+    else:
+        _merge(src, dst, start, middle, end)
+
+
 def merge_sort[T: Comparable](
-    arr: list[T], start: Optional[int] = None, end: Optional[int] = None
+    arr: list[T],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    cutoff: int = INSERTION_SORT_CUTOFF,
+    *,
+    key: Optional[Callable[[T], Any]] = None,
+    reverse: bool = False,
+    backend: Backend = Backend.Auto,
 ) -> None:
     """
     Merge sort the input list in-place.
 
+    A single auxiliary buffer is allocated up front and the merge passes
+    ping-pong between it and arr. Ranges of at most cutoff elements are
+    finished with insertion sort, and merges of halves that are already in
+    order are skipped. The sort is stable. Numeric lists and ndarrays can be
+    sorted by the NumPy backend instead, with the same result.
+
     Args:
-        arr: The list to sort
+        arr: The list, ndarray, array.array or memoryview to sort
         start: The start index of the list to be sorted (inclusive)
         end: The end index of the list to be sorted (exclusive)
+        cutoff: Ranges of at most this length are sorted with insertion sort
+        key: Function computing the sort key of an element, called once per
+            element
+        reverse: Sort in descending order, keeping equal elements stable
+        backend: Backend.NumPy sorts numeric lists and ndarrays vectorized,
+            Backend.Auto does so when the input is numeric and no key is
+            given, Backend.Python always uses the pure-Python kernel
 
     Raises:
-        ValueError: If start/end indices are invalid
+        ValueError: If start/end indices, cutoff or backend are invalid
     """
-    if not arr:
+    view = buffer_view(arr)
+    if len(arr) == 0:
         return
 
     total_length = len(arr)
@@ -35,44 +240,588 @@ def merge_sort[T: Comparable](
 
     if start < 0 or start >= end or end > total_length:
         raise ValueError('Invalid start/end arguments for merge_sort')
+    if cutoff < 1:
+        raise ValueError('cutoff must be a positive integer')
+
+    if end - start <= 1:
+        return
+
+    if _sort_with_backend(
+        view, start, end, key, reverse, backend,
+        lambda a: merge_sort(
+            a, cutoff=cutoff, key=key, reverse=reverse, backend=Backend.Python
+        ),
+    ):
+        return
+
+    if key is not None or reverse:
+        _sort_decorated(
+            arr, start, end, key, reverse,
+            lambda a, lo, hi: merge_sort(a, lo, hi, cutoff, backend=Backend.Python),
+        )
+        return
+
+    if start == 0 and end == total_length:
+        _merge_sort_into(arr[:], arr, 0, total_length, cutoff)
+    else:
+        work = arr[start:end]
+        _merge_sort_into(work[:], work, 0, len(work), cutoff)
+        arr[start:end] = work
+
+
+def merge_sort_bottom_up[T: Comparable](
+    arr: list[T],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    cutoff: int = INSERTION_SORT_CUTOFF,
+    *,
+    key: Optional[Callable[[T], Any]] = None,
+    reverse: bool = False,
+    backend: Backend = Backend.Auto,
+) -> None:
+    """
+    Iterative bottom-up merge sort of the input list in-place.
+
+    Runs of cutoff elements are first sorted with insertion sort, then merged
+    pairwise with doubling widths, alternating between arr and one auxiliary
+    buffer. There is no recursion, so there is no per-call overhead and no
+    depth limit. The sort is stable.
+
+    Args:
+        arr: The list, ndarray, array.array or memoryview to sort
+        start: The start index of the list to be sorted (inclusive)
+        end: The end index of the list to be sorted (exclusive)
+        cutoff: Length of the initial runs sorted with insertion sort
+        key: Function computing the sort key of an element, called once per
+            element
+        reverse: Sort in descending order, keeping equal elements stable
+        backend: Backend.NumPy sorts numeric lists and ndarrays vectorized,
+            Backend.Auto does so when the input is numeric and no key is
+            given, Backend.Python always uses the pure-Python kernel
+
+    Raises:
+        ValueError: If start/end indices, cutoff or backend are invalid
+    """
+    view = buffer_view(arr)
+    if len(arr) == 0:
+        return
+
+    total_length = len(arr)
+    if start is None:
+        start = 0
+    if end is None:
+        end = total_length
+
+    if start < 0 or start >= end or end > total_length:
+        raise ValueError('Invalid start/end arguments for merge_sort_bottom_up')
+    if cutoff < 1:
+        raise ValueError('cutoff must be a positive integer')
 
     length = end - start
     if length <= 1:
         return
-    elif length == 2:
-        if arr[start] > arr[end - 1]:
-            arr[start], arr[end - 1] = arr[end - 1], arr[start]
+
+    if _sort_with_backend(
+        view, start, end, key, reverse, backend,
+        lambda a: merge_sort_bottom_up(
+            a, cutoff=cutoff, key=key, reverse=reverse, backend=Backend.Python
+        ),
+    ):
+        return
+
+    if key is not None or reverse:
+        _sort_decorated(
+            arr, start, end, key, reverse,
+            lambda a, lo, hi: merge_sort_bottom_up(
+                a, lo, hi, cutoff, backend=Backend.Python
+            ),
+        )
+        return
+
+    work = arr if start == 0 and end == total_length else arr[start:end]
+    for lo in range(0, length, cutoff):
+        _insertion_sort(work, lo, min(lo + cutoff, length))
+
+    src = work
+    dst = work[:]
+    width = cutoff
+    while width < length:
+        for lo in range(0, length, 2 * width):
+            middle = min(lo + width, length)
+            hi = min(lo + 2 * width, length)
+            if middle >= hi or not src[middle] < src[middle - 1]:
+                dst[lo:hi] = src[lo:hi]
+            else:
+                _merge(src, dst, lo, middle, hi)
+        src, dst = dst, src
+        width *= 2
+
+    if src is not work:
+        work[:] = src
+    if work is not arr:
+        arr[start:end] = work
+
+
+# Natural runs shorter than this are extended with binary insertion sort
+ADAPTIVE_MIN_RUN = 32
+# Consecutive wins of one run after which the merge switches to galloping
+MIN_GALLOP = 7
+
+
+def _count_run[T: Comparable](arr: list[T], start: int, end: int) -> int:
+    """
+    Return the end of the natural run starting at start.
+
+    A strictly descending run is reversed in place, so the run is ascending
+    on return. Descending runs must be strict to keep the sort stable.
+    """
+    i = start + 1
+    if i >= end:
+        return end
+    if arr[i] < arr[start]:
+        while i + 1 < end and arr[i + 1] < arr[i]:
+            i += 1
+        arr[start:i + 1] = arr[start:i + 1][::-1]
     else:
-        middle = start + length // 2
-        merge_sort(arr, start, middle)
-        merge_sort(arr, middle, end)
-        # Drawback of merge sort algorithm that requires extra memory space for merging
-        a = arr[start:middle]
-        b = arr[middle:end]
-        i = 0
-        j = 0
-        max_i = len(a) - 1
-        max_j = len(b) - 1
-        for k in range(start, end):
-            if i <= max_i and j <= max_j:
-                if a[i] < b[j]:
-                    arr[k] = a[i]
-                    i += 1
-                else:
-                    arr[k] = b[j]
-                    j += 1
-            elif i <= max_i:
-                arr[k] = a[i]
-                i += 1
-            elif j <= max_j:
-                arr[k] = b[j]
+        while i + 1 < end and not arr[i + 1] < arr[i]:
+            i += 1
+    return i + 1
+
+
+def _binary_insertion_sort[T: Comparable](
+    arr: list[T], start: int, end: int, sorted_end: int
+) -> None:
+    """Insert arr[sorted_end:end] into the sorted arr[start:sorted_end]."""
+    for i in range(sorted_end, end):
+        item = arr[i]
+        position = bisect_right(arr, item, start, i)
+        arr[position + 1:i + 1] = arr[position:i]
+        arr[position] = item
+
+
+def _gallop_right[T: Comparable](item: T, arr: list[T], start: int, end: int) -> int:
+    """
+    Return the first index in the sorted arr[start:end] where item < arr[i].
+
+    The bracket is found by probing start, start + 1, start + 3, ... so a
+    position close to start costs O(log distance), then bisect narrows it.
+    """
+    last = start
+    offset = 1
+    while start + offset - 1 < end and not item < arr[start + offset - 1]:
+        last = start + offset
+        offset <<= 1
+    return bisect_right(arr, item, last, min(start + offset - 1, end))
+
+
+def _gallop_left[T: Comparable](item: T, arr: list[T], start: int, end: int) -> int:
+    """Return the first index in the sorted arr[start:end] where item <= arr[i]."""
+    last = start
+    offset = 1
+    while start + offset - 1 < end and arr[start + offset - 1] < item:
+        last = start + offset
+        offset <<= 1
+    return bisect_left(arr, item, last, min(start + offset - 1, end))
+
+
+def _merge_adjacent[T: Comparable](
+    arr: list[T], start: int, middle: int, end: int
+) -> None:
+    """
+    Stable merge of the sorted runs arr[start:middle] and arr[middle:end].
+
+    Elements already in their final place at both ends are skipped first.
+    The merge then goes one element at a time until one run wins MIN_GALLOP
+    times in a row, and switches to copying whole galloped blocks until
+    both runs win less than MIN_GALLOP elements per step.
+    """
+    start = _gallop_right(arr[middle], arr, start, middle)
+    if start == middle:
+        return
+    end = _gallop_left(arr[middle - 1], arr, middle, end)
+    if end == middle:
+        return
+
+    left = arr[start:middle]
+    nb_left = len(left)
+    i = 0
+    j = middle
+    k = start
+    while i < nb_left and j < end:
+        left_wins = 0
+        right_wins = 0
+        while i < nb_left and j < end:
+            if arr[j] < left[i]:
+                arr[k] = arr[j]
                 j += 1
+                right_wins += 1
+                left_wins = 0
+            else:
+                arr[k] = left[i]
+                i += 1
+                left_wins += 1
+                right_wins = 0
+            k += 1
+            if left_wins >= MIN_GALLOP or right_wins >= MIN_GALLOP:
+                break
+
+        while i < nb_left and j < end:
+            taken_left = _gallop_right(arr[j], left, i, nb_left) - i
+            if taken_left:
+                arr[k:k + taken_left] = left[i:i + taken_left]
+                k += taken_left
+                i += taken_left
+                if i >= nb_left:
+                    break
+            taken_right = _gallop_left(left[i], arr, j, end) - j
+            if taken_right:
+                arr[k:k + taken_right] = arr[j:j + taken_right]
+                k += taken_right
+                j += taken_right
+            if taken_left < MIN_GALLOP and taken_right < MIN_GALLOP:
+                break
+
+    if i < nb_left:
+        # The rest of the second run is already in place after these
+        arr[k:k + nb_left - i] = left[i:]
+
+
+def _node_power(
+    length: int, run_start: int, run_length: int, next_length: int
+) -> int:
+    """
+    Powersort merge-tree depth of the boundary between two adjacent runs.
+
+    run_start is relative to the start of the sorted range of the given
+    length. The power is the first bit where the midpoints of the two runs,
+    as fractions of the range, differ.
+    """
+    a = 2 * run_start + run_length
+    b = a + run_length + next_length
+    power = 0
+    while True:
+        power += 1
+        if a >= length:
+            a -= length
+            b -= length
+        elif b >= length:
+            break
+        a <<= 1
+        b <<= 1
+    return power
+
+
+def _adaptive_sort_range[T: Comparable](arr: list[T], start: int, end: int) -> None:
+    """Powersort of arr[start:end] in-place."""
+    length = end - start
+
+    def next_run(run_start: int) -> int:
+        run_end = _count_run(arr, run_start, end)
+        if run_end - run_start < ADAPTIVE_MIN_RUN:
+            forced_end = min(run_start + ADAPTIVE_MIN_RUN, end)
+            _binary_insertion_sort(arr, run_start, forced_end, run_end)
+            run_end = forced_end
+        return run_end
+
+    # Stack of (run start, power of the boundary after the run); every run
+    # ends where the next one on the stack, or the current run, begins
+    stack: list[tuple[int, int]] = []
+    run_start = start
+    run_end = next_run(start)
+    while run_end < end:
+        next_end = next_run(run_end)
+        power = _node_power(
+            length, run_start - start, run_end - run_start, next_end - run_end
+        )
+        while stack and stack[-1][1] > power:
+            top_start = stack.pop()[0]
+            _merge_adjacent(arr, top_start, run_start, run_end)
+            run_start = top_start
+        stack.append((run_start, power))
+        run_start, run_end = run_end, next_end
+
+    while stack:
+        top_start = stack.pop()[0]
+        _merge_adjacent(arr, top_start, run_start, run_end)
+        run_start = top_start
+
+
+def adaptive_sort[T: Comparable](
+    arr: list[T],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    *,
+    key: Optional[Callable[[T], Any]] = None,
+    reverse: bool = False,
+    backend: Backend = Backend.Auto,
+) -> None:
+    """
+    Adaptive natural-run merge sort (powersort) of the input list in-place.
+
+    Ascending and strictly descending runs already present in the input are
+    detected, descending ones are reversed, and runs shorter than
+    ADAPTIVE_MIN_RUN are extended with binary insertion sort. Runs are merged
+    following the powersort policy, with galloping when one run keeps
+    winning. Sorted and nearly-sorted inputs take close to O(n) time, the
+    worst case is O(n log n). The sort is stable.
+
+    Args:
+        arr: The list, ndarray, array.array or memoryview to sort
+        start: The start index of the list to be sorted (inclusive)
+        end: The end index of the list to be sorted (exclusive)
+        key: Function computing the sort key of an element, called once per
+            element
+        reverse: Sort in descending order, keeping equal elements stable
+        backend: Backend.NumPy sorts numeric lists and ndarrays vectorized,
+            Backend.Auto does so when the input is numeric and no key is
+            given, Backend.Python always uses the pure-Python kernel
+
+    Raises:
+        ValueError: If start/end indices or backend are invalid
+    """
+    view = buffer_view(arr)
+    if len(arr) == 0:
+        return
+
+    total_length = len(arr)
+    if start is None:
+        start = 0
+    if end is None:
+        end = total_length
+
+    if start < 0 or start >= end or end > total_length:
+        raise ValueError('Invalid start/end arguments for adaptive_sort')
+
+    if end - start <= 1:
+        return
+
+    if _sort_with_backend(
+        view, start, end, key, reverse, backend,
+        lambda a: adaptive_sort(a, key=key, reverse=reverse, backend=Backend.Python),
+    ):
+        return
+
+    if key is not None or reverse:
+        _sort_decorated(arr, start, end, key, reverse, _adaptive_sort_range)
+        return
+
+    _adaptive_sort_range(arr, start, end)
+
+
+def _integer_range(
+    arr: Sequence[Any] | np.ndarray,
+    start: Optional[int],
+    end: Optional[int],
+    name: str,
+) -> Optional[tuple[int, int, np.ndarray]]:
+    """Validate the range of an integer sort and return it as an ndarray."""
+    if len(arr) == 0:
+        return None
+
+    total_length = len(arr)
+    if start is None:
+        start = 0
+    if end is None:
+        end = total_length
+
+    if start < 0 or start >= end or end > total_length:
+        raise ValueError(f'Invalid start/end arguments for {name}')
+
+    values = numeric_array(arr[start:end])
+    if values is None or values.dtype.kind not in 'iu':
+        raise ValueError(f'{name} requires a list of ints or an integer ndarray')
+    return start, end, values
+
+
+def _write_back(
+    arr: list[Any] | np.ndarray,
+    start: int,
+    end: int,
+    result: np.ndarray,
+    reverse: bool,
+) -> None:
+    if reverse:
+        result = result[::-1]
+    if isinstance(arr, np.ndarray):
+        arr[start:end] = result
+    else:
+        arr[start:end] = result.tolist()
+
+
+def counting_sort(
+    arr: list[int],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    *,
+    reverse: bool = False,
+) -> None:
+    """
+    Counting sort of integers in-place, O(n + k) for a value range of k.
+
+    The occurrences of every value are counted with NumPy and the sorted
+    range is rebuilt from the counts, without any comparison.
+
+    Args:
+        arr: The ints to sort, as a list, ndarray, array.array or memoryview
+        start: The start index of the list to be sorted (inclusive)
+        end: The end index of the list to be sorted (exclusive)
+        reverse: Sort in descending order
+
+    Raises:
+        ValueError: If start/end indices are invalid, the input is not
+            integer or its value range exceeds COUNTING_SORT_MAX_SPAN
+    """
+    view = buffer_view(arr)
+    checked = _integer_range(view, start, end, 'counting_sort')
+    if checked is not None:
+        start, end, values = checked
+        _write_back(view, start, end, numpy_counting_sort(values), reverse)
+
+
+def radix_sort(
+    arr: list[int],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    radix_bits: int = 8,
+    *,
+    reverse: bool = False,
+) -> None:
+    """
+    LSD radix sort of integers in-place, one pass per radix_bits of range.
+
+    Every pass is a stable NumPy bucket pass on one digit of the values
+    offset by their minimum, so negative values are supported and bounded
+    ranges such as timestamps or ids need few passes.
+
+    Args:
+        arr: The ints to sort, as a list, ndarray, array.array or memoryview
+        start: The start index of the list to be sorted (inclusive)
+        end: The end index of the list to be sorted (exclusive)
+        radix_bits: Number of bits per digit, in [1, 16]
+        reverse: Sort in descending order
+
+    Raises:
+        ValueError: If start/end indices or radix_bits are invalid, or the
+            input is not integer
+    """
+    view = buffer_view(arr)
+    checked = _integer_range(view, start, end, 'radix_sort')
+    if checked is not None:
+        start, end, values = checked
+        _write_back(view, start, end, numpy_radix_sort(values, radix_bits), reverse)
 
 
 class QsPivot(Enum):
     First = 1
     Last = 2
     Random = 3
+    MedianOfThree = 4
+    Ninther = 5
+
+
+# Ranges shorter than this use median-of-three even when Ninther is requested
+NINTHER_THRESHOLD = 40
+
+
+def _median_of_three[T: Comparable](arr: list[T], i: int, j: int, k: int) -> int:
+    """Return the index of the median of arr[i], arr[j] and arr[k]."""
+    a, b, c = arr[i], arr[j], arr[k]
+    if a < b:
+        if b < c:
+            return j
+        return k if a < c else i
+    if a < c:
+        return i
+    return k if b < c else j
+
+
+def _select_pivot[T: Comparable](
+    arr: list[T],
+    start: int,
+    end: int,
+    pivot: QsPivot,
+    rng: Optional[random.Random] = None,
+) -> int:
+    """
+    Pick the pivot index in [start, end) for the given strategy.
+
+    Random pivots are drawn from rng, the module-level generator if None.
+    """
+    if pivot == QsPivot.First:
+        return start
+    elif pivot == QsPivot.Last:
+        return end - 1
+    elif pivot == QsPivot.Random:
+        return (rng or random).randrange(start, end)
+
+    last = end - 1
+    middle = start + (end - start) // 2
+    if pivot == QsPivot.Ninther and end - start >= NINTHER_THRESHOLD:
+        # Tukey's ninther: the median of the medians of three samples of three
+        step = (end - start) // 8
+        return _median_of_three(
+            arr,
+            _median_of_three(arr, start, start + step, start + 2 * step),
+            _median_of_three(arr, middle - step, middle, middle + step),
+            _median_of_three(arr, last - 2 * step, last - step, last),
+        )
+    return _median_of_three(arr, start, middle, last)
+
+
+class QsPartition(Enum):
+    ThreeWay = 1
+    Hoare = 2
+    Block = 3
+
+
+# Number of elements scanned at a time by block_partition
+PARTITION_BLOCK = 64
+
+
+def _check_partition_args[T](
+    arr: list[T], start: int, end: int, i_pivot: int, name: str
+) -> None:
+    if not arr:
+        raise ValueError("Cannot partition empty array")
+
+    total_length = len(arr)
+    if start < 0 or start >= end or end > total_length:
+        raise ValueError(f'Invalid start/end arguments for {name}')
+    if i_pivot < start or i_pivot >= end:
+        raise ValueError('i_pivot must be in range [start, end)')
+
+
+def _hoare_scan[T: Comparable](
+    arr: list[T], start: int, left: int, right: int, pivot_value: T
+) -> int:
+    """
+    Partition arr[left:right] around the pivot held in arr[start].
+
+    arr[start + 1:left] must hold no element greater than the pivot, and
+    arr[right:end] no element less than it. The scans stop on elements equal
+    to the pivot, so runs of duplicates are split evenly. The pivot stops
+    every right scan, and after each swap the swapped elements stop the
+    next scans, so only the first left scan checks its bound.
+
+    Returns:
+        The final position of the pivot
+    """
+    i = left
+    while i < right and arr[i] < pivot_value:
+        i += 1
+    j = right - 1
+    while pivot_value < arr[j]:
+        j -= 1
+    while i < j:
+        arr[i], arr[j] = arr[j], arr[i]
+        i += 1
+        while arr[i] < pivot_value:
+            i += 1
+        j -= 1
+        while pivot_value < arr[j]:
+            j -= 1
+    arr[start], arr[j] = arr[j], arr[start]
+    return j
 
 
 def partition[T: Comparable](
@@ -81,6 +830,11 @@ def partition[T: Comparable](
     """
     Partition the arr between [start, end) using the given index i_pivot.
 
+    Hoare partition: the pivot value is read once, the pivot is moved to
+    start where it bounds the right scan, and both scans stop on equal
+    elements. Elements before the returned position are not greater than
+    the pivot, elements after it are not less.
+
     Args:
         arr: The list to partition
         start: Start element index (inclusive)
@@ -93,34 +847,215 @@ def partition[T: Comparable](
     Raises:
         ValueError: If indices are invalid
     """
-    if not arr:
-        raise ValueError("Cannot partition empty array")
+    _check_partition_args(arr, start, end, i_pivot, 'partition')
+    return _hoare_partition(arr, start, end, i_pivot)
+
+
+def _hoare_partition[T: Comparable](
+    arr: list[T], start: int, end: int, i_pivot: int
+) -> int:
+    pivot_value = arr[i_pivot]
+    arr[i_pivot], arr[start] = arr[start], pivot_value
+    return _hoare_scan(arr, start, start + 1, end, pivot_value)
+
+
+def block_partition[T: Comparable](
+    arr: list[T], start: int, end: int, i_pivot: int
+) -> int:
+    """
+    Block partition (BlockQuicksort) of arr between [start, end).
+
+    Instead of alternating scans that branch on every element, a block of
+    PARTITION_BLOCK elements is taken from each end and the offsets of its
+    misplaced elements are collected in one pass, by a comprehension that
+    runs the comparisons back to back. The buffered offsets are then
+    swapped pairwise, and a side is refilled once its offsets are used up.
+    The last few blocks are finished with the Hoare scan. Same result
+    contract as partition.
+
+    Args:
+        arr: The list to partition
+        start: Start element index (inclusive)
+        end: End element index (exclusive)
+        i_pivot: The index of the pivot element
+
+    Returns:
+        The final position of the pivot element
+
+    Raises:
+        ValueError: If indices are invalid
+    """
+    _check_partition_args(arr, start, end, i_pivot, 'block_partition')
+    return _block_partition(arr, start, end, i_pivot)
+
+
+def _block_partition[T: Comparable](
+    arr: list[T], start: int, end: int, i_pivot: int
+) -> int:
+    pivot_value = arr[i_pivot]
+    arr[i_pivot], arr[start] = arr[start], pivot_value
+
+    block = PARTITION_BLOCK
+    lo = start + 1
+    hi = end
+    left_offsets: list[int] = []
+    right_offsets: list[int] = []
+    while True:
+        needed = (0 if left_offsets else block) + (0 if right_offsets else block)
+        if hi - lo < needed:
+            break
+        if not left_offsets:
+            left_offsets = [
+                lo + k for k, item in enumerate(arr[lo:lo + block])
+                if not item < pivot_value
+            ]
+            lo += block
+        if not right_offsets:
+            right_offsets = [
+                hi - 1 - k for k, item in enumerate(reversed(arr[hi - block:hi]))
+                if not pivot_value < item
+            ]
+            hi -= block
+        nb_swaps = min(len(left_offsets), len(right_offsets))
+        for i, j in zip(left_offsets, right_offsets):
+            arr[i], arr[j] = arr[j], arr[i]
+        del left_offsets[:nb_swaps]
+        del right_offsets[:nb_swaps]
+
+    # Misplaced elements may remain in the last block of one side
+    left = left_offsets[0] if left_offsets else lo
+    right = right_offsets[0] + 1 if right_offsets else hi
+    return _hoare_scan(arr, start, left, right, pivot_value)
+
+
+# Two-way partition kernels of quick_sort, without argument checks
+_TWO_WAY_PARTITIONS: dict[
+    QsPartition, Callable[[list[Any], int, int, int], int]
+] = {
+    QsPartition.Hoare: _hoare_partition,
+    QsPartition.Block: _block_partition,
+}
+
+
+def partition3[T: Comparable](
+    arr: list[T], start: int, end: int, i_pivot: int
+) -> tuple[int, int]:
+    """
+    Three-way (Dutch national flag) partition of arr between [start, end).
+
+    After the call arr[start:lt] holds the elements less than the pivot,
+    arr[lt:gt] the elements equal to it and arr[gt:end] the greater ones.
+
+    Args:
+        arr: The list to partition
+        start: Start element index (inclusive)
+        end: End element index (exclusive)
+        i_pivot: The index of the pivot element
+
+    Returns:
+        The (lt, gt) bounds of the block equal to the pivot, gt exclusive
+
+    Raises:
+        ValueError: If indices are invalid
+    """
+    _check_partition_args(arr, start, end, i_pivot, 'partition3')
+
+    pivot_value = arr[i_pivot]
+    lt = start
+    i = start
+    gt = end
+    while i < gt:
+        item = arr[i]
+        if item < pivot_value:
+            arr[lt], arr[i] = item, arr[lt]
+            lt += 1
+            i += 1
+        elif pivot_value < item:
+            gt -= 1
+            arr[gt], arr[i] = item, arr[gt]
+        else:
+            i += 1
+    return lt, gt
+
+
+def _sift_down[T: Comparable](
+    arr: list[T], start: int, root: int, size: int
+) -> None:
+    """Restore the max-heap rooted at offset root of the heap at arr[start:]."""
+    item = arr[start + root]
+    child = 2 * root + 1
+    while child < size:
+        if child + 1 < size and arr[start + child] < arr[start + child + 1]:
+            child += 1
+        if not item < arr[start + child]:
+            break
+        arr[start + root] = arr[start + child]
+        root = child
+        child = 2 * root + 1
+    arr[start + root] = item
+
+
+def heap_sort[T: Comparable](
+    arr: list[T],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    *,
+    key: Optional[Callable[[T], Any]] = None,
+    reverse: bool = False,
+    backend: Backend = Backend.Auto,
+) -> None:
+    """
+    Heap sort the input list in-place.
+
+    Guaranteed O(n log n) time and O(1) extra space. Heap sort alone is not
+    stable, but sorts with a key or in reverse order are.
+
+    Args:
+        arr: The list, ndarray, array.array or memoryview to sort
+        start: The start index of the list to be sorted (inclusive)
+        end: The end index of the list to be sorted (exclusive)
+        key: Function computing the sort key of an element, called once per
+            element
+        reverse: Sort in descending order, keeping equal elements stable
+        backend: Backend.NumPy sorts numeric lists and ndarrays vectorized,
+            Backend.Auto does so when the input is numeric and no key is
+            given, Backend.Python always uses the pure-Python kernel
+
+    Raises:
+        ValueError: If start/end indices or backend are invalid
+    """
+    view = buffer_view(arr)
+    if len(arr) == 0:
+        return
 
     total_length = len(arr)
-    if start < 0 or start >= end or end > total_length:
-        raise ValueError('Invalid start/end arguments for partition')
-    if i_pivot < start or i_pivot >= end:
-        raise ValueError('i_pivot must be in range [start, end)')
+    if start is None:
+        start = 0
+    if end is None:
+        end = total_length
 
-    if i_pivot != start:
-        arr[i_pivot], arr[start] = arr[start], arr[i_pivot]
+    if start < 0 or start >= end or end > total_length:
+        raise ValueError('Invalid start/end arguments for heap_sort')
 
-    left = start
-    right = end - 1
-    i_pivot = left
+    if _sort_with_backend(
+        view, start, end, key, reverse, backend,
+        lambda a: heap_sort(a, key=key, reverse=reverse, backend=Backend.Python),
+    ):
+        return
 
-    while left < right:
-        while left < end and arr[left] <= arr[i_pivot]:  # Move left if item <= pivot
-            left += 1
-        while right >= start and arr[right] > arr[i_pivot]:  # Move right
-            right -= 1
-        if left < right:
-            arr[left], arr[right] = arr[right], arr[left]
+    if key is not None or reverse:
+        _sort_decorated(
+            arr, start, end, key, reverse,
+            lambda a, lo, hi: heap_sort(a, lo, hi, backend=Backend.Python),
+        )
+        return
 
-    # right is then the final location
-    arr[right], arr[i_pivot] = arr[i_pivot], arr[right]
-    i_pivot = right
-    return i_pivot
+    size = end - start
+    for root in range(size // 2 - 1, -1, -1):
+        _sift_down(arr, start, root, size)
+    for last in range(size - 1, 0, -1):
+        arr[start], arr[start + last] = arr[start + last], arr[start]
+        _sift_down(arr, start, 0, last)
 
 
 def quick_sort[T: Comparable](
@@ -128,20 +1063,49 @@ def quick_sort[T: Comparable](
     start: Optional[int] = None,
     end: Optional[int] = None,
     pivot: Optional[QsPivot] = None,
+    introsort: bool = True,
+    *,
+    key: Optional[Callable[[T], Any]] = None,
+    reverse: bool = False,
+    backend: Backend = Backend.Auto,
+    scheme: QsPartition = QsPartition.ThreeWay,
+    seed: Optional[int] = None,
 ) -> None:
     """
     Quick sort algorithm implementation.
 
+    Ranges are split with a three-way partition by default, so runs of equal
+    elements are finished in a single pass; the Hoare and block partitions
+    move fewer elements when there are few duplicates. Random pivots come
+    from one generator created per sort, so a seed makes the run
+    reproducible. Pending ranges are kept on an explicit
+    stack instead of the call stack, so adversarial inputs cannot hit the
+    recursion limit. In introsort mode a range whose partition depth exceeds
+    2*log2(n) is finished with heap sort, which bounds the worst case to
+    O(n log n) for every pivot strategy. Numeric lists and ndarrays can be
+    sorted by the NumPy backend instead.
+
     Args:
-        arr: The list to sort
+        arr: The list, ndarray, array.array or memoryview to sort
         start: The start index of the list to be processed (inclusive)
         end: The end index of the list to be processed (exclusive)
         pivot: The type of pivot selection strategy
+        introsort: Fall back to heap sort once the depth limit is exceeded
+        key: Function computing the sort key of an element, called once per
+            element
+        reverse: Sort in descending order, keeping equal elements stable
+        backend: Backend.NumPy sorts numeric lists and ndarrays vectorized,
+            Backend.Auto does so when the input is numeric and no key is
+            given, Backend.Python always uses the pure-Python kernel
+        scheme: The partition used to split ranges
+        seed: Seed of the random pivot generator, fresh entropy if None
 
     Raises:
-        ValueError: If indices are invalid or pivot type is wrong
+        ValueError: If indices are invalid or pivot/backend/scheme type is
+            wrong
     """
-    if not arr:
+    view = buffer_view(arr)
+    if len(arr) == 0:
         return
 
     total_length = len(arr)
@@ -157,27 +1121,171 @@ def quick_sort[T: Comparable](
         pivot = QsPivot.Random
     if not isinstance(pivot, QsPivot):
         raise ValueError('pivot must be a QsPivot enum value')
+    if not isinstance(scheme, QsPartition):
+        raise ValueError('scheme must be a QsPartition enum value')
 
-    length = end - start
-    if length <= 1:
+    if _sort_with_backend(
+        view, start, end, key, reverse, backend,
+        lambda a: quick_sort(
+            a, pivot=pivot, introsort=introsort, key=key, reverse=reverse,
+            backend=Backend.Python, scheme=scheme, seed=seed,
+        ),
+    ):
+        return
+
+    if key is not None or reverse:
+        _sort_decorated(
+            arr, start, end, key, reverse,
+            lambda a, lo, hi: quick_sort(
+                a, lo, hi, pivot, introsort, backend=Backend.Python,
+                scheme=scheme, seed=seed,
+            ),
+        )
         return
-    elif length == 2:
-        if arr[start] > arr[end - 1]:
-            arr[start], arr[end - 1] = arr[end - 1], arr[start]
+
+    # Explicit stack of pending ranges: the larger side of every partition is
+    # pushed and the loop continues on the smaller one, so the stack never
+    # holds more than log2(n) ranges.
+    depth_limit = 2 * (end - start).bit_length() if introsort else -1
+    rng = random.Random(seed)
+    two_way = _TWO_WAY_PARTITIONS.get(scheme)
+    stack = [(start, end, 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo > 2:
+            if depth == depth_limit:
+                heap_sort(arr, lo, hi, backend=Backend.Python)
+                break
+            depth += 1
+
+            i_pivot = _select_pivot(arr, lo, hi, pivot, rng)
+            if two_way is None:
+                lt, gt = partition3(arr, lo, hi, i_pivot)
+            else:
+                lt = two_way(arr, lo, hi, i_pivot)
+                gt = lt + 1
+            if lt - lo < hi - gt:
+                stack.append((gt, hi, depth))
+                hi = lt
+            else:
+                stack.append((lo, lt, depth))
+                lo = gt
+        if hi - lo == 2 and arr[lo] > arr[lo + 1]:
+            arr[lo], arr[lo + 1] = arr[lo + 1], arr[lo]
+
+
+def quick_sort_iter[T: Comparable](
+    arr: list[T],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    pivot: Optional[QsPivot] = None,
+    *,
+    key: Optional[Callable[[T], Any]] = None,
+    reverse: bool = False,
+    seed: Optional[int] = None,
+) -> Iterator[T]:
+    """
+    Lazily yield the elements of arr[start:end] in sorted order.
+
+    Incremental quick sort: only the leftmost pending range is partitioned,
+    the right sides stay on a stack until the output reaches them, and
+    every element is yielded as soon as its final position is known. The
+    first k elements cost O(n + k log k) expected time, and the generator
+    can be abandoned at any point. Ranges whose partition depth exceeds
+    2*log2(n) are finished with heap sort, as in quick_sort. The input is
+    not modified, the range is copied when iteration starts. The order is
+    stable when a key is given or reverse is set, like quick_sort.
+
+    Args:
+        arr: The list, ndarray, array.array or memoryview to sort
+        start: The start index of the list to be processed (inclusive)
+        end: The end index of the list to be processed (exclusive)
+        pivot: The type of pivot selection strategy
+        key: Function computing the sort key of an element, called once per
+            element
+        reverse: Yield in descending order, keeping equal elements stable
+        seed: Seed of the random pivot generator, fresh entropy if None
+
+    Returns:
+        An iterator over the sorted elements
+
+    Raises:
+        ValueError: If indices are invalid or pivot type is wrong
+    """
+    view = buffer_view(arr, writable=False)
+    total_length = len(arr)
+    if start is None:
+        start = 0
+    if end is None:
+        end = total_length
+
+    if total_length and (start < 0 or start >= end or end > total_length):
+        raise ValueError('Invalid start/end arguments for quick_sort_iter')
+
+    if pivot is None:
+        pivot = QsPivot.Random
+    if not isinstance(pivot, QsPivot):
+        raise ValueError('pivot must be a QsPivot enum value')
+    return _quick_sort_iter(view, start, end, pivot, key, reverse, seed)
+
+
+def _quick_sort_iter[T: Comparable](
+    arr: list[T] | np.ndarray,
+    start: int,
+    end: int,
+    pivot: QsPivot,
+    key: Optional[Callable[[T], Any]],
+    reverse: bool,
+    seed: Optional[int],
+) -> Iterator[T]:
+    items = arr[start:end]
+    items = items.tolist() if isinstance(items, np.ndarray) else list(items)
+    length = len(items)
+    decorated = key is not None or reverse
+    if decorated:
+        # (key, position) pairs as in _sort_decorated: the ascending order of
+        # (key, -position) read from the back is the stable descending order
+        keys = items if key is None else [key(item) for item in items]
+        positions = range(0, -length, -1) if reverse else range(length)
+        work: list[Any] = list(zip(keys, positions))
     else:
-        if pivot == QsPivot.First:
-            i_pivot = start
-        elif pivot == QsPivot.Last:
-            i_pivot = end - 1
-        else:
-            from random import randint
-            i_pivot = randint(start, end - 1)
+        work = items
 
-        i_pivot = partition(arr, start, end, i_pivot)
-        if i_pivot < start or i_pivot >= end:
-            raise ValueError('Invalid pivot index after partition')
+    # Pending ranges with the next one to output on top. Ascending, a range
+    # spans from the output edge up to its bound; in reverse the output runs
+    # from the back, so it spans from its bound up to the edge.
+    depth_limit = 2 * length.bit_length()
+    rng = random.Random(seed)
+    stack = [(0 if reverse else length, 0, False)]
+    edge = length if reverse else 0
+    while stack:
+        bound, depth, done = stack.pop()
+        lo, hi = (bound, edge) if reverse else (edge, bound)
+        if not done:
+            if hi - lo <= INSERTION_SORT_CUTOFF:
+                _insertion_sort(work, lo, hi)
+            elif depth == depth_limit:
+                heap_sort(work, lo, hi, backend=Backend.Python)
+            else:
+                i_pivot = _select_pivot(work, lo, hi, pivot, rng)
+                lt, gt = partition3(work, lo, hi, i_pivot)
+                depth += 1
+                # The block equal to the pivot is final, the sides are not
+                if reverse:
+                    stack.append((lo, depth, False))
+                    stack.append((lt, depth, True))
+                    stack.append((gt, depth, False))
+                else:
+                    stack.append((hi, depth, False))
+                    stack.append((gt, depth, True))
+                    stack.append((lt, depth, False))
+                continue
 
-        if i_pivot - start > 1:
-            quick_sort(arr, start, i_pivot)
-        if end - i_pivot > 2:
-            quick_sort(arr, i_pivot, end)
+        order = range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)
+        if decorated:
+            for j in order:
+                yield items[abs(work[j][1])]
+        else:
+            for j in order:
+                yield work[j]
+        edge = bound
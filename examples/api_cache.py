@@ -0,0 +1,314 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Awaitable, Callable, NamedTuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+DEFAULT_TTL = 60.0
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class Eviction(Enum):
+    """Which entry makes room when the cache is full."""
+
+    LRU = 1  # Least recently used
+    LFU = 2  # Least frequently used, least recently used among equals
+
+
+class CacheStats(NamedTuple):
+    """Counters of a ResponseCache, and its current content."""
+
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    expirations: int
+    entries: int
+    size_bytes: int
+
+
+class _Entry(NamedTuple):
+    body: bytes
+    status_code: int
+    headers: dict[str, str]
+    etag: str
+    expires: float
+
+    def response(self, request: Request, state: str) -> Response:
+        """Build the response, or a 304 if the client has this version."""
+        headers = {**self.headers, "etag": self.etag, "x-cache": state}
+        if _etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(self.body, self.status_code, headers)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = if_none_match.split(",")
+    candidates = {tag.strip().removeprefix("W/") for tag in tags}
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCache:
+    """
+    In-memory cache of whole responses, with request coalescing.
+
+    A response is keyed on the method, path, query parameters, the headers
+    listed in vary and a hash of the request body. Entries live for ttl
+    seconds and the cache holds at most max_entries of them and max_bytes of
+    bodies, evicting by LRU or LFU beyond that. Only one computation runs per
+    key at a time: identical requests arriving meanwhile wait for its result
+    instead of recomputing it. Every response carries a strong ETag, and a
+    request whose If-None-Match matches it gets an empty 304.
+
+    Routes opt in either with the cached decorator, or by depending on the
+    cache itself and passing their computation to CachedRequest.respond.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        eviction: Eviction = Eviction.LRU,
+        vary: tuple[str, ...] = ("accept",),
+    ) -> None:
+        if ttl <= 0 or max_entries < 1 or max_bytes < 1:
+            raise ValueError("ttl, max_entries and max_bytes must be positive")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self.vary = tuple(header.lower() for header in vary)
+
+        # Entries in LRU order; under LFU the recency order within a use count
+        # is kept by the buckets, and the lowest non-empty count by min_uses
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._uses: dict[tuple, int] = {}
+        self._buckets: dict[int, OrderedDict[tuple, None]] = {}
+        self._min_uses = 0
+        self._size = 0
+        self._inflight: dict[tuple, asyncio.Future[_Entry]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self.hits, self.misses, self.coalesced, self.evictions,
+            self.expirations, len(self._entries), self._size,
+        )
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._discard(key)
+
+    async def key(self, request: Request) -> tuple:
+        body = await request.body()
+        return (
+            request.method,
+            request.url.path,
+            tuple(sorted(request.query_params.multi_items())),
+            tuple(request.headers.get(header, "") for header in self.vary),
+            hashlib.blake2b(body, digest_size=16).digest() if body else b"",
+        )
+
+    async def respond(
+        self, request: Request, compute: Callable[[], Awaitable[Any]]
+    ) -> Response:
+        """
+        Return the cached response to request, computing it on a miss.
+
+        compute is awaited at most once per key at a time. It returns a
+        Response or any value FastAPI can encode as JSON. Streaming
+        responses cannot be cached, and responses other than 200 are sent
+        but not stored.
+        """
+        key = await self.key(request)
+        while True:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry.response(request, "HIT")
+
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            try:
+                return (await asyncio.shield(future)).response(request, "HIT")
+            except asyncio.CancelledError:
+                # The request computing it was cancelled, not this one
+                if not future.cancelled():
+                    raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            entry = self._entry(await compute())
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved, there may be no request waiting for it
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(entry)
+            if entry.status_code == 200:
+                self._store(key, entry)
+        finally:
+            del self._inflight[key]
+        return entry.response(request, "MISS")
+
+    def _entry(self, result: Any) -> _Entry:
+        if isinstance(result, StreamingResponse):
+            raise ValueError("Streaming responses cannot be cached")
+        if not isinstance(result, Response):
+            result = JSONResponse(jsonable_encoder(result))
+        headers = {
+            name: value
+            for name, value in result.headers.items()
+            if name not in ("content-length", "etag")
+        }
+        etag = '"' + hashlib.blake2b(result.body, digest_size=16).hexdigest() + '"'
+        return _Entry(
+            bytes(result.body), result.status_code, headers, etag,
+            time.monotonic() + self.ttl,
+        )
+
+    def _lookup(self, key: tuple) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self._discard(key)
+            self.expirations += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if self.eviction == Eviction.LFU:
+            uses = self._uses[key]
+            bucket = self._buckets[uses]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[uses]
+                if self._min_uses == uses:
+                    self._min_uses = uses + 1
+            self._uses[key] = uses + 1
+            self._buckets.setdefault(uses + 1, OrderedDict())[key] = None
+        return entry
+
+    def _store(self, key: tuple, entry: _Entry) -> None:
+        if len(entry.body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._discard(key)
+        while self._entries and (
+            len(self._entries) >= self.max_entries
+            or self._size + len(entry.body) > self.max_bytes
+        ):
+            self._discard(self._victim())
+            self.evictions += 1
+
+        self._entries[key] = entry
+        self._size += len(entry.body)
+        if self.eviction == Eviction.LFU:
+            self._uses[key] = 1
+            self._buckets.setdefault(1, OrderedDict())[key] = None
+            self._min_uses = 1
+
+    def _victim(self) -> tuple:
+        if self.eviction == Eviction.LRU:
+            return next(iter(self._entries))
+        if self._min_uses not in self._buckets:
+            # The bucket was emptied by an expiration, find the next one
+            self._min_uses = min(self._buckets)
+        return next(iter(self._buckets[self._min_uses]))
+
+    def _discard(self, key: tuple) -> None:
+        entry = self._entries.pop(key)
+        self._size -= len(entry.body)
+        if self.eviction == Eviction.LFU:
+            uses = self._uses.pop(key)
+            bucket = self._buckets[uses]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[uses]
+
+    async def __call__(self, request: Request) -> "CachedRequest":
+        """Dependency form: give the route a handle on its cache slot."""
+        return CachedRequest(self, request)
+
+    def cached(
+        self, func: Callable[..., Any]
+    ) -> Callable[..., Awaitable[Response]]:
+        """
+        Decorator form: cache the responses of a route function.
+
+        The function keeps its own parameters, sync functions still run in
+        the thread pool. It is given the Request only if it asks for one.
+        """
+        signature = inspect.signature(func)
+        parameters = list(signature.parameters.values())
+        request_name = next(
+            (p.name for p in parameters if p.annotation is Request), None
+        )
+        takes_request = request_name is not None
+        if not takes_request:
+            request_name = "cache_request"
+            parameters.append(
+                inspect.Parameter(
+                    request_name, inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                )
+            )
+
+        async def compute(kwargs: dict[str, Any]) -> Any:
+            if inspect.iscoroutinefunction(func):
+                return await func(**kwargs)
+            return await run_in_threadpool(func, **kwargs)
+
+        @functools.wraps(func)
+        async def wrapper(**kwargs: Any) -> Response:
+            if takes_request:
+                request = kwargs[request_name]
+            else:
+                request = kwargs.pop(request_name)
+            return await self.respond(request, lambda: compute(kwargs))
+
+        # FastAPI unwraps endpoints to tell sync from async functions
+        del wrapper.__wrapped__
+        wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
+
+
+class CachedRequest(NamedTuple):
+    """A request bound to a cache, as given to routes depending on it."""
+
+    cache: ResponseCache
+    request: Request
+
+    async def respond(self, func: Callable[..., Any], *args: Any) -> Response:
+        """Return the cached response, or the one built by func(*args)."""
+
+        async def compute() -> Any:
+            if inspect.iscoroutinefunction(func):
+                return await func(*args)
+            return await run_in_threadpool(func, *args)
+
+        return await self.cache.respond(self.request, compute)
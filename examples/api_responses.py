@@ -0,0 +1,95 @@
+import json
+from typing import Any, Mapping
+
+import numpy as np
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BINARY_TYPE = "application/octet-stream"
+
+
+def _default(value: Any) -> Any:
+    """Encode what the JSON encoders do not know, without validation."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    name = type(value).__name__
+    raise TypeError(f"Object of type {name} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as compact UTF-8 JSON.
+
+    orjson is used when it is installed. It encodes contiguous NumPy arrays
+    straight from their buffer, with no intermediate list. Otherwise the
+    standard json module is used, with the same output. Pydantic models are
+    dumped as they are, not validated again.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded by dumps.
+
+    Returning it from a route bypasses FastAPI's response validation and
+    jsonable_encoder, which rebuild the whole content as plain Python
+    objects before it is encoded.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ArrayResponse(Response):
+    """
+    Numeric values as raw little-endian binary, their dtype in X-Dtype.
+
+    A contiguous little-endian ndarray is sent from its own buffer without
+    a copy. Other arrays and sequences are converted once.
+    """
+
+    media_type = BINARY_TYPE
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        dtype: Any = None,
+    ) -> None:
+        values = np.asarray(content, dtype=dtype)
+        values = np.ascontiguousarray(values, values.dtype.newbyteorder("<"))
+        super().__init__(memoryview(values).cast("B"), status_code, headers)
+        self.headers["x-dtype"] = values.dtype.str
+
+
+def array_response(
+    request: Request, values: Any, dtype: Any = None
+) -> Response:
+    """Send values as binary if the client accepts it, else as a JSON array."""
+    if BINARY_TYPE in request.headers.get("accept", ""):
+        return ArrayResponse(values, dtype=dtype)
+    if dtype is not None:
+        values = np.asarray(values, dtype=dtype)
+    return FastJSONResponse(values)
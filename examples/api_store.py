@@ -0,0 +1,177 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Protocol, Sequence
+
+# An item as stored: id, name, price, is_offer
+ItemRow = tuple[int, str, float, bool | None]
+
+DEFAULT_MAX_BATCH = 1000
+DEFAULT_MAX_DELAY = 0.002
+
+
+class ItemStore(Protocol):
+    """Where items are persisted, written in batches of rows."""
+
+    async def upsert_many(self, rows: Sequence[ItemRow]) -> None:
+        """Insert or replace the rows, in order, as one transaction."""
+        ...
+
+    async def get(self, item_id: int) -> ItemRow | None: ...
+
+    async def count(self) -> int: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryStore:
+    """Items kept in a dict, for tests and single-process demos."""
+
+    def __init__(self) -> None:
+        self._rows: dict[int, ItemRow] = {}
+
+    async def upsert_many(self, rows: Sequence[ItemRow]) -> None:
+        self._rows.update((row[0], row) for row in rows)
+
+    async def get(self, item_id: int) -> ItemRow | None:
+        return self._rows.get(item_id)
+
+    async def count(self) -> int:
+        return len(self._rows)
+
+    async def close(self) -> None:
+        pass
+
+
+class SQLiteStore:
+    """
+    Items in a SQLite table, written with executemany.
+
+    The database runs in WAL mode with synchronous=NORMAL, so a batch costs
+    one append to the log and readers do not block the writer. All calls
+    go through a single thread owning the connection, keeping the event
+    loop free while SQLite works.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._connection = self._executor.submit(self._connect, path).result()
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "id INTEGER PRIMARY KEY, name TEXT NOT NULL, price REAL NOT NULL,"
+            " is_offer INTEGER)"
+        )
+        connection.commit()
+        return connection
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _upsert_many(self, rows: Sequence[ItemRow]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)", rows
+            )
+
+    async def upsert_many(self, rows: Sequence[ItemRow]) -> None:
+        await self._run(self._upsert_many, rows)
+
+    def _get(self, item_id: int) -> ItemRow | None:
+        row = self._connection.execute(
+            "SELECT id, name, price, is_offer FROM items WHERE id = ?", (item_id,)
+        ).fetchone()
+        if row is None or row[3] is None:
+            return row
+        return (*row[:3], bool(row[3]))
+
+    async def get(self, item_id: int) -> ItemRow | None:
+        return await self._run(self._get, item_id)
+
+    def _count(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    async def count(self) -> int:
+        return await self._run(self._count)
+
+    async def close(self) -> None:
+        await self._run(self._connection.close)
+        self._executor.shutdown()
+
+
+class BatchWriter:
+    """
+    Coalesce concurrent single-row writes into group commits.
+
+    A write waits at most max_delay seconds for others to join its batch,
+    or less once max_batch rows are pending, and returns when the batch is
+    committed. Batches are committed one at a time in arrival order, and the
+    rows arriving during a commit form the next batch, so the store sees
+    one transaction per batch instead of one per write.
+    """
+
+    def __init__(
+        self,
+        store: ItemStore,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
+        if max_batch < 1 or max_delay < 0:
+            raise ValueError("max_batch must be positive, max_delay non-negative")
+        self.store = store
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: list[tuple[ItemRow, asyncio.Future[None]]] = []
+        self._flusher: asyncio.Task | None = None
+        self._full: asyncio.Future[None] | None = None
+        self.batches = 0
+        self.rows = 0
+
+    async def put(self, row: ItemRow) -> None:
+        """Write row with the next batch, returning once it is committed."""
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        self._pending.append((row, done))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush())
+        elif len(self._pending) >= self.max_batch and self._full is not None:
+            if not self._full.done():
+                self._full.set_result(None)
+        await done
+
+    async def _flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if len(self._pending) < self.max_batch:
+                self._full = loop.create_future()
+                try:
+                    await asyncio.wait_for(self._full, self.max_delay)
+                except TimeoutError:
+                    pass
+                self._full = None
+
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            try:
+                await self.store.upsert_many([row for row, _ in batch])
+            except Exception as e:
+                for _, done in batch:
+                    if not done.done():
+                        done.set_exception(e)
+            else:
+                self.batches += 1
+                self.rows += len(batch)
+                for _, done in batch:
+                    if not done.done():
+                        done.set_result(None)
+
+    async def close(self) -> None:
+        """Wait for the pending writes to be committed."""
+        if self._flusher is not None:
+            await self._flusher
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark the algorithms package and track regressions over time."""
+
+import sys
+
+import click
+
+from algorithms.benchmark import (
+    DEFAULT_REPEATS,
+    DEFAULT_SIZES,
+    DEFAULT_THRESHOLD,
+    DEFAULT_WARMUP,
+    DISTRIBUTIONS,
+    ROUTINES,
+    append_history,
+    compare,
+    load_history,
+    results_of,
+    run_suite,
+)
+
+DEFAULT_HISTORY = 'benchmark_history.json'
+
+
+@click.group()
+def cli():
+    """Run benchmarks and compare them against earlier runs."""
+
+
+@cli.command()
+@click.option('--size', 'sizes', type=int, multiple=True,
+              default=DEFAULT_SIZES, show_default=True, help='Input size.')
+@click.option('--routine', 'routines', type=click.Choice(list(ROUTINES)),
+              multiple=True, help='Routine to run, all by default.')
+@click.option('--distribution', 'distributions',
+              type=click.Choice(list(DISTRIBUTIONS)), multiple=True,
+              help='Input distribution, all by default.')
+@click.option('--warmup', default=DEFAULT_WARMUP, show_default=True)
+@click.option('--repeats', default=DEFAULT_REPEATS, show_default=True)
+@click.option('--seed', default=0, show_default=True)
+@click.option('--history', default=DEFAULT_HISTORY, show_default=True,
+              help='JSON file the results are appended to.')
+@click.option('--label', default='', help='Label stored with the run.')
+def run(sizes, routines, distributions, warmup, repeats, seed, history, label):
+    """Run the benchmark suite and append the results to the history."""
+    results = run_suite(
+        routines or None, distributions or None, sizes, warmup, repeats, seed
+    )
+    click.echo(f"{'routine':<22}{'distribution':<15}{'size':>8}"
+               f"{'median s':>12}{'p95 s':>12}{'peak KiB':>10}")
+    for r in results:
+        click.echo(f'{r.routine:<22}{r.distribution:<15}{r.size:>8}'
+                   f'{r.median:>12.6f}{r.p95:>12.6f}{r.peak_memory // 1024:>10}')
+    append_history(history, results, label)
+    click.echo(f'Appended {len(results)} results to {history}')
+
+
+@cli.command('compare')
+@click.option('--history', default=DEFAULT_HISTORY, show_default=True)
+@click.option('--baseline', default=-2, show_default=True,
+              help='Index of the baseline run in the history.')
+@click.option('--current', default=-1, show_default=True,
+              help='Index of the run to check in the history.')
+@click.option('--threshold', default=DEFAULT_THRESHOLD, show_default=True,
+              help='Allowed relative slowdown of the median.')
+def compare_runs(history, baseline, current, threshold):
+    """Fail if a routine regressed by more than the threshold."""
+    entries = load_history(history)
+    if len(entries) < 2:
+        click.echo('Need at least two runs in the history to compare')
+        sys.exit(2)
+
+    regressions = compare(
+        results_of(entries[baseline]), results_of(entries[current]), threshold
+    )
+    for r in regressions:
+        click.echo(f'REGRESSION {r.routine} {r.distribution} n={r.size}: '
+                   f'{r.baseline:.6f}s -> {r.current:.6f}s ({r.ratio:.2f}x)')
+    if regressions:
+        sys.exit(1)
+    click.echo('No regressions')
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Command line entry point for the external merge sort."""
+
+import click
+
+from algorithms.external import (
+    DEFAULT_FAN_IN,
+    DEFAULT_MEMORY_LIMIT,
+    external_sort,
+    field_key,
+)
+
+
+@click.command()
+@click.argument('input_path', type=click.Path(exists=True, dir_okay=False))
+@click.argument('output_path', type=click.Path(dir_okay=False))
+@click.option('--memory-mb', default=DEFAULT_MEMORY_LIMIT // (1024 * 1024),
+              show_default=True, help='Memory budget for one run, in MiB.')
+@click.option('--fan-in', default=DEFAULT_FAN_IN, show_default=True,
+              help='Maximum number of runs merged in one pass.')
+@click.option('--field', type=int, default=None,
+              help='Sort on this field instead of the whole record.')
+@click.option('--separator', default='\t', show_default=True,
+              help='Field separator used with --field.')
+@click.option('--numeric', is_flag=True, help='Compare the field as a number.')
+@click.option('--reverse', is_flag=True, help='Sort in descending order.')
+@click.option('--tmp-dir', type=click.Path(file_okay=False), default=None,
+              help='Directory for the temporary run files.')
+def cli(input_path: str, output_path: str, memory_mb: int, fan_in: int,
+        field: int | None, separator: str, numeric: bool, reverse: bool,
+        tmp_dir: str | None):
+    """Sort the newline-delimited records of INPUT_PATH into OUTPUT_PATH."""
+    key = None
+    if field is not None:
+        key = field_key(field, separator.encode(), numeric)
+    elif numeric:
+        key = field_key(0, separator.encode(), numeric)
+
+    count = external_sort(
+        input_path,
+        output_path,
+        memory_limit=memory_mb * 1024 * 1024,
+        fan_in=fan_in,
+        key=key,
+        reverse=reverse,
+        tmp_dir=tmp_dir,
+    )
+    click.echo(f'Sorted {count} records into {output_path}')
+
+
+if __name__ == '__main__':
+    cli()
@@ -1,8 +1,91 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-import uvicorn
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterator
 
-app = FastAPI()
+import numpy as np
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from algorithms.inversion import inversions_fast
+from algorithms.selection import top_k
+from algorithms.sorting import merge_sort
+from api_cache import CachedRequest, ResponseCache
+from api_metrics import CONTENT_TYPE, Metrics, MetricsMiddleware
+from api_responses import FastJSONResponse, array_response
+from api_store import BatchWriter, ItemRow, MemoryStore, SQLiteStore
+
+# Worker processes for the CPU-bound routes, and jobs allowed in flight
+# (running or queued) before new requests wait for a slot
+POOL_WORKERS = int(os.environ.get("SORT_POOL_WORKERS", os.cpu_count() or 1))
+MAX_PENDING_JOBS = 2 * POOL_WORKERS
+MAX_BODY_BYTES = 256 * 1024 * 1024
+# Size of the response chunks, in bytes for binary and values for NDJSON
+BINARY_CHUNK_BYTES = 64 * 1024
+NDJSON_CHUNK_VALUES = 8192
+# Opt-in: routes return responses encoded by api_responses, skipping the
+# validation and jsonable_encoder pass FastAPI applies to returned values
+FAST_RESPONSES = os.environ.get("FAST_RESPONSES", "") == "1"
+# SQLite database the items are written to, kept in memory if unset
+ITEM_DB = os.environ.get("ITEM_DB")
+# Lines of an /items:batch upload validated and written at a time
+BATCH_CHUNK_LINES = 1000
+
+BINARY_TYPE = "application/octet-stream"
+NDJSON_TYPE = "application/x-ndjson"
+DTYPES = {
+    "int8", "int16", "int32", "int64",
+    "uint8", "uint16", "uint32", "uint64",
+    "float32", "float64",
+}
+
+_pool: ProcessPoolExecutor | None = None
+_slots: asyncio.Semaphore | None = None
+_writer: BatchWriter | None = None
+
+
+def _get_pool() -> tuple[ProcessPoolExecutor, asyncio.Semaphore]:
+    global _pool, _slots
+    if _pool is None:
+        # Forking a threaded server process is unsafe, start fresh workers
+        _pool = ProcessPoolExecutor(
+            max_workers=POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _slots = asyncio.Semaphore(MAX_PENDING_JOBS)
+    return _pool, _slots
+
+
+def _get_writer() -> BatchWriter:
+    global _writer
+    if _writer is None:
+        _writer = BatchWriter(SQLiteStore(ITEM_DB) if ITEM_DB else MemoryStore())
+    return _writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    global _pool, _slots, _writer
+    yield
+    if _pool is not None:
+        # Waiting for the workers to exit blocks, keep it off the event loop
+        await asyncio.to_thread(_pool.shutdown, cancel_futures=True)
+        _pool = None
+        _slots = None
+    if _writer is not None:
+        await _writer.close()
+        await _writer.store.close()
+        _writer = None
+
+
+app = FastAPI(lifespan=lifespan)
+cache = ResponseCache()
+metrics = Metrics()
+app.add_middleware(MetricsMiddleware, metrics=metrics)
 
 
 class Item(BaseModel):
@@ -11,19 +94,114 @@ class Item(BaseModel):
     is_offer: bool | None = None
 
 
+class ItemRecord(Item):
+    id: int
+
+
+_item_records = TypeAdapter(list[ItemRecord])
+_item_record = TypeAdapter(ItemRecord)
+
+
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
 
 
 @app.get("/items/{item_id}")
+@cache.cached
 def read_item(item_id: int, q: str | None = None):
     return {"item_id": item_id, "q": q}
 
 
+def _respond(content):
+    return FastJSONResponse(content) if FAST_RESPONSES else content
+
+
 @app.put("/items/{item_id}")
-def update_item(item_id: int, item: Item):
-    return {"item_name": item.name, "item_id": item_id}
+async def update_item(item_id: int, item: Item):
+    # Concurrent PUTs are committed together by the batch writer
+    await _get_writer().put((item_id, item.name, item.price, item.is_offer))
+    return _respond({"item_name": item.name, "item_id": item_id})
+
+
+async def _ndjson_chunks(
+    request: Request, size: int
+) -> AsyncIterator[list[tuple[int, bytes]]]:
+    """Yield the non-blank lines of an NDJSON body with their numbers."""
+    chunk: list[tuple[int, bytes]] = []
+    pending = b""
+    line_number = 0
+    async for data in request.stream():
+        *lines, pending = (pending + data).split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                chunk.append((line_number, line))
+                if len(chunk) == size:
+                    yield chunk
+                    chunk = []
+    if pending.strip():
+        chunk.append((line_number + 1, pending))
+    if chunk:
+        yield chunk
+
+
+def _validate_rows(chunk: list[tuple[int, bytes]]) -> list[ItemRow]:
+    """Validate a chunk of NDJSON lines in one pass into rows to store."""
+    try:
+        records = _item_records.validate_json(
+            b"[" + b",".join(line for _, line in chunk) + b"]"
+        )
+    except ValidationError:
+        # Validate the lines one by one to tell which ones are invalid
+        errors = []
+        for line_number, line in chunk:
+            try:
+                _item_record.validate_json(line)
+            except ValidationError as e:
+                errors += [
+                    {"line": line_number, "loc": error["loc"], "msg": error["msg"]}
+                    for error in e.errors(include_url=False)
+                ]
+        raise HTTPException(422, errors)
+    return [(r.id, r.name, r.price, r.is_offer) for r in records]
+
+
+@app.post("/items:batch")
+async def write_items(request: Request):
+    """
+    Upsert an NDJSON stream of items, one {"id": ..., ...} object per line.
+
+    The body is validated BATCH_CHUNK_LINES lines at a time, and every
+    chunk is written while the next one is read and validated. An invalid
+    line stops the upload with a 422 listing the errors by line number,
+    after the chunks before it have been written.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0]
+    if content_type != NDJSON_TYPE:
+        raise HTTPException(415, f"Unsupported content type {content_type!r}")
+
+    store = _get_writer().store
+    written = 0
+    writing: asyncio.Task | None = None
+    writing_rows = 0
+    try:
+        async for chunk in _ndjson_chunks(request, BATCH_CHUNK_LINES):
+            rows = _validate_rows(chunk)
+            if writing is not None:
+                await writing
+                written += writing_rows
+            writing = asyncio.create_task(store.upsert_many(rows))
+            writing_rows = len(rows)
+    except HTTPException as e:
+        if writing is not None:
+            await writing
+            written += writing_rows
+        raise HTTPException(e.status_code, {"written": written, "errors": e.detail})
+    if writing is not None:
+        await writing
+        written += writing_rows
+    return {"written": written}
 
 async def get_burgers(number: int) -> list[dict]:
     burgers = []
@@ -32,11 +210,229 @@ async def get_burgers(number: int) -> list[dict]:
     return burgers
 
 @app.get("/burgers")
-async def read_burgers():
-    burgers = await get_burgers(2)
-    return burgers
+async def read_burgers(cached: CachedRequest = Depends(cache)):
+    async def burgers():
+        return _respond(await get_burgers(2))
+
+    return await cached.respond(burgers)
+
+
+@app.get("/cache/stats")
+def read_cache_stats():
+    return cache.stats()._asdict()
+
+
+@app.get("/metrics")
+def read_metrics():
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
+
+def _little_endian(dtype: str) -> np.dtype:
+    if dtype not in DTYPES:
+        raise HTTPException(400, f"Unsupported dtype {dtype!r}")
+    return np.dtype(dtype).newbyteorder("<")
+
+
+class PayloadError(ValueError):
+    """A request body that does not hold values of the requested dtype."""
+
+
+def _decode(body: bytes, content_type: str, dtype: str) -> np.ndarray:
+    """
+    Decode a request body into an array of little-endian values of dtype.
+
+    Raw binary bodies are viewed as is. NDJSON bodies, one number or one
+    array of numbers per line, and JSON array bodies are parsed.
+
+    Raises:
+        PayloadError: If the body cannot be read as values of dtype
+    """
+    if content_type == BINARY_TYPE:
+        return np.frombuffer(body, dtype=dtype)
+    try:
+        if content_type == "application/json":
+            parsed = json.loads(body) if body.strip() else []
+            values = parsed if isinstance(parsed, list) else [parsed]
+        else:
+            values = []
+            _parse_lines(body.split(b"\n"), values)
+        return _to_array(values, np.dtype(dtype))
+    except (TypeError, OverflowError, ValueError) as e:
+        raise PayloadError(str(e)) from None
+
+
+def _parse_lines(lines: list[bytes], values: list) -> None:
+    for line in lines:
+        if line.strip():
+            parsed = json.loads(line)
+            if isinstance(parsed, list):
+                values.extend(parsed)
+            else:
+                values.append(parsed)
+
+
+def _to_array(values: list, dtype: np.dtype) -> np.ndarray:
+    """
+    Convert parsed JSON numbers to dtype, exactly for integer dtypes.
+
+    Raises:
+        PayloadError: If a value is not a number (bools included), or an
+            integer dtype would truncate or wrap it around
+    """
+    types = set(map(type, values))
+    if not types <= {int, float}:
+        raise PayloadError("expected a flat list of numbers")
+    if dtype.kind == "f":
+        result = np.array(values, dtype=dtype)
+        if not np.isfinite(result).all():
+            raise PayloadError(f"values out of range for {dtype.name}")
+        return result
+
+    if float in types:
+        if not all(v.is_integer() for v in values if type(v) is float):
+            raise PayloadError(f"non-integral values for {dtype.name}")
+        # Integral floats become ints, the ints are never rounded to floats
+        values = [int(v) for v in values]
+    info = np.iinfo(dtype)
+    if values and (min(values) < info.min or max(values) > info.max):
+        raise PayloadError(f"values out of range for {dtype.name}")
+    return np.array(values, dtype=dtype)
+
+
+def _sort_job(
+    body: bytes, content_type: str, dtype: str, reverse: bool
+) -> bytes:
+    """Pool job: sort the values of a body, return them little-endian."""
+    values = _decode(body, content_type, dtype).copy()
+    merge_sort(values, reverse=reverse)
+    return values.tobytes()
+
+
+def _inversions_job(
+    body: bytes, content_type: str, dtype: str
+) -> tuple[int, int]:
+    """Pool job: count the values of a body and their inversions."""
+    values = _decode(body, content_type, dtype)
+    return len(values), inversions_fast(values)
+
+
+def _topk_job(
+    body: bytes, content_type: str, dtype: str, k: int, largest: bool
+) -> bytes:
+    """Pool job: select the k largest or smallest values, best first."""
+    values = _decode(body, content_type, dtype).tolist()
+    return np.array(top_k(values, k, largest=largest), dtype=dtype).tobytes()
+
+
+async def _run_job(func, *args):
+    """Run func in the process pool, waiting for a slot when it is full."""
+    pool, slots = _get_pool()
+    async with slots:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+
+async def _run_values_job(func, body: bytes, content_type: str, *args):
+    """Run a job on the values of a body, reporting bad bodies as 400."""
+    try:
+        return await _run_job(func, body, content_type, *args)
+    except PayloadError as e:
+        raise HTTPException(400, f"Invalid numeric payload: {e}")
+
+
+async def _read_body(request: Request, dtype: np.dtype) -> tuple[bytes, str]:
+    """
+    Read the request body holding values of dtype, and its content type.
+
+    Only the bytes are collected here. Decoding them, which for JSON and
+    NDJSON means parsing, happens in the process pool job using them,
+    keeping the event loop free for other requests.
+    """
+    content_type = request.headers.get("content-type", BINARY_TYPE).split(";")[0]
+    if content_type not in (BINARY_TYPE, NDJSON_TYPE, "application/json"):
+        raise HTTPException(415, f"Unsupported content type {content_type!r}")
+
+    size = 0
+    body = bytearray()
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise HTTPException(413, "Request body too large")
+        body += chunk
+    if content_type == BINARY_TYPE and len(body) % dtype.itemsize:
+        raise HTTPException(400, "Body length is not a multiple of the dtype")
+    return bytes(body), content_type
+
+
+def _stream_values(
+    request: Request, payload: bytes, dtype: np.dtype
+) -> StreamingResponse:
+    """Stream values back as binary if the client accepts it, else NDJSON."""
+    if BINARY_TYPE in request.headers.get("accept", ""):
+        def binary() -> Iterator[bytes]:
+            view = memoryview(payload)
+            for i in range(0, len(view), BINARY_CHUNK_BYTES):
+                yield bytes(view[i:i + BINARY_CHUNK_BYTES])
+
+        return StreamingResponse(binary(), media_type=BINARY_TYPE)
+
+    def ndjson() -> Iterator[bytes]:
+        values = np.frombuffer(payload, dtype=dtype)
+        for i in range(0, len(values), NDJSON_CHUNK_VALUES):
+            chunk = values[i:i + NDJSON_CHUNK_VALUES].tolist()
+            yield ("\n".join(map(str, chunk)) + "\n").encode()
+
+    return StreamingResponse(ndjson(), media_type=NDJSON_TYPE)
+
+
+@app.post("/sort")
+async def sort_values(
+    request: Request, dtype: str = "int64", reverse: bool = False
+):
+    le_dtype = _little_endian(dtype)
+    body, content_type = await _read_body(request, le_dtype)
+    result = await _run_values_job(
+        _sort_job, body, content_type, le_dtype.str, reverse
+    )
+    return _stream_values(request, result, le_dtype)
+
+
+@app.post("/inversions")
+async def count_inversions(request: Request, dtype: str = "int64"):
+    le_dtype = _little_endian(dtype)
+    body, content_type = await _read_body(request, le_dtype)
+    length, count = await _run_values_job(
+        _inversions_job, body, content_type, le_dtype.str
+    )
+    return {"length": length, "inversions": count}
+
+
+@app.post("/topk")
+async def top_k_values(
+    request: Request,
+    k: int = Query(ge=0),
+    dtype: str = "int64",
+    largest: bool = True,
+):
+    le_dtype = _little_endian(dtype)
+    body, content_type = await _read_body(request, le_dtype)
+    result = await _run_values_job(
+        _topk_job, body, content_type, le_dtype.str, k, largest
+    )
+    if FAST_RESPONSES:
+        # At most k values, sent in one piece from the result buffer
+        return array_response(request, np.frombuffer(result, le_dtype))
+    return _stream_values(request, result, le_dtype)
+
 
 if __name__ == "__main__":
+    import uvicorn
+
     # Swagger UI: http://localhost:8000/docs
     # ReDoc: http://localhost:8000/redoc
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Every worker process serves the app with its own job pool
+    uvicorn.run(
+        "fast_api:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+    )
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Compare FastAPI's default response encoding with the fast path."""
+
+import timeit
+
+import click
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import api_responses
+from api_responses import ArrayResponse, FastJSONResponse
+from fast_api import Item
+
+
+def _payloads(size):
+    burgers = [
+        {"name": f"burger {i}", "price": 10.0, "is_offer": True}
+        for i in range(size)
+    ]
+    items = [Item(**burger) for burger in burgers]
+    values = np.sort(np.random.default_rng(0).integers(0, 1 << 40, size))
+    return {
+        "dicts": burgers,
+        "Item models": items,
+        "sorted ndarray": values,
+        "sorted list": values.tolist(),
+    }
+
+
+def _paths(content):
+    """The ways of building a response for content, the default first."""
+    paths = {
+        "default": lambda: JSONResponse(jsonable_encoder(content)),
+        "fast json": lambda: FastJSONResponse(content),
+    }
+    if isinstance(content, np.ndarray):
+        # jsonable_encoder does not know ndarrays, routes return lists
+        paths["default"] = lambda: JSONResponse(jsonable_encoder(content.tolist()))
+        paths["binary"] = lambda: ArrayResponse(content)
+    return paths
+
+
+@click.command()
+@click.option("--size", default=10_000, show_default=True,
+              help="Number of elements per payload.")
+@click.option("--repeats", default=5, show_default=True)
+def main(size, repeats):
+    """Time building the response of every payload along every path."""
+    encoder = "orjson" if api_responses.orjson is not None else "json"
+    click.echo(f"{size} elements, fast path encoder: {encoder}")
+    click.echo(f"{'payload':<16}{'path':<12}{'ms':>10}{'speedup':>10}")
+    for name, content in _payloads(size).items():
+        baseline = None
+        for path, build in _paths(content).items():
+            number = max(1, 100_000 // size)
+            seconds = min(timeit.repeat(build, number=number, repeat=repeats))
+            seconds /= number
+            baseline = baseline or seconds
+            click.echo(f"{name:<16}{path:<12}{seconds * 1000:>10.3f}"
+                       f"{baseline / seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,12 @@ import random
 import time
 from typing import List, Callable
 
+from algorithms.backend import Backend
 from algorithms.sorting import (
-    merge_sort, quick_sort, QsPivot, Comparable
+    merge_sort, quick_sort, counting_sort, radix_sort, QsPivot, Comparable
 )
 from algorithms.inversion import inversions_fast, inversion_slow
+from algorithms.instrument import instrument
 
 
 def generate_random_array(
@@ -73,7 +75,11 @@ def demo_performance_comparison():
         arr = generate_random_array(size)
 
         # Time merge sort
-        merge_time = time_sorting_algorithm(arr, merge_sort, "Merge Sort")
+        merge_time = time_sorting_algorithm(
+            arr,
+            lambda x: merge_sort(x, backend=Backend.Python),
+            "Merge Sort"
+        )
         if merge_time >= 0:
             print(f"Merge Sort: {merge_time:.6f} seconds")
 
@@ -81,7 +87,7 @@ def demo_performance_comparison():
         for pivot in [QsPivot.First, QsPivot.Last, QsPivot.Random]:
             quick_time = time_sorting_algorithm(
                 arr,
-                lambda x: quick_sort(x, pivot=pivot),
+                lambda x: quick_sort(x, pivot=pivot, backend=Backend.Python),
                 f"Quick Sort ({pivot.name})"
             )
             if quick_time >= 0:
@@ -93,6 +99,54 @@ def demo_performance_comparison():
             print(f"Built-in Sort: {builtin_time:.6f} seconds")
 
 
+def demo_integer_sorts():
+    """Compare the non-comparison integer sorts with the comparison sorts."""
+    print("\n🔢 Integer Sorts Comparison")
+    print("=" * 50)
+
+    size = 100000
+    cases = [
+        (generate_random_array(size, 0, 255), "Small range (0-255)"),
+        (generate_random_array(size, 0, 2**32 - 1), "32-bit ids"),
+    ]
+
+    for arr, description in cases:
+        print(f"\n{description}, size {size}")
+        sorts = [
+            ("Merge Sort", lambda x: merge_sort(x, backend=Backend.Python)),
+            ("Quick Sort", lambda x: quick_sort(x, backend=Backend.Python)),
+            ("Counting Sort", counting_sort),
+            ("Radix Sort (8 bits)", radix_sort),
+            ("Radix Sort (16 bits)", lambda x: radix_sort(x, radix_bits=16)),
+        ]
+        for name, sort_func in sorts:
+            try:
+                elapsed = time_sorting_algorithm(arr, sort_func, name)
+            except ValueError as e:
+                print(f"{name}: skipped ({e})")
+                continue
+            if elapsed >= 0:
+                print(f"{name}: {elapsed:.6f} seconds")
+
+
+def demo_instrumentation():
+    """Show what the comparison sorts do under the instrumentation."""
+    print("\n🔬 Sort Instrumentation")
+    print("=" * 50)
+
+    arr = generate_random_array(5000)
+    runs = [
+        ("Merge Sort", merge_sort, {}),
+        ("Quick Sort (random pivot)", quick_sort, {"pivot": QsPivot.Random}),
+        ("Quick Sort (median of three)", quick_sort, {"pivot": QsPivot.MedianOfThree}),
+        ("Quick Sort (ninther)", quick_sort, {"pivot": QsPivot.Ninther}),
+    ]
+    for name, sort_func, kwargs in runs:
+        report = instrument(sort_func, arr.copy(), **kwargs)
+        print(f"\n{name}")
+        print(report.summary())
+
+
 def demo_inversion_counting():
     """Demonstrate inversion counting algorithms."""
     print("\n🔄 Inversion Counting Demo")
@@ -161,6 +215,8 @@ def main():
     try:
         demo_basic_sorting()
         demo_performance_comparison()
+        demo_integer_sorts()
+        demo_instrumentation()
         demo_inversion_counting()
         demo_edge_cases()
 
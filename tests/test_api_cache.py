@@ -0,0 +1,183 @@
+"""Tests for the response cache of the FastAPI example."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from api_cache import CachedRequest, Eviction, ResponseCache
+
+
+def _make_app(cache):
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.get("/square/{n}")
+    @cache.cached
+    def square(n: int, offset: int = 0):
+        app.state.calls += 1
+        return {"value": n * n + offset}
+
+    @app.get("/slow")
+    @cache.cached
+    async def slow():
+        app.state.calls += 1
+        await asyncio.sleep(0.05)
+        return {"slow": True}
+
+    @app.get("/fail")
+    @cache.cached
+    async def fail():
+        app.state.calls += 1
+        await asyncio.sleep(0.05)
+        raise HTTPException(503, "Unavailable")
+
+    @app.post("/echo")
+    async def echo(cached: CachedRequest = Depends(cache)):
+        async def compute():
+            app.state.calls += 1
+            return {"body": (await cached.request.body()).decode()}
+
+        return await cached.respond(compute)
+
+    @app.get("/stream")
+    @cache.cached
+    def stream():
+        return StreamingResponse(iter([b"x"]))
+
+    return app
+
+
+def test_cached_decorator():
+    """Test hits, misses and keys made of the path and query."""
+    cache = ResponseCache()
+    app = _make_app(cache)
+    client = TestClient(app)
+
+    response = client.get("/square/3")
+    assert response.json() == {"value": 9}
+    assert response.headers["x-cache"] == "MISS"
+    response = client.get("/square/3")
+    assert response.json() == {"value": 9}
+    assert response.headers["x-cache"] == "HIT"
+    assert response.headers["content-type"] == "application/json"
+    assert app.state.calls == 1
+
+    assert client.get("/square/3?offset=1").json() == {"value": 10}
+    assert client.get("/square/4").json() == {"value": 16}
+    assert app.state.calls == 3
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 3, 3)
+
+
+def test_dependency_body_hash():
+    """Test the dependency form, keyed on the request body."""
+    cache = ResponseCache()
+    app = _make_app(cache)
+    client = TestClient(app)
+
+    for body in ("a", "b", "a", "b", ""):
+        assert client.post("/echo", content=body).json() == {"body": body}
+    assert app.state.calls == 3
+    assert cache.stats().hits == 2
+
+
+def test_etag():
+    """Test If-None-Match gets a 304 when the ETag matches."""
+    client = TestClient(_make_app(ResponseCache()))
+    etag = client.get("/square/2").headers["etag"]
+
+    response = client.get("/square/2", headers={"if-none-match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    response = client.get("/square/2", headers={"if-none-match": f'"x", W/{etag}'})
+    assert response.status_code == 304
+    response = client.get("/square/2", headers={"if-none-match": '"x"'})
+    assert response.status_code == 200
+    assert client.get("/square/3").headers["etag"] != etag
+
+
+def test_ttl(monkeypatch):
+    """Test expired entries are computed again."""
+    # Move the cache's clock past the TTL instead of sleeping; it only runs
+    # ahead of the real one, which the event loop also reads
+    monotonic = time.monotonic
+    skipped = 0.0
+    monkeypatch.setattr(time, "monotonic", lambda: monotonic() + skipped)
+    cache = ResponseCache(ttl=60)
+    app = _make_app(cache)
+    client = TestClient(app)
+    client.get("/square/2")
+    client.get("/square/2")
+    skipped = 61.0
+    client.get("/square/2")
+    assert app.state.calls == 2
+    assert cache.stats().expirations == 1
+
+
+def test_eviction_lru_lfu():
+    """Test which entry makes room under both policies."""
+    # Entry 1 is used most, entry 2 most recently
+    for eviction, kept, evicted in ((Eviction.LRU, 2, 1), (Eviction.LFU, 1, 2)):
+        cache = ResponseCache(max_entries=2, eviction=eviction)
+        app = _make_app(cache)
+        client = TestClient(app)
+        for n in (1, 1, 1, 2, 3):
+            client.get(f"/square/{n}")
+        assert cache.stats().evictions == 1
+
+        calls = app.state.calls
+        client.get(f"/square/{kept}")
+        assert app.state.calls == calls
+        client.get(f"/square/{evicted}")
+        assert app.state.calls == calls + 1
+
+
+def test_max_bytes():
+    """Test the total size of the bodies is bounded."""
+    cache = ResponseCache(max_bytes=30)
+    client = TestClient(_make_app(cache))
+    for n in range(10):
+        client.get(f"/square/{n}")
+    stats = cache.stats()
+    assert stats.size_bytes <= 30
+    assert stats.entries == 2
+    assert stats.evictions == 8
+
+
+def test_coalescing():
+    """Test 1000 concurrent identical requests run one computation."""
+    cache = ResponseCache()
+    app = _make_app(cache)
+
+    async def run(path):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await asyncio.gather(*(c.get(path) for _ in range(1000)))
+
+    responses = asyncio.run(run("/slow"))
+    assert all(r.json() == {"slow": True} for r in responses)
+    assert app.state.calls == 1
+    assert cache.stats().coalesced == 999
+
+    # A failure reaches every waiting request and is not cached
+    responses = asyncio.run(run("/fail"))
+    assert all(r.status_code == 503 for r in responses)
+    assert app.state.calls == 2
+    assert cache.stats().entries == 1
+
+
+def test_invalid():
+    """Test invalid bounds and uncacheable responses."""
+    with pytest.raises(ValueError):
+        ResponseCache(ttl=0)
+    with pytest.raises(ValueError):
+        ResponseCache(max_entries=0)
+    client = TestClient(_make_app(ResponseCache()))
+    with pytest.raises(ValueError):
+        client.get("/stream")
@@ -0,0 +1,121 @@
+"""Tests for the metrics middleware of the FastAPI example."""
+
+import asyncio
+import math
+import random
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import fast_api
+from api_metrics import (
+    CONTENT_TYPE,
+    MAX_LATENCY_US,
+    LatencyHistogram,
+    Metrics,
+    MetricsMiddleware,
+    _bucket,
+    _bucket_range,
+)
+
+
+def _make_app():
+    app = FastAPI()
+    metrics = Metrics()
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"in_flight": metrics.in_flight[("GET", "/items/{item_id}")]}
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    @app.get("/block")
+    async def block():
+        # Blocks the event loop, unlike await asyncio.sleep
+        time.sleep(0.2)
+        await asyncio.sleep(0.1)
+
+    return app, metrics
+
+
+def test_histogram_buckets():
+    """Test every value falls in its bucket, of bounded relative width."""
+    values = list(range(5000)) + [MAX_LATENCY_US]
+    values += [random.randrange(MAX_LATENCY_US) for _ in range(10000)]
+    for value in values:
+        low, high = _bucket_range(_bucket(value))
+        assert low <= value <= high
+        assert high - low <= value / 64
+
+
+def test_histogram_quantiles():
+    """Test the quantiles are within a bucket of the exact ones."""
+    histogram = LatencyHistogram()
+    assert histogram.quantile(0.5) == 0.0
+    values = [random.lognormvariate(-6, 1.5) for _ in range(10000)]
+    for value in values:
+        histogram.record(value)
+    values.sort()
+    for q in (0.5, 0.95, 0.99, 1.0):
+        exact = values[math.ceil(q * len(values)) - 1]
+        assert abs(histogram.quantile(q) - exact) <= exact / 64 + 1e-6
+    assert histogram.count == len(values)
+    assert histogram.max == values[-1]
+
+
+def test_request_metrics():
+    """Test counts by route template and status, and in-flight gauges."""
+    app, metrics = _make_app()
+    client = TestClient(app, raise_server_exceptions=False)
+    for item_id in range(3):
+        assert client.get(f"/items/{item_id}").json() == {"in_flight": 1}
+    client.get("/items/x")
+    client.get("/fail")
+    client.get("/missing")
+    client.post("/items/1")
+
+    assert metrics.requests == {
+        ("GET", "/items/{item_id}", 200): 3,
+        ("GET", "/items/{item_id}", 422): 1,
+        ("GET", "/fail", 500): 1,
+        ("GET", "<unmatched>", 404): 1,
+        ("POST", "/items/{item_id}", 405): 1,
+    }
+    assert set(metrics.in_flight.values()) == {0}
+    assert metrics.latency[("GET", "/items/{item_id}")].count == 4
+
+    text = metrics.render()
+    assert (
+        'http_requests_total{method="GET",route="/items/{item_id}",status="200"} 3'
+        in text
+    )
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/fail"} 1'
+        in text
+    )
+    assert 'route="/fail",quantile="0.99"}' in text
+
+
+def test_loop_lag():
+    """Test a handler blocking the loop shows up as event-loop lag."""
+    app, metrics = _make_app()
+    with TestClient(app) as client:
+        client.get("/block")
+    assert metrics.loop_lag.count > 0
+    assert metrics.loop_lag.max >= 0.1
+    assert "event_loop_lag_seconds_count" in metrics.render()
+
+
+def test_metrics_route():
+    """Test the example app serves its metrics as Prometheus text."""
+    with TestClient(fast_api.app) as client:
+        client.get("/")
+        response = client.get("/metrics")
+    assert response.headers["content-type"] == CONTENT_TYPE
+    assert 'requests_total{method="GET",route="/",status="200"}' in response.text
+    for line in response.text.splitlines():
+        assert line.startswith("#") or len(line.rsplit(" ", 1)) == 2
@@ -0,0 +1,90 @@
+"""Tests for the fast response encoding of the FastAPI example."""
+
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import fast_api
+from api_responses import ArrayResponse, FastJSONResponse, dumps
+from fast_api import Item, app
+
+
+def test_dumps():
+    """Test the output decodes to what the standard encoding gives."""
+    content = {
+        "items": [
+            Item(name="a", price=1.5), Item(name="é", price=2, is_offer=True)
+        ],
+        "values": np.arange(5, dtype=np.int32),
+        "matrix": np.eye(2),
+        "scalar": np.float64(0.25),
+        "nested": [{"x": None}],
+    }
+    assert json.loads(dumps(content)) == {
+        "items": [
+            {"name": "a", "price": 1.5, "is_offer": None},
+            {"name": "é", "price": 2.0, "is_offer": True},
+        ],
+        "values": [0, 1, 2, 3, 4],
+        "matrix": [[1.0, 0.0], [0.0, 1.0]],
+        "scalar": 0.25,
+        "nested": [{"x": None}],
+    }
+    assert FastJSONResponse([1, 2]).body == b"[1,2]"
+    with pytest.raises(TypeError):
+        dumps(object())
+
+
+def test_array_response():
+    """Test arrays are sent from their own buffer when little-endian."""
+    values = np.arange(1000, dtype="<i8")
+    response = ArrayResponse(values)
+    assert np.shares_memory(np.frombuffer(response.body, dtype="<i8"), values)
+    assert response.headers["content-length"] == "8000"
+    assert response.headers["x-dtype"] == "<i8"
+
+    big_endian = values.astype(">u4")
+    response = ArrayResponse(big_endian[::2])
+    assert response.headers["x-dtype"] == "<u4"
+    result = np.frombuffer(response.body, dtype="<u4")
+    assert result.tolist() == list(range(0, 1000, 2))
+
+    response = ArrayResponse([3, 1, 2], dtype="int16")
+    assert bytes(response.body) == np.array([3, 1, 2], dtype="<i2").tobytes()
+
+
+def test_fast_responses(monkeypatch):
+    """Test the fast mode gives the same results as the default one."""
+    client = TestClient(app)
+    item = {"name": "x", "price": 1.5}
+    default = client.put("/items/7", json=item)
+    monkeypatch.setattr(fast_api, "FAST_RESPONSES", True)
+    fast = client.put("/items/7", json=item)
+    assert fast.json() == default.json()
+    assert fast.headers["content-type"] == "application/json"
+
+    fast_api.cache.clear()
+    response = client.get("/burgers")
+    assert response.json() == [
+        {"name": f"burger {i}", "price": 10.0, "is_offer": True} for i in range(2)
+    ]
+
+
+def test_fast_topk(monkeypatch):
+    """Test /topk results sent in one piece as binary or a JSON array."""
+    monkeypatch.setattr(fast_api, "FAST_RESPONSES", True)
+    values = [5, 3, 9, 1, 7]
+    body = "\n".join(map(str, values))
+    headers = {"content-type": "application/x-ndjson"}
+    with TestClient(app) as client:
+        response = client.post("/topk?k=3", content=body, headers=headers)
+        assert response.json() == [9, 7, 5]
+
+        headers["accept"] = "application/octet-stream"
+        response = client.post(
+            "/topk?k=3&dtype=uint16", content=body, headers=headers
+        )
+    assert response.headers["x-dtype"] == "<u2"
+    assert np.frombuffer(response.content, dtype="<u2").tolist() == [9, 7, 5]
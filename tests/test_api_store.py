@@ -0,0 +1,160 @@
+"""Tests for the item stores and the batched writes of the FastAPI example."""
+
+import asyncio
+import json
+import sqlite3
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import fast_api
+from api_store import BatchWriter, MemoryStore, SQLiteStore
+from fast_api import app
+
+NDJSON = {"content-type": "application/x-ndjson"}
+
+
+class _CountingStore(MemoryStore):
+    def __init__(self, fail=False):
+        super().__init__()
+        self.batches = []
+        self.fail = fail
+
+    async def upsert_many(self, rows):
+        await asyncio.sleep(0.001)
+        if self.fail:
+            raise RuntimeError("disk full")
+        self.batches.append(len(rows))
+        await super().upsert_many(rows)
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    writer = BatchWriter(MemoryStore())
+    monkeypatch.setattr(fast_api, "_writer", writer)
+    return writer
+
+
+def _lines(items):
+    return "".join(json.dumps(item) + "\n" for item in items)
+
+
+def test_stores(tmp_path):
+    """Test both stores upsert, read back and count the same way."""
+
+    async def run(store):
+        await store.upsert_many([(1, "a", 1.5, None), (2, "b", 2.0, True)])
+        await store.upsert_many([(2, "c", 3.0, False), (2, "d", 4.0, False)])
+        result = await store.get(1), await store.get(2), await store.get(3)
+        count = await store.count()
+        await store.close()
+        return result, count
+
+    expected = ((1, "a", 1.5, None), (2, "d", 4.0, False), None), 2
+    assert asyncio.run(run(MemoryStore())) == expected
+    path = tmp_path / "items.db"
+    assert asyncio.run(run(SQLiteStore(str(path)))) == expected
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    connection.close()
+
+
+def test_batch_writer():
+    """Test concurrent writes are committed together, in batches."""
+    store = _CountingStore()
+
+    async def run(writer, nb_rows):
+        await asyncio.gather(
+            *(writer.put((i, "x", float(i), None)) for i in range(nb_rows))
+        )
+
+    writer = BatchWriter(store)
+    asyncio.run(run(writer, 1000))
+    assert store.batches == [1000]
+    assert (writer.batches, writer.rows) == (1, 1000)
+
+    store.batches.clear()
+    writer = BatchWriter(store, max_batch=300)
+    asyncio.run(run(writer, 1000))
+    assert store.batches == [300, 300, 300, 100]
+    assert asyncio.run(store.get(999)) == (999, "x", 999.0, None)
+
+    with pytest.raises(ValueError):
+        BatchWriter(store, max_batch=0)
+
+
+def test_batch_writer_failure():
+    """Test a failed commit reaches every write of its batch."""
+
+    async def run(writer):
+        return await asyncio.gather(
+            *(writer.put((i, "x", 1.0, None)) for i in range(10)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run(BatchWriter(_CountingStore(fail=True))))
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_put_group_commit(writer):
+    """Test concurrent PUTs on the app are coalesced into group commits."""
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await asyncio.gather(
+                *(c.put(f"/items/{i}", json={"name": "x", "price": i})
+                  for i in range(200))
+            )
+
+    responses = asyncio.run(run())
+    assert all(r.status_code == 200 for r in responses)
+    assert writer.rows == 200
+    assert writer.batches < 20
+    assert asyncio.run(writer.store.count()) == 200
+
+
+def test_batch_endpoint(writer, monkeypatch):
+    """Test NDJSON uploads are validated and written chunk by chunk."""
+    monkeypatch.setattr(fast_api, "BATCH_CHUNK_LINES", 100)
+    client = TestClient(app)
+    items = [
+        {"id": i, "name": f"item {i}", "price": i / 2, "is_offer": i % 2 == 0}
+        for i in range(250)
+    ]
+    response = client.post("/items:batch", content=_lines(items), headers=NDJSON)
+    assert response.json() == {"written": 250}
+    assert asyncio.run(writer.store.count()) == 250
+    assert asyncio.run(writer.store.get(7)) == (7, "item 7", 3.5, False)
+
+    # Blank lines are skipped, the last line needs no newline
+    body = '\n{"id": 1000, "name": "a", "price": 1}\n\n'
+    body += '{"id": 1, "name": "b", "price": 2}'
+    response = client.post("/items:batch", content=body, headers=NDJSON)
+    assert response.json() == {"written": 2}
+
+    response = client.post("/items:batch", content="", headers=NDJSON)
+    assert response.json() == {"written": 0}
+    response = client.post("/items:batch", json=items)
+    assert response.status_code == 415
+
+
+def test_batch_endpoint_invalid(writer, monkeypatch):
+    """Test an invalid line stops the upload, reported by line number."""
+    monkeypatch.setattr(fast_api, "BATCH_CHUNK_LINES", 100)
+    client = TestClient(app)
+    items = ({"id": i, "name": "x", "price": 1} for i in range(150))
+    lines = _lines(items).split("\n")
+    lines[119] = '{"id": 119, "name": "x", "price": "free"}'
+    lines[130] = "{not json"
+    body = "\n".join(lines)
+    response = client.post("/items:batch", content=body, headers=NDJSON)
+
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["written"] == 100
+    assert [error["line"] for error in detail["errors"]] == [120, 131]
+    assert detail["errors"][0]["loc"] == ["price"]
+    assert asyncio.run(writer.store.count()) == 100
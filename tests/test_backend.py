@@ -0,0 +1,265 @@
+"""Tests for the NumPy backend dispatch."""
+
+import array
+import random
+
+import numpy as np
+import pytest
+
+from algorithms import backend
+from algorithms.backend import (
+    Backend,
+    buffer_view,
+    numeric_array,
+    numpy_inversions,
+)
+from algorithms.inversion import inversions_fast, inversion_slow
+from algorithms.sorting import (
+    adaptive_sort,
+    counting_sort,
+    heap_sort,
+    insertion_sort,
+    merge_sort,
+    merge_sort_bottom_up,
+    quick_sort,
+    radix_sort,
+)
+
+ALL_SORTS = [
+    insertion_sort, merge_sort, merge_sort_bottom_up, adaptive_sort,
+    heap_sort, quick_sort, counting_sort, radix_sort,
+]
+
+
+def test_numeric_array_detection():
+    """Test only homogeneous int or float input is treated as numeric."""
+    assert numeric_array([3, 1, 2]).dtype.kind == 'i'
+    assert numeric_array([3.0, 1.5]).dtype.kind == 'f'
+    assert numeric_array(np.array([1, 2], dtype=np.uint8)) is not None
+    assert numeric_array([]) is None
+    assert numeric_array([1, 2.0]) is None
+    assert numeric_array([True, False]) is None
+    assert numeric_array(["b", "a"]) is None
+    assert numeric_array([2**70, 1]) is None
+    assert numeric_array([2**63 + 1, -1]) is None
+    wide = [2**63 + 1, -1, 2**63 + 1, 2**63] * 30
+    assert inversions_fast(wide) == inversion_slow(wide)
+    expected = sorted(wide)
+    merge_sort(wide)
+    assert wide == expected
+    assert numeric_array(np.array(["a", "b"])) is None
+
+    # NaN has no consistent order, the result must not depend on the length
+    nan = float("nan")
+    assert numeric_array([1.0, nan]) is None
+    assert numeric_array(np.array([1.0, nan])) is None
+    with_nan = [1.0, nan, 0.5] * 30
+    assert inversions_fast(with_nan) == inversions_fast(
+        with_nan, backend=Backend.Python
+    )
+    assert inversions_fast(np.array(with_nan)) == inversions_fast(with_nan)
+    with pytest.raises(ValueError):
+        inversions_fast(with_nan, backend=Backend.NumPy)
+
+
+@pytest.mark.parametrize("sort_func", [merge_sort, quick_sort])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_numpy_sort_matches_python(sort_func, reverse):
+    """Test the NumPy backend gives the same result as the Python kernels."""
+    data = [random.randint(-500, 500) for _ in range(1000)]
+    numpy_result = data.copy()
+    python_result = data.copy()
+
+    sort_func(numpy_result, reverse=reverse, backend=Backend.NumPy)
+    sort_func(python_result, reverse=reverse, backend=Backend.Python)
+
+    assert numpy_result == python_result == sorted(data, reverse=reverse)
+    assert all(type(x) is int for x in numpy_result)
+
+
+@pytest.mark.parametrize("sort_func", [merge_sort, quick_sort])
+def test_numpy_sort_sub_range_floats(sort_func):
+    """Test the NumPy backend respects start/end on float lists."""
+    data = [random.random() for _ in range(200)]
+    arr = data.copy()
+    sort_func(arr, 50, 150, backend=Backend.NumPy)
+    assert arr == data[:50] + sorted(data[50:150]) + data[150:]
+
+
+@pytest.mark.parametrize("backend", list(Backend))
+def test_sort_ndarray_in_place(backend):
+    """Test ndarrays are sorted in place on every backend."""
+    arr = np.array([random.randint(0, 100) for _ in range(300)])
+    expected = np.sort(arr, kind='stable')
+    merge_sort(arr, backend=backend)
+    np.testing.assert_array_equal(arr, expected)
+
+
+def test_numpy_backend_rejects_objects():
+    """Test forcing the NumPy backend on generic objects fails loudly."""
+    with pytest.raises(ValueError):
+        merge_sort(["b", "a", "c"], backend=Backend.NumPy)
+    with pytest.raises(ValueError):
+        quick_sort([3, 1, 2], key=lambda x: -x, backend=Backend.NumPy)
+
+
+def test_auto_backend_falls_back_for_objects():
+    """Test Auto keeps generic objects on the pure-Python path."""
+    arr = [str(random.randint(0, 1000)) for _ in range(500)]
+    expected = sorted(arr)
+    quick_sort(arr)
+    assert arr == expected
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 7, 64, 100, 1000])
+def test_numpy_inversions(length):
+    """Test vectorized inversion counting against the O(n^2) count."""
+    arr = [random.randint(0, 20) for _ in range(length)]
+    assert numpy_inversions(np.array(arr)) == inversion_slow(arr)
+
+
+def test_inversions_fast_backends_agree():
+    """Test inversions_fast gives the same count on every backend."""
+    arr = [random.random() for _ in range(500)]
+    expected = inversion_slow(arr)
+    for choice in Backend:
+        assert inversions_fast(arr, backend=choice) == expected
+    assert inversions_fast(np.array(arr)) == expected
+    assert inversions_fast(arr, 100, 400) == inversion_slow(arr[100:400])
+
+
+@pytest.mark.parametrize("sort_func", [counting_sort, radix_sort])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_integer_sorts(sort_func, reverse):
+    """Test counting and radix sort on lists, including negative values."""
+    arr = [random.randint(-1000, 1000) for _ in range(2000)]
+    expected = sorted(arr, reverse=reverse)
+    sort_func(arr, reverse=reverse)
+    assert arr == expected
+    assert all(type(x) is int for x in arr)
+
+
+@pytest.mark.parametrize("radix_bits", [1, 4, 8, 11, 16])
+@pytest.mark.parametrize("dtype", [np.int8, np.uint16, np.int64, np.uint64])
+def test_radix_sort_ndarray(radix_bits, dtype):
+    """Test radix sort over integer dtypes and digit widths, in place."""
+    info = np.iinfo(dtype)
+    low, high = max(info.min, -2**40), min(info.max, 2**40)
+    arr = np.random.randint(low, high, 500).astype(dtype)
+    arr[:2] = [info.min, info.max]
+    expected = np.sort(arr)
+    radix_sort(arr, radix_bits=radix_bits)
+    np.testing.assert_array_equal(arr, expected)
+
+
+def test_integer_sorts_sub_range():
+    """Test counting and radix sort respect start/end."""
+    data = [random.randint(0, 50) for _ in range(100)]
+    for sort_func in (counting_sort, radix_sort):
+        arr = data.copy()
+        sort_func(arr, 20, 80)
+        assert arr == data[:20] + sorted(data[20:80]) + data[80:]
+
+
+def test_integer_sorts_invalid():
+    """Test non-integer input, huge ranges and bad digit widths fail."""
+    with pytest.raises(ValueError):
+        counting_sort([1.5, 0.5])
+    with pytest.raises(ValueError):
+        radix_sort(["b", "a"])
+    with pytest.raises(ValueError):
+        counting_sort([0, 2**40])
+    with pytest.raises(ValueError):
+        radix_sort([3, 1, 2], radix_bits=17)
+    arr = []
+    counting_sort(arr)
+    radix_sort(arr)
+    assert arr == []
+
+
+def test_dispatch_small_range_uses_counting_sort(monkeypatch):
+    """Test Auto hands dense integer ranges to counting sort."""
+    calls = []
+    original = backend.numpy_counting_sort
+
+    def spy(values):
+        calls.append(len(values))
+        return original(values)
+
+    monkeypatch.setattr(backend, 'numpy_counting_sort', spy)
+    dense = [random.randint(0, 100) for _ in range(1000)]
+    merge_sort(dense)
+    assert dense == sorted(dense)
+    sparse = [random.randint(0, 10**12) for _ in range(1000)]
+    quick_sort(sparse)
+    assert sparse == sorted(sparse)
+    assert calls == [1000]
+
+
+def test_buffer_view():
+    """Test buffers become writable ndarray views and other input is kept."""
+    data = [3, 1, 2]
+    assert buffer_view(data) is data
+    view = buffer_view(array.array('i', data))
+    assert isinstance(view, np.ndarray) and view.dtype == np.int32
+    assert buffer_view(bytearray(b'ab')).dtype == np.uint8
+    assert buffer_view(b'ab', writable=False).tolist() == [97, 98]
+    with pytest.raises(ValueError):
+        buffer_view(b'ab')
+    with pytest.raises(ValueError):
+        buffer_view(memoryview(bytearray(4)).cast('B', (2, 2)))
+
+
+@pytest.mark.parametrize("sort_func", ALL_SORTS)
+@pytest.mark.parametrize("typecode", ['b', 'i', 'q', 'Q'])
+def test_sort_array_in_place(sort_func, typecode):
+    """Test every sort sorts array.array in place without boxing."""
+    low = 0 if typecode == 'Q' else -100
+    data = [random.randint(low, 100) for _ in range(300)]
+    arr = array.array(typecode, data)
+    sort_func(arr)
+    assert arr == array.array(typecode, sorted(data))
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+@pytest.mark.parametrize("sort_func", ALL_SORTS[:6])
+def test_sort_unicode_array(sort_func):
+    """Test typecodes NumPy cannot view are sorted as plain sequences."""
+    arr = array.array('u', 'sorting')
+    assert buffer_view(arr) is arr
+    sort_func(arr)
+    assert arr.tounicode() == ''.join(sorted('sorting'))
+    assert inversions_fast(array.array('u', 'ba')) == 1
+
+
+@pytest.mark.parametrize("sort_func", ALL_SORTS)
+def test_sort_memoryview_sub_range(sort_func):
+    """Test sorting a range of a memoryview writes through to its buffer."""
+    data = [random.randint(-1000, 1000) for _ in range(200)]
+    arr = array.array('l', data)
+    sort_func(memoryview(arr), 50, 150)
+    assert arr.tolist() == data[:50] + sorted(data[50:150]) + data[150:]
+
+
+@pytest.mark.parametrize("backend", list(Backend))
+def test_sort_float_array_backends(backend):
+    """Test float buffers are sorted on every backend, also in reverse."""
+    data = [random.random() for _ in range(100)]
+    arr = array.array('d', data)
+    quick_sort(arr, reverse=True, backend=backend)
+    assert arr.tolist() == sorted(data, reverse=True)
+
+
+def test_sort_read_only_buffer():
+    """Test read-only buffers cannot be sorted in place."""
+    with pytest.raises(ValueError):
+        merge_sort(memoryview(b'cab'))
+
+
+def test_inversions_buffer():
+    """Test inversions are counted on array.array and read-only buffers."""
+    data = [random.randint(0, 50) for _ in range(300)]
+    expected = inversion_slow(data)
+    for value in Backend:
+        assert inversions_fast(array.array('i', data), backend=value) == expected
+    assert inversions_fast(memoryview(bytes([3, 2, 1]))) == 3
@@ -0,0 +1,91 @@
+"""Tests for the benchmark harness."""
+
+import random
+import tracemalloc
+
+import pytest
+from algorithms.benchmark import (
+    DISTRIBUTIONS,
+    BenchmarkResult,
+    append_history,
+    compare,
+    load_history,
+    measure,
+    percentile,
+    results_of,
+    run_suite,
+)
+
+
+@pytest.mark.parametrize("name", list(DISTRIBUTIONS))
+def test_distributions(name):
+    """Test every generator returns the requested number of elements."""
+    data = DISTRIBUTIONS[name](100, random.Random(1))
+    assert len(data) == 100
+    assert data == DISTRIBUTIONS[name](100, random.Random(1))
+
+
+def test_percentile():
+    """Test the nearest-rank percentile."""
+    assert percentile([3.0, 1.0, 2.0], 0.5) == 2.0
+    assert percentile([float(i) for i in range(1, 101)], 0.95) == 95.0
+    assert percentile([7.0], 0.95) == 7.0
+
+
+def test_measure_copies_input():
+    """Test every run gets a fresh copy and memory is traced."""
+    data = [3, 2, 1]
+    seen = []
+    times, peak = measure(lambda a: seen.append(a.copy()) or a.sort(), data, 2, 3)
+    assert len(times) == 3
+    assert seen == [[3, 2, 1]] * 6
+    assert data == [3, 2, 1]
+    assert peak >= 0
+    with pytest.raises(ValueError):
+        measure(sorted, data, repeats=0)
+
+    # A tracing session of the caller is left running
+    tracemalloc.start()
+    try:
+        _, peak = measure(lambda a: [0] * 10000, data, 0, 1)
+        assert tracemalloc.is_tracing()
+        assert peak >= 10000 * 8
+    finally:
+        tracemalloc.stop()
+
+
+def test_run_suite():
+    """Test the suite returns one result per case."""
+    results = run_suite(
+        ['merge_sort', 'inversions_fast'], ['sorted', 'few_unique'], [50, 100],
+        warmup=0, repeats=2,
+    )
+    assert len(results) == 8
+    assert all(r.median <= r.p95 for r in results)
+    with pytest.raises(ValueError):
+        run_suite(['bogo_sort'])
+
+
+def test_history_and_compare(tmp_path):
+    """Test results survive the JSON history and regressions are found."""
+    path = str(tmp_path / 'history.json')
+    baseline = [
+        BenchmarkResult('quick_sort', 'random', 100, 5, 1.0, 1.2, 10),
+        BenchmarkResult('merge_sort', 'random', 100, 5, 1.0, 1.1, 10),
+    ]
+    current = [
+        BenchmarkResult('quick_sort', 'random', 100, 5, 1.05, 1.3, 10),
+        BenchmarkResult('merge_sort', 'random', 100, 5, 1.5, 1.6, 10),
+        BenchmarkResult('heap_sort', 'random', 100, 5, 9.0, 9.0, 10),
+    ]
+    append_history(path, baseline, 'before')
+    append_history(path, current, 'after')
+
+    history = load_history(path)
+    assert [entry['label'] for entry in history] == ['before', 'after']
+    assert results_of(history[0]) == baseline
+
+    regressions = compare(results_of(history[0]), results_of(history[1]), 0.1)
+    assert [r.routine for r in regressions] == ['merge_sort']
+    assert regressions[0].ratio == pytest.approx(1.5)
+    assert compare(baseline, current, 0.6) == []
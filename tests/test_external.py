@@ -0,0 +1,81 @@
+"""Tests for the external merge sort."""
+
+import os
+import random
+
+import pytest
+from algorithms.external import external_sort, field_key
+
+
+def write_records(path, records):
+    with open(path, 'wb') as f:
+        f.writelines(records)
+
+
+def read_records(path):
+    with open(path, 'rb') as f:
+        return f.readlines()
+
+
+@pytest.mark.parametrize("memory_limit,fan_in", [
+    (10**9, 64),  # Single run
+    (500, 64),  # Several runs, one merge pass
+    (200, 2),  # Several merge passes
+])
+def test_external_sort(tmp_path, memory_limit, fan_in):
+    """Test the output matches sorted() for different run layouts."""
+    records = [f'{random.randint(0, 10**6)}\n'.encode() for _ in range(500)]
+    input_path = tmp_path / 'input.txt'
+    output_path = tmp_path / 'output.txt'
+    write_records(input_path, records)
+
+    count = external_sort(
+        str(input_path), str(output_path), memory_limit=memory_limit,
+        fan_in=fan_in, tmp_dir=str(tmp_path),
+    )
+
+    assert count == 500
+    assert read_records(output_path) == sorted(records)
+    assert sorted(os.listdir(tmp_path)) == ['input.txt', 'output.txt']
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_external_sort_numeric_field_stable(tmp_path, reverse):
+    """Test sorting on a numeric field keeps equal keys in input order."""
+    records = [
+        f'{random.randint(0, 20)}\trow-{i}\n'.encode() for i in range(300)
+    ]
+    key = field_key(0, numeric=True)
+    input_path = tmp_path / 'input.tsv'
+    output_path = tmp_path / 'output.tsv'
+    write_records(input_path, records)
+
+    external_sort(
+        str(input_path), str(output_path), memory_limit=300, fan_in=3,
+        key=key, reverse=reverse,
+    )
+
+    assert read_records(output_path) == sorted(records, key=key, reverse=reverse)
+
+
+def test_external_sort_missing_newline_and_empty(tmp_path):
+    """Test a last record without newline and an empty input."""
+    input_path = tmp_path / 'input.txt'
+    output_path = tmp_path / 'output.txt'
+    write_records(input_path, [b'b\n', b'c\n', b'a'])
+    assert external_sort(str(input_path), str(output_path)) == 3
+    assert read_records(output_path) == [b'a\n', b'b\n', b'c\n']
+
+    write_records(input_path, [])
+    assert external_sort(str(input_path), str(output_path)) == 0
+    assert read_records(output_path) == []
+
+
+def test_external_sort_invalid_arguments(tmp_path):
+    """Test invalid memory budgets and fan-ins are rejected."""
+    input_path = tmp_path / 'input.txt'
+    write_records(input_path, [b'a\n'])
+    with pytest.raises(ValueError):
+        external_sort(str(input_path), str(tmp_path / 'out'), memory_limit=0)
+    with pytest.raises(ValueError):
+        external_sort(str(input_path), str(tmp_path / 'out'), fan_in=1)
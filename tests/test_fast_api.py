@@ -0,0 +1,143 @@
+"""Tests for the sorting endpoints of the FastAPI example."""
+
+import json
+import random
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from algorithms.inversion import inversions_fast
+import fast_api
+from fast_api import app
+
+BINARY = {"content-type": "application/octet-stream"}
+NDJSON = {"content-type": "application/x-ndjson"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def _status(client, url, content, headers=BINARY):
+    return client.post(url, content=content, headers=headers).status_code
+
+
+def _ndjson_values(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_sort_binary(client):
+    """Test a binary body sorted into a binary response, for several dtypes."""
+    for dtype in ("int64", "int32", "uint8", "float64"):
+        values = np.random.default_rng(0).integers(0, 100, 1000).astype(dtype)
+        response = client.post(
+            f"/sort?dtype={dtype}",
+            content=values.astype(np.dtype(dtype).newbyteorder("<")).tobytes(),
+            headers={**BINARY, "accept": "application/octet-stream"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/octet-stream"
+        result = np.frombuffer(
+            response.content, dtype=np.dtype(dtype).newbyteorder("<")
+        )
+        assert result.tolist() == sorted(values.tolist())
+
+
+def test_sort_ndjson(client):
+    """Test NDJSON bodies, scalars or arrays per line, streamed back as NDJSON."""
+    values = [random.randrange(-1000, 1000) for _ in range(20000)]
+    lines = [json.dumps(v) for v in values[:100]]
+    lines.append(json.dumps(values[100:]))
+    body = "\n".join(lines) + "\n"
+    response = client.post("/sort?reverse=true", content=body, headers=NDJSON)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert _ndjson_values(response) == sorted(values, reverse=True)
+
+    response = client.post("/sort?dtype=float64", json=[3.5, 1.0, 2.25])
+    assert _ndjson_values(response) == [1.0, 2.25, 3.5]
+    # Integral floats and the bounds of the dtype are kept exactly
+    response = client.post("/sort", content="2.0\n-1.0", headers=NDJSON)
+    assert _ndjson_values(response) == [-1, 2]
+    body = f"{2**63 - 1}\n{-2**63}"
+    response = client.post("/sort", content=body, headers=NDJSON)
+    assert _ndjson_values(response) == [-2**63, 2**63 - 1]
+    # Ints mixed with floats are not rounded through float64
+    response = client.post("/sort", json=[2**53 + 1, 1.0])
+    assert _ndjson_values(response) == [1, 2**53 + 1]
+
+    response = client.post("/sort", content="", headers=NDJSON)
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+def test_inversions(client):
+    """Test the inversion count matches the library's."""
+    values = [random.randrange(100) for _ in range(500)]
+    body = np.array(values, dtype="<i8").tobytes()
+    response = client.post("/inversions", content=body, headers=BINARY)
+    assert response.status_code == 200
+    assert response.json() == {
+        "length": len(values), "inversions": inversions_fast(values)
+    }
+
+
+def test_topk(client):
+    """Test the k largest and smallest values, best first."""
+    values = [random.randrange(1000) for _ in range(1000)]
+    body = "\n".join(map(str, values))
+    response = client.post("/topk?k=10", content=body, headers=NDJSON)
+    assert _ndjson_values(response) == sorted(values, reverse=True)[:10]
+    response = client.post("/topk?k=10&largest=false", content=body, headers=NDJSON)
+    assert _ndjson_values(response) == sorted(values)[:10]
+    response = client.post("/topk?k=5000", content=body, headers=NDJSON)
+    assert _ndjson_values(response) == sorted(values, reverse=True)
+    assert _status(client, "/topk?k=-1", body, NDJSON) == 422
+
+
+def test_invalid_requests(client, monkeypatch):
+    """Test the errors reported for bodies that cannot be read."""
+    assert _status(client, "/sort?dtype=object", b"") == 400
+    assert _status(client, "/sort", b"\x00" * 7) == 400
+    assert _status(client, "/sort", "1\nfoo\n", NDJSON) == 400
+    assert _status(client, "/sort", '{"a": 1}', NDJSON) == 400
+    # Values the dtype would truncate or wrap around
+    assert _status(client, "/sort", "1.7\n2.2", NDJSON) == 400
+    assert _status(client, "/sort?dtype=uint8", "300\n1", NDJSON) == 400
+    assert _status(client, "/sort?dtype=uint8", "-1", NDJSON) == 400
+    assert _status(client, "/sort", str(2**63), NDJSON) == 400
+    assert _status(client, "/sort?dtype=float32", "1e300", NDJSON) == 400
+    json_type = {"content-type": "application/json"}
+    assert _status(client, "/sort", "[[1, 2]]", json_type) == 400
+    assert _status(client, "/sort", "[1, true]", json_type) == 400
+    assert _status(client, "/sort?dtype=float64", "true", NDJSON) == 400
+    assert _status(client, "/topk?k=1", "1.5", NDJSON) == 400
+    assert _status(client, "/inversions", "null", NDJSON) == 400
+    assert _status(client, "/sort", "1", {"content-type": "text/csv"}) == 415
+
+    monkeypatch.setattr(fast_api, "MAX_BODY_BYTES", 16)
+    assert _status(client, "/sort", b"\x00" * 24) == 413
+
+
+def test_original_routes(client):
+    """Test the routes of the original example still work."""
+    assert client.get("/").json() == {"Hello": "World"}
+    response = client.put("/items/3", json={"name": "x", "price": 1.5})
+    assert response.json() == {"item_name": "x", "item_id": 3}
+
+
+def test_cached_routes(client):
+    """Test the cached routes and the cache counters."""
+    fast_api.cache.clear()
+    before = client.get("/cache/stats").json()
+    assert client.get("/items/5?q=a").headers["x-cache"] == "MISS"
+    response = client.get("/items/5?q=a")
+    assert response.json() == {"item_id": 5, "q": "a"}
+    assert response.headers["x-cache"] == "HIT"
+    assert len(client.get("/burgers").json()) == 2
+    after = client.get("/cache/stats").json()
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 2
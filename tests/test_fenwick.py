@@ -0,0 +1,127 @@
+"""Tests for the Fenwick tree and the streaming inversion counter."""
+
+import random
+
+import pytest
+from algorithms.fenwick import FenwickTree, InversionCounter
+from algorithms.inversion import inversion_slow
+
+
+def test_fenwick_prefix_sums():
+    """Test prefix sums against a plain list of counters."""
+    counters = [0] * 50
+    tree = FenwickTree(50)
+    for _ in range(200):
+        i = random.randrange(50)
+        delta = random.randint(-5, 5)
+        counters[i] += delta
+        tree.add(i, delta)
+        end = random.randint(0, 50)
+        assert tree.prefix_sum(end) == sum(counters[:end])
+    assert len(tree) == 50
+
+
+def test_fenwick_invalid_index():
+    """Test out of range updates are rejected."""
+    tree = FenwickTree(3)
+    with pytest.raises(IndexError):
+        tree.add(3, 1)
+    with pytest.raises(ValueError):
+        FenwickTree(-1)
+
+
+def test_inversion_counter_append():
+    """Test appending keeps the count equal to the O(n^2) count."""
+    universe = list(range(20))
+    counter = InversionCounter(universe)
+    values = []
+    for _ in range(100):
+        value = random.choice(universe)
+        counter.append(value)
+        values.append(value)
+        assert counter.count() == inversion_slow(values)
+
+
+def test_inversion_counter_sliding_window():
+    """Test a sliding window driven by append and pop_front."""
+    universe = [random.random() for _ in range(30)]
+    counter = InversionCounter(universe)
+    window = []
+    for _ in range(300):
+        value = random.choice(universe)
+        counter.append(value)
+        window.append(value)
+        if len(window) > 25:
+            assert counter.pop_front() == window.pop(0)
+        assert counter.count() == inversion_slow(window)
+        assert list(counter) == window
+
+
+def test_inversion_counter_replace():
+    """Test point replacements anywhere in the window."""
+    universe = list(range(10))
+    values = [random.choice(universe) for _ in range(40)]
+    counter = InversionCounter(universe, values)
+    assert counter.count() == inversion_slow(values)
+    for _ in range(200):
+        index = random.randrange(-len(values), len(values))
+        value = random.choice(universe)
+        assert counter.replace(index, value) == values[index]
+        values[index] = value
+        assert counter.count() == inversion_slow(values)
+        assert counter[index] == value
+
+
+def test_inversion_counter_replace_sliding():
+    """Test replacements mixed with appends and pops, across grid rebuilds."""
+    universe = list(range(20))
+    window = [random.choice(universe) for _ in range(5)]
+    counter = InversionCounter(universe, window)
+    for _ in range(500):
+        operation = random.random()
+        if operation < 0.4:
+            value = random.choice(universe)
+            counter.append(value)
+            window.append(value)
+        elif operation < 0.7 and window:
+            assert counter.pop_front() == window.pop(0)
+        elif window:
+            index = random.randrange(len(window))
+            value = random.choice(universe)
+            assert counter.replace(index, value) == window[index]
+            window[index] = value
+        assert counter.count() == inversion_slow(window)
+    assert list(counter) == window
+
+
+def test_inversion_counter_errors():
+    """Test unknown values and empty pops are rejected."""
+    counter = InversionCounter([1, 2, 3])
+    with pytest.raises(ValueError):
+        counter.append(4)
+    with pytest.raises(IndexError):
+        counter.pop_front()
+    counter.append(1)
+    with pytest.raises(IndexError):
+        counter.replace(1, 2)
+    with pytest.raises(ValueError):
+        counter.replace(0, 5)
+    assert len(counter) == 1
+
+
+def test_fenwick_from_counts_and_search():
+    """Test the linear build and the prefix sum search."""
+    counts = [random.randint(0, 5) for _ in range(37)]
+    tree = FenwickTree.from_counts(counts)
+    for end in range(38):
+        assert tree.prefix_sum(end) == sum(counts[:end])
+    for target in range(sum(counts)):
+        index, offset = tree.search(target)
+        assert sum(counts[:index]) + offset == target
+        assert 0 <= offset < counts[index]
+    with pytest.raises(IndexError):
+        tree.search(sum(counts))
+    with pytest.raises(IndexError):
+        tree.search(-1)
+    with pytest.raises(IndexError):
+        FenwickTree(0).search(0)
@@ -0,0 +1,88 @@
+"""Tests for the sort instrumentation."""
+
+import random
+
+from algorithms.instrument import instrument
+from algorithms.sorting import (
+    QsPivot,
+    _insertion_sort,
+    heap_sort,
+    merge_sort,
+    partition3,
+    quick_sort,
+)
+
+
+def test_instrument_sorts_in_place():
+    """Test the instrumented call still sorts its input."""
+    arr = [random.randrange(100) for _ in range(500)]
+    expected = sorted(arr)
+    for sort_func in (merge_sort, quick_sort, heap_sort):
+        work = arr.copy()
+        report = instrument(sort_func, work)
+        assert work == expected
+        assert report.routine == sort_func.__name__
+        assert report.length == 500
+        assert report.comparisons > 0 and report.moves > 0
+        assert report.total_time > 0
+
+
+def test_instrument_exact_counts():
+    """Test counts on an input whose work is known exactly."""
+    # Insertion sort of a reversed list compares and shifts every pair
+    report = instrument(_insertion_sort, [5, 4, 3, 2, 1], 0, 5)
+    assert report.comparisons == 10
+    assert report.moves == 14
+    # Sorted input: every merge is skipped, one comparison per merge check
+    report = instrument(merge_sort, list(range(64)), cutoff=1)
+    assert report.comparisons == 63
+
+
+def test_instrument_depth_and_phases():
+    """Test recursion depth and per-phase calls are reported."""
+    report = instrument(merge_sort, list(range(1024, 0, -1)), cutoff=1)
+    # Ranges of 1024, 512, ..., 1 elements
+    assert report.max_depth == 11
+    assert report.phase_calls['_merge'] == 1023
+    assert set(report.phase_times) == set(report.phase_calls)
+
+    report = instrument(quick_sort, list(range(200)), pivot=QsPivot.First)
+    assert report.phase_calls['partition3'] == report.phase_calls['_select_pivot']
+    assert 'partition3' in report.summary()
+    # The first pivot splits sorted input one element at a time, until the
+    # introsort depth limit of 2 * 8 partitions below the whole range
+    assert report.max_depth == 17
+    report = instrument(
+        quick_sort, list(range(200)), pivot=QsPivot.First, introsort=False
+    )
+    assert report.max_depth > 17
+
+
+def test_instrument_key_and_partition():
+    """Test key functions see the original elements and partitions work."""
+    words = ['ccc', 'a', 'bb']
+    instrument(merge_sort, words, key=len)
+    assert words == ['a', 'bb', 'ccc']
+
+    # Sorting (key, position) pairs makes the same decisions as the plain
+    # sort, plus one write per element to decorate and one to undecorate
+    arr = [random.randrange(100) for _ in range(500)]
+    plain = instrument(merge_sort, arr.copy())
+    keyed = instrument(merge_sort, arr.copy(), key=lambda x: x)
+    assert keyed.comparisons == plain.comparisons
+    assert keyed.moves == plain.moves + 2 * len(arr)
+    assert keyed.max_depth == plain.max_depth
+    descending = sorted(arr, reverse=True)
+    plain = instrument(merge_sort, arr.copy(), key=lambda x: -x)
+    reverse = instrument(merge_sort, arr.copy(), reverse=True)
+    assert reverse.comparisons == plain.comparisons
+    assert reverse.moves == plain.moves
+    work = arr.copy()
+    instrument(merge_sort, work, reverse=True)
+    assert work == descending
+    report = instrument(merge_sort, arr.copy(), 100, 200, key=lambda x: x)
+    assert report.moves >= 2 * 100
+
+    arr = [3, 1, 2, 3, 5, 3]
+    report = instrument(partition3, arr, 0, len(arr), 0)
+    assert report.phase_calls['partition3'] == 1
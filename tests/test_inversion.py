@@ -1,7 +1,21 @@
 """Tests for inversion counting algorithms."""
 
+import random
+
 import pytest
-from algorithms.inversion import inversions_fast, inversion_slow
+from algorithms.backend import Backend
+from algorithms.inversion import count_inversions, inversions_fast, inversion_slow
+
+
+def per_element_slow(arr):
+    """Count the inversions each element takes part in, O(n^2)."""
+    counts = [0] * len(arr)
+    for i in range(len(arr)):
+        for j in range(i + 1, len(arr)):
+            if arr[i] > arr[j]:
+                counts[i] += 1
+                counts[j] += 1
+    return counts
 
 
 def test_inversion_empty():
@@ -105,3 +119,51 @@ def test_inversion_float_numbers():
     fast_result = inversions_fast(arr)
     slow_result = inversion_slow(arr)
     assert fast_result == slow_result
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 15, 16, 17, 100, 333])
+def test_inversion_python_backend(length):
+    """Test the counting merge sort against the O(n^2) count."""
+    arr = [random.randint(0, 30) for _ in range(length)]
+    assert inversions_fast(arr, backend=Backend.Python) == inversion_slow(arr)
+
+
+def test_inversion_does_not_modify_input():
+    """Test counting leaves the input untouched."""
+    arr = [5, 3, 8, 1, 9, 2] * 10
+    original = arr.copy()
+    inversions_fast(arr, backend=Backend.Python)
+    count_inversions(arr, per_element=True)
+    assert arr == original
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 16, 17, 100, 333])
+def test_count_inversions(length):
+    """Test count_inversions returns the count and the sorted range."""
+    arr = [random.randint(0, 30) for _ in range(length)]
+    result = count_inversions(arr)
+    assert result.total == inversion_slow(arr)
+    assert result.sorted == sorted(arr)
+    assert result.per_element is None
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 16, 17, 100, 333])
+def test_count_inversions_per_element(length):
+    """Test the per-element inversion counts."""
+    arr = [random.randint(0, 30) for _ in range(length)]
+    result = count_inversions(arr, per_element=True)
+    assert result.total == inversion_slow(arr)
+    assert result.sorted == sorted(arr)
+    assert result.per_element == per_element_slow(arr)
+    assert sum(result.per_element) == 2 * result.total
+
+
+def test_count_inversions_sub_range():
+    """Test count_inversions respects start/end."""
+    arr = [9, 1, 8, 2, 7, 3, 6, 4, 5]
+    result = count_inversions(arr, 2, 7, per_element=True)
+    assert result.total == inversion_slow(arr[2:7])
+    assert result.sorted == sorted(arr[2:7])
+    assert result.per_element == per_element_slow(arr[2:7])
+    with pytest.raises(ValueError):
+        count_inversions(arr, 5, 2)
@@ -0,0 +1,79 @@
+"""Tests for the loser-tree k-way merge."""
+
+import heapq
+import itertools
+import math
+import random
+
+import pytest
+from algorithms.merge import kway_merge
+
+
+def _sorted_sources(nb_sources, max_length):
+    return [
+        sorted(random.randrange(100) for _ in range(random.randint(0, max_length)))
+        for _ in range(nb_sources)
+    ]
+
+
+def test_kway_merge_random():
+    """Test merging any number of sources, including empty ones."""
+    for nb_sources in (0, 1, 2, 3, 7, 64, 100):
+        sources = _sorted_sources(nb_sources, 50)
+        expected = sorted(itertools.chain(*sources))
+        assert list(kway_merge(*sources)) == expected
+        assert list(kway_merge(*sources, batch_size=1)) == expected
+
+
+def test_kway_merge_stable_key_reverse():
+    """Test ties keep source order, like heapq.merge, with key and reverse."""
+    sources = [
+        sorted(((random.randrange(10), s, i) for i in range(30)), key=lambda t: t[0])
+        for s in range(9)
+    ]
+
+    def key(item):
+        return item[0]
+
+    assert list(kway_merge(*sources, key=key)) == list(heapq.merge(*sources, key=key))
+    descending = [source[::-1] for source in sources]
+    assert list(kway_merge(*descending, key=key, reverse=True)) == list(
+        heapq.merge(*descending, key=key, reverse=True)
+    )
+
+
+def test_kway_merge_lazy():
+    """Test unbounded sources are consumed lazily."""
+    sources = [itertools.count(start, 5) for start in range(5)]
+    assert list(itertools.islice(kway_merge(*sources, batch_size=8), 100)) == list(
+        range(100)
+    )
+
+
+def test_kway_merge_comparisons():
+    """Test the tree makes at most ceil(log2 k) comparisons per element."""
+    count = 0
+
+    class Counted:
+        def __init__(self, value):
+            self.value = value
+
+        def __lt__(self, other):
+            nonlocal count
+            count += 1
+            return self.value < other.value
+
+    nb_sources = 100
+    sources = [
+        [Counted(v) for v in sorted(random.randrange(1000) for _ in range(20))]
+        for _ in range(nb_sources)
+    ]
+    merged = list(kway_merge(*sources))
+    assert [c.value for c in merged] == sorted(c.value for s in sources for c in s)
+    assert count <= len(merged) * math.ceil(math.log2(nb_sources)) + nb_sources
+
+
+def test_kway_merge_invalid_batch():
+    """Test a non-positive batch size is rejected."""
+    with pytest.raises(ValueError):
+        kway_merge([1], batch_size=0)
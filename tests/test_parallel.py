@@ -0,0 +1,95 @@
+"""Tests for the multiprocess sorts."""
+
+import random
+
+import numpy as np
+import pytest
+from algorithms import parallel
+from algorithms.inversion import inversion_slow
+from algorithms.parallel import parallel_inversions, parallel_sort
+
+
+@pytest.fixture
+def small_threshold(monkeypatch):
+    """Run the process pool even for small test inputs."""
+    monkeypatch.setattr(parallel, 'PARALLEL_MIN_LENGTH', 0)
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3, 4])
+def test_parallel_sort_ndarray(small_threshold, workers):
+    """Test int64 arrays are sorted in place."""
+    arr = np.random.randint(-10**9, 10**9, size=20000, dtype=np.int64)
+    expected = np.sort(arr)
+    parallel_sort(arr, workers=workers)
+    np.testing.assert_array_equal(arr, expected)
+
+
+def test_parallel_sort_list(small_threshold):
+    """Test numeric lists are sorted in place and keep Python types."""
+    arr = [random.random() for _ in range(5000)]
+    expected = sorted(arr)
+    parallel_sort(arr, workers=3)
+    assert arr == expected
+    assert all(type(x) is float for x in arr)
+
+
+def test_parallel_sort_few_unique(small_threshold):
+    """Test heavy duplicates, where splitters are repeated."""
+    arr = np.random.randint(0, 3, size=10000)
+    expected = np.sort(arr)
+    parallel_sort(arr, workers=4)
+    np.testing.assert_array_equal(arr, expected)
+
+
+def test_parallel_sort_tiny(small_threshold):
+    """Test inputs smaller than the number of workers."""
+    for length in range(6):
+        arr = [random.randint(0, 9) for _ in range(length)]
+        expected = sorted(arr)
+        parallel_sort(arr, workers=4)
+        assert arr == expected
+
+
+def test_parallel_sort_sequential_fallback():
+    """Test small inputs are sorted without a pool."""
+    arr = [5, 3, 1, 4, 2]
+    parallel_sort(arr, workers=8)
+    assert arr == [1, 2, 3, 4, 5]
+
+
+def test_parallel_sort_invalid():
+    """Test non-numeric input and bad worker counts are rejected."""
+    with pytest.raises(ValueError):
+        parallel_sort(["b", "a"], workers=2)
+    with pytest.raises(ValueError):
+        parallel_sort([2, 1], workers=0)
+
+
+@pytest.mark.parametrize("workers,chunk_size", [
+    (1, None), (2, None), (3, None), (2, 7), (4, 100), (3, 10**6),
+])
+def test_parallel_inversions(small_threshold, workers, chunk_size):
+    """Test the parallel count is exactly the sequential count."""
+    arr = [random.randint(0, 50) for _ in range(1000)]
+    expected = inversion_slow(arr)
+    assert parallel_inversions(arr, workers, chunk_size) == expected
+    assert parallel_inversions(np.array(arr), workers, chunk_size) == expected
+
+
+def test_parallel_inversions_does_not_modify_input(small_threshold):
+    """Test the input is left untouched."""
+    arr = np.random.random(500)
+    original = arr.copy()
+    parallel_inversions(arr, workers=2)
+    np.testing.assert_array_equal(arr, original)
+
+
+def test_parallel_inversions_invalid():
+    """Test invalid input and arguments are rejected."""
+    assert parallel_inversions([], workers=2) == 0
+    with pytest.raises(ValueError):
+        parallel_inversions(["b", "a"], workers=2)
+    with pytest.raises(ValueError):
+        parallel_inversions([2, 1], workers=0)
+    with pytest.raises(ValueError):
+        parallel_inversions([2, 1], workers=2, chunk_size=0)
@@ -0,0 +1,106 @@
+"""Tests for nth_element, select_k and top_k."""
+
+import random
+
+import pytest
+from algorithms.selection import nth_element, select_k, top_k
+from algorithms import selection
+
+
+def test_nth_element_random():
+    """Test the k-th element is in place and the range is partitioned."""
+    for length in (1, 2, 17, 100, 1000):
+        arr = [random.randrange(length) for _ in range(length)]
+        for k in {0, length // 2, length - 1}:
+            work = arr.copy()
+            nth_element(work, k)
+            assert work[k] == sorted(arr)[k]
+            assert all(x <= work[k] for x in work[:k])
+            assert all(x >= work[k] for x in work[k + 1:])
+            assert sorted(work) == sorted(arr)
+
+
+def test_nth_element_range():
+    """Test elements outside [start, end) are left untouched."""
+    arr = [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
+    nth_element(arr, 4, 2, 8)
+    assert arr[:2] == [9, 8] and arr[8:] == [1, 0]
+    assert arr[4] == 4
+
+
+def test_nth_element_key():
+    """Test the key is used for comparisons and called once per element."""
+    words = ['pear', 'fig', 'banana', 'kiwi', 'apple', 'plum', 'cherry']
+    calls = []
+
+    def key(word):
+        calls.append(word)
+        return len(word)
+
+    nth_element(words, 3, key=key)
+    assert len(words[3]) == 4
+    assert all(len(w) <= 4 for w in words[:3])
+    assert all(len(w) >= 4 for w in words[4:])
+    assert len(calls) == len(words)
+
+
+def test_nth_element_median_of_medians(monkeypatch):
+    """Test the median-of-medians fallback on adversarial pivots."""
+    # Always choosing the first element as pivot makes every partition
+    # remove a single element from a sorted list
+    monkeypatch.setattr(
+        selection, '_select_pivot', lambda arr, start, end, pivot: start
+    )
+    arr = list(range(2000))
+    random.seed(0)
+    for k in (0, 777, 1999):
+        work = arr.copy()
+        nth_element(work, k)
+        assert work[k] == k
+    arr = [random.randrange(50) for _ in range(1000)]
+    work = arr.copy()
+    nth_element(work, 500)
+    assert work[500] == sorted(arr)[500]
+
+
+def test_nth_element_invalid():
+    """Test invalid ranges and ranks are rejected."""
+    with pytest.raises(ValueError):
+        nth_element([], 0)
+    with pytest.raises(ValueError):
+        nth_element([1, 2, 3], 3)
+    with pytest.raises(ValueError):
+        nth_element([1, 2, 3], 0, 1, 3)
+
+
+def test_select_k():
+    """Test select_k against sorted() without modifying its input."""
+    arr = [random.random() for _ in range(300)]
+    copy = arr.copy()
+    for k in (0, 150, 299):
+        assert select_k(arr, k) == sorted(arr)[k]
+    assert arr == copy
+    assert select_k(['bb', 'a', 'ccc'], 2, key=len) == 'ccc'
+    with pytest.raises(ValueError):
+        select_k(arr, 300)
+
+
+def test_top_k_matches_sorted():
+    """Test top_k equals sorted()[:k] for lists and iterators, ties included."""
+    pairs = [(random.randrange(10), i) for i in range(200)]
+
+    def key(pair):
+        return pair[0]
+
+    for k in (0, 1, 10, 199, 200, 500):
+        for largest in (True, False):
+            expected = sorted(pairs, key=key, reverse=largest)[:k]
+            assert top_k(pairs, k, key=key, largest=largest) == expected
+            assert top_k(iter(pairs), k, key=key, largest=largest) == expected
+
+
+def test_top_k_stream():
+    """Test top_k consumes a generator without materializing it."""
+    stream = (i * 7919 % 10007 for i in range(10007))
+    assert top_k(stream, 3) == [10006, 10005, 10004]
+    assert top_k(range(100), 2, largest=False) == [0, 1]
@@ -0,0 +1,111 @@
+"""Tests for the block-based sorted list."""
+
+import bisect
+import random
+
+import pytest
+from algorithms.sorted_list import SortedList
+from algorithms.sorting import merge_sort
+
+
+def _check(sorted_list, model):
+    assert len(sorted_list) == len(model)
+    assert list(sorted_list) == model
+    assert list(reversed(sorted_list)) == model[::-1]
+
+
+def test_sorted_list_against_model():
+    """Test random adds, removes and pops against a plain sorted list."""
+    sorted_list = SortedList(load=4)
+    model = []
+    for _ in range(2000):
+        op = random.random()
+        value = random.randrange(100)
+        if op < 0.5:
+            sorted_list.add(value)
+            bisect.insort(model, value)
+        elif op < 0.8:
+            if value in model:
+                sorted_list.remove(value)
+                model.remove(value)
+            else:
+                assert value not in sorted_list
+                with pytest.raises(ValueError):
+                    sorted_list.remove(value)
+        elif model:
+            index = random.randrange(-len(model), len(model))
+            assert sorted_list.pop(index) == model.pop(index)
+    _check(sorted_list, model)
+
+
+def test_sorted_list_positions():
+    """Test indexing, slicing, bisect and rank queries."""
+    data = [random.randrange(50) for _ in range(500)]
+    model = sorted(data)
+    sorted_list = SortedList(data, load=8)
+    _check(sorted_list, model)
+    for i in range(-len(model), len(model)):
+        assert sorted_list[i] == model[i]
+    assert sorted_list[10:100] == model[10:100]
+    assert sorted_list[::7] == model[::7]
+    assert sorted_list[490:1000] == model[490:1000]
+    for value in range(-1, 52):
+        assert sorted_list.bisect_left(value) == bisect.bisect_left(model, value)
+        assert sorted_list.bisect(value) == bisect.bisect_right(model, value)
+        assert sorted_list.rank(value) == bisect.bisect_left(model, value)
+        assert sorted_list.count(value) == model.count(value)
+    with pytest.raises(IndexError):
+        sorted_list[500]
+
+
+def test_sorted_list_irange():
+    """Test range iteration with inclusive and exclusive bounds."""
+    sorted_list = SortedList(range(0, 100, 2), load=4)
+    assert list(sorted_list.irange(10, 20)) == [10, 12, 14, 16, 18, 20]
+    assert list(sorted_list.irange(10, 20, (False, False))) == [12, 14, 16, 18]
+    assert list(sorted_list.irange(maximum=4)) == [0, 2, 4]
+    assert list(sorted_list.irange(minimum=95)) == [96, 98]
+    assert list(sorted_list.irange(50, 40)) == []
+    assert list(sorted_list.islice(3, 6)) == [6, 8, 10]
+
+
+def test_sorted_list_bulk_load():
+    """Test bulk-loading sorted output and updating with new values."""
+    data = [random.random() for _ in range(1000)]
+    merge_sort(data)
+    sorted_list = SortedList.from_sorted(data, load=16)
+    _check(sorted_list, data)
+    extra = [random.random() for _ in range(300)]
+    sorted_list.update(extra)
+    _check(sorted_list, sorted(data + extra))
+    sorted_list.add(0.5)
+    assert sorted_list[sorted_list.rank(0.5)] == 0.5
+    sorted_list.clear()
+    assert len(sorted_list) == 0 and list(sorted_list) == []
+    assert repr(SortedList([3, 1, 2])) == 'SortedList([1, 2, 3])'
+
+
+def test_sorted_list_stable_adds():
+    """Test equal values are inserted after the existing ones."""
+
+    class Item:
+        def __init__(self, key, tag):
+            self.key = key
+            self.tag = tag
+
+        def __lt__(self, other):
+            return self.key < other.key
+
+        def __eq__(self, other):
+            return self.key == other.key
+
+    sorted_list = SortedList(load=2)
+    for tag in range(10):
+        sorted_list.add(Item(1, tag))
+    assert [item.tag for item in sorted_list] == list(range(10))
+
+
+def test_sorted_list_invalid_load():
+    """Test the block size must be at least 2."""
+    with pytest.raises(ValueError):
+        SortedList(load=1)
@@ -1,10 +1,34 @@
+import itertools
 import random
 import pytest
+from algorithms.backend import Backend
 from algorithms.sorting import (
-    merge_sort, quick_sort, partition, QsPivot
+    merge_sort, merge_sort_bottom_up, quick_sort, heap_sort, adaptive_sort,
+    partition, partition3, QsPivot, insertion_sort, quick_sort_iter,
+    block_partition, QsPartition,
 )
 
 
+class Record:
+    """Element that compares on key only, used to check stability."""
+
+    def __init__(self, key: int, tag: int) -> None:
+        self.key = key
+        self.tag = tag
+
+    def __lt__(self, other: "Record") -> bool:
+        return self.key < other.key
+
+    def __le__(self, other: "Record") -> bool:
+        return self.key <= other.key
+
+    def __gt__(self, other: "Record") -> bool:
+        return self.key > other.key
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Record) and self.key == other.key
+
+
 # Simple Go-style tests (no classes needed)
 def test_merge_sort_basic():
     """Test merge sort with basic input."""
@@ -50,6 +74,110 @@ def test_merge_sort_duplicates():
     assert arr == expected
 
 
+@pytest.mark.parametrize("cutoff", [1, 2, 7, 16, 1000])
+def test_merge_sort_cutoff(cutoff):
+    """Test merge sort with different insertion sort cutoffs."""
+    for _ in range(20):
+        arr = [random.randint(0, 50) for _ in range(random.randint(0, 200))]
+        expected = sorted(arr)
+        merge_sort(arr, cutoff=cutoff)
+        assert arr == expected
+
+
+def test_merge_sort_invalid_cutoff():
+    """Test merge sort rejects a non-positive cutoff."""
+    with pytest.raises(ValueError):
+        merge_sort([3, 2, 1], cutoff=0)
+
+
+def test_merge_sort_stable():
+    """Test merge sort keeps equal elements in their original order."""
+    arr = [Record(random.randint(0, 5), tag) for tag in range(300)]
+    expected = sorted(arr, key=lambda r: r.key)
+    merge_sort(arr, cutoff=4)
+    assert [r.tag for r in arr] == [r.tag for r in expected]
+
+
+def test_merge_sort_sub_range():
+    """Test merge sort only touches the requested range."""
+    arr = [9, 8, 7, 6, 5, 4, 3, 2, 1, 0] * 5
+    merge_sort(arr, 10, 40, cutoff=3)
+    assert arr[:10] == [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
+    assert arr[10:40] == sorted([9, 8, 7, 6, 5, 4, 3, 2, 1, 0] * 3)
+    assert arr[40:] == [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
+
+
+@pytest.mark.parametrize("cutoff", [1, 3, 16])
+def test_merge_sort_bottom_up_cutoff(cutoff):
+    """Test bottom-up merge sort with different initial run lengths."""
+    for _ in range(20):
+        arr = [random.randint(0, 50) for _ in range(random.randint(0, 200))]
+        expected = sorted(arr)
+        merge_sort_bottom_up(arr, cutoff=cutoff)
+        assert arr == expected
+
+
+def test_merge_sort_bottom_up_stable_sub_range():
+    """Test bottom-up merge sort is stable and respects start/end."""
+    arr = [Record(random.randint(0, 5), tag) for tag in range(300)]
+    expected = arr[:50] + sorted(arr[50:250], key=lambda r: r.key) + arr[250:]
+    merge_sort_bottom_up(arr, 50, 250, cutoff=2)
+    assert [r.tag for r in arr] == [r.tag for r in expected]
+
+
+@pytest.mark.parametrize("pivot_type", [QsPivot.First, QsPivot.Last])
+def test_quick_sort_adversarial_no_recursion_limit(pivot_type):
+    """Test quick sort on inputs deeper than the default recursion limit."""
+    arr = list(range(2000))
+    quick_sort(arr, pivot=pivot_type)
+    assert arr == list(range(2000))
+
+    arr = list(range(2000, 0, -1))
+    quick_sort(arr, pivot=pivot_type)
+    assert arr == list(range(1, 2001))
+
+
+@pytest.mark.parametrize("shape", [
+    "random", "sorted", "reversed", "nearly_sorted", "sawtooth", "few_unique",
+])
+def test_adaptive_sort_stable(shape):
+    """Test the adaptive sort is stable on run-heavy inputs."""
+    length = 1000
+    if shape == "sorted":
+        keys = sorted(random.randint(0, 100) for _ in range(length))
+    elif shape == "reversed":
+        keys = sorted((random.randint(0, 100) for _ in range(length)), reverse=True)
+    elif shape == "nearly_sorted":
+        keys = list(range(length - 20)) + [random.randint(0, length) for _ in range(20)]
+    elif shape == "sawtooth":
+        keys = [i % 37 for i in range(length)]
+    elif shape == "few_unique":
+        keys = [random.randint(0, 3) for _ in range(length)]
+    else:
+        keys = [random.randint(0, length) for _ in range(length)]
+    arr = [Record(key, tag) for tag, key in enumerate(keys)]
+    expected = sorted(arr, key=lambda r: r.key)
+
+    adaptive_sort(arr)
+    assert [r.tag for r in arr] == [r.tag for r in expected]
+
+
+def test_adaptive_sort_sub_range():
+    """Test the adaptive sort respects start/end."""
+    arr = list(range(100, 0, -1))
+    adaptive_sort(arr, 10, 90, backend=Backend.Python)
+    assert arr == (
+        list(range(100, 90, -1)) + list(range(11, 91)) + list(range(10, 0, -1))
+    )
+
+
+def test_insertion_sort():
+    """Test insertion sort on a sub-range."""
+    arr = [5, 3, 1, 4, 2, 0]
+    insertion_sort(arr, 1, 5)
+    assert arr == [5, 1, 2, 3, 4, 0]
+
+
 def test_quick_sort_basic():
     """Test quick sort with basic input."""
     arr = [1, 4, 8, 95, 20, 400, 83, 44, 0, 11, 4444, 3]
@@ -91,8 +219,108 @@ def test_partition():
             assert arr[i] >= arr[new_pivot_index]
 
 
+@pytest.mark.parametrize("i_pivot", [0, 3, 7, 11])
+def test_partition3(i_pivot):
+    """Test three-way partition returns the bounds of the pivot block."""
+    arr = [5, 1, 5, 9, 3, 5, 7, 5, 0, 5, 2, 8]
+    pivot_value = arr[i_pivot]
+
+    lt, gt = partition3(arr, 0, len(arr), i_pivot)
+
+    assert sorted(arr) == sorted([5, 1, 5, 9, 3, 5, 7, 5, 0, 5, 2, 8])
+    assert all(x < pivot_value for x in arr[:lt])
+    assert all(x == pivot_value for x in arr[lt:gt])
+    assert all(x > pivot_value for x in arr[gt:])
+    assert gt - lt == arr.count(pivot_value)
+
+
+def test_partition3_invalid():
+    """Test three-way partition rejects invalid indices."""
+    with pytest.raises(ValueError):
+        partition3([], 0, 0, 0)
+    with pytest.raises(ValueError):
+        partition3([1, 2, 3], 0, 3, 3)
+
+
+def test_heap_sort_sub_range():
+    """Test heap sort only touches the requested range."""
+    arr = [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
+    heap_sort(arr, 2, 8)
+    assert arr == [9, 8, 2, 3, 4, 5, 6, 7, 1, 0]
+
+
+@pytest.mark.parametrize("pivot_type", list(QsPivot))
+@pytest.mark.parametrize("introsort", [True, False])
+def test_quick_sort_few_unique(pivot_type, introsort):
+    """Test quick sort on many duplicates, e.g. a status-code column."""
+    arr = [random.choice([200, 301, 404, 500, 503]) for _ in range(5000)]
+    expected = sorted(arr)
+    quick_sort(arr, pivot=pivot_type, introsort=introsort)
+    assert arr == expected
+
+
+@pytest.mark.parametrize("pivot_type", [QsPivot.First, QsPivot.Last])
+def test_quick_sort_introsort_fallback(pivot_type):
+    """Test introsort finishes worst-case inputs through heap sort."""
+    arr = list(range(20000))
+    quick_sort(arr, pivot=pivot_type)
+    assert arr == list(range(20000))
+
+
+ALL_SORTS = [
+    insertion_sort, merge_sort, merge_sort_bottom_up, quick_sort, heap_sort,
+    adaptive_sort,
+]
+
+
+@pytest.mark.parametrize("sort_func", ALL_SORTS)
+@pytest.mark.parametrize("reverse", [False, True])
+def test_sort_key_reverse(sort_func, reverse):
+    """Test key= and reverse= match sorted() including stability."""
+    records = [(random.randint(0, 9), tag) for tag in range(200)]
+    expected = sorted(records, key=lambda r: r[0], reverse=reverse)
+    arr = records.copy()
+    sort_func(arr, key=lambda r: r[0], reverse=reverse)
+    assert arr == expected
+
+
+@pytest.mark.parametrize("sort_func", ALL_SORTS)
+def test_sort_key_called_once_per_element(sort_func):
+    """Test the key function is evaluated exactly once per element."""
+    calls = []
+
+    def key(x):
+        calls.append(x)
+        return -x
+
+    arr = [random.randint(0, 1000) for _ in range(100)]
+    expected = sorted(arr, key=key)
+    calls.clear()
+    sort_func(arr, key=key)
+    assert arr == expected
+    assert len(calls) == 100
+
+
+@pytest.mark.parametrize("sort_func", ALL_SORTS)
+def test_sort_reverse_sub_range(sort_func):
+    """Test reverse sorting respects start/end."""
+    arr = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3]
+    sort_func(arr, 2, 8, reverse=True)
+    assert arr == [3, 1, 9, 6, 5, 4, 2, 1, 5, 3]
+
+
+def test_sort_key_uncomparable_elements():
+    """Test elements without ordering can be sorted through a key."""
+    arr = [{"id": 3}, {"id": 1}, {"id": 2}]
+    quick_sort(arr, key=lambda d: d["id"])
+    assert arr == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
 # Parameterized tests (pytest feature)
-@pytest.mark.parametrize("sort_func", [merge_sort, quick_sort])
+@pytest.mark.parametrize(
+    "sort_func",
+    [merge_sort, merge_sort_bottom_up, quick_sort, heap_sort, adaptive_sort],
+)
 def test_sorting_algorithms(sort_func):
     """Test multiple sorting algorithms with same data."""
     arr = [64, 34, 25, 12, 22, 11, 90]
@@ -102,7 +330,7 @@ def test_sorting_algorithms(sort_func):
     assert arr == expected
 
 
-@pytest.mark.parametrize("pivot_type", [QsPivot.First, QsPivot.Last, QsPivot.Random])
+@pytest.mark.parametrize("pivot_type", list(QsPivot))
 def test_quick_sort_pivot_types(pivot_type):
     """Test quick sort with different pivot strategies."""
     arr = [64, 34, 25, 12, 22, 11, 90]
@@ -113,7 +341,10 @@ def test_quick_sort_pivot_types(pivot_type):
 
 
 # Property-based testing with random data
-@pytest.mark.parametrize("sort_func", [merge_sort, quick_sort])
+@pytest.mark.parametrize(
+    "sort_func",
+    [merge_sort, merge_sort_bottom_up, quick_sort, heap_sort, adaptive_sort],
+)
 def test_sorting_random_data(sort_func):
     """Test sorting with random data (property-based testing)."""
     for _ in range(10):  # Run multiple times with different random data
@@ -140,6 +371,16 @@ def test_merge_sort_performance(large_random_array):
     assert arr == expected
 
 
+@pytest.mark.parametrize("sort_func", [merge_sort, quick_sort, adaptive_sort])
+def test_python_backend_large(sort_func, large_random_array):
+    """Test the pure-Python kernels on input Auto would hand to NumPy."""
+    arr = large_random_array.copy()
+    expected = sorted(arr.copy())
+
+    sort_func(arr, backend=Backend.Python)
+    assert arr == expected
+
+
 def test_quick_sort_performance(large_random_array):
     """Test quick sort with large array (using fixture)."""
     arr = large_random_array.copy()
@@ -189,3 +430,117 @@ def test_quick_sort_stress():
         expected = sorted(arr.copy())
         quick_sort(arr)
         assert arr == expected
+
+
+@pytest.mark.parametrize("pivot_type", list(QsPivot))
+@pytest.mark.parametrize("reverse", [False, True])
+def test_quick_sort_iter(pivot_type, reverse):
+    """Test the generator yields the sorted order without touching its input."""
+    for length in (0, 1, 2, 16, 17, 500):
+        data = [random.randint(0, length // 3) for _ in range(length)]
+        original = data.copy()
+        result = list(quick_sort_iter(data, pivot=pivot_type, reverse=reverse))
+        assert result == sorted(data, reverse=reverse)
+        assert data == original
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_quick_sort_iter_stable_key(reverse):
+    """Test key and reverse keep equal elements in their original order."""
+    records = [Record(random.randint(0, 5), i) for i in range(300)]
+    result = list(quick_sort_iter(records, key=lambda r: r.key, reverse=reverse))
+    expected = sorted(records, key=lambda r: r.key, reverse=reverse)
+    assert [r.tag for r in result] == [r.tag for r in expected]
+
+
+def test_quick_sort_iter_lazy():
+    """Test the first elements come out without sorting the whole range."""
+    comparisons = 0
+
+    class Counted(int):
+        def __lt__(self, other):
+            nonlocal comparisons
+            comparisons += 1
+            return int(self) < int(other)
+
+    rng = random.Random(7)
+    data = [Counted(rng.randrange(10**6)) for _ in range(20000)]
+    first = list(itertools.islice(quick_sort_iter(data, seed=7), 10))
+    used = comparisons
+    assert first == sorted(data)[:10]
+    # A full sort needs about 1.4 n log2 n, i.e. ~400000 comparisons
+    assert used < 100000
+
+
+def test_quick_sort_iter_range_and_errors():
+    """Test start/end, adversarial pivots and invalid arguments."""
+    data = list(range(3000, 0, -1))
+    assert list(quick_sort_iter(data, 1000, 2000, QsPivot.First)) == sorted(
+        data[1000:2000]
+    )
+    with pytest.raises(ValueError):
+        quick_sort_iter(data, 5, 2)
+    with pytest.raises(ValueError):
+        quick_sort_iter(data, pivot="random")
+
+
+@pytest.mark.parametrize("partition_func", [partition, block_partition])
+def test_two_way_partitions(partition_func):
+    """Test Hoare and block partitions on many sizes, duplicates and pivots."""
+    for length in (1, 2, 3, 64, 129, 130, 1000):
+        for values in (length, 3):
+            arr = [random.randrange(values) for _ in range(length)]
+            original = sorted(arr)
+            i_pivot = random.randrange(length)
+            pivot_value = arr[i_pivot]
+            position = partition_func(arr, 0, length, i_pivot)
+            assert arr[position] == pivot_value
+            assert all(x <= pivot_value for x in arr[:position])
+            assert all(x >= pivot_value for x in arr[position + 1:])
+            assert sorted(arr) == original
+
+
+def test_block_partition_sub_range():
+    """Test the block partition leaves elements outside the range alone."""
+    arr = list(range(500, 0, -1))
+    position = block_partition(arr, 100, 400, 250)
+    assert arr[:100] == list(range(500, 400, -1))
+    assert arr[400:] == list(range(100, 0, -1))
+    assert arr[position] == 250
+    with pytest.raises(ValueError):
+        block_partition(arr, 0, 10, 10)
+
+
+@pytest.mark.parametrize("scheme", list(QsPartition))
+@pytest.mark.parametrize("pivot_type", list(QsPivot))
+def test_quick_sort_schemes(scheme, pivot_type):
+    """Test every partition scheme with every pivot strategy."""
+    for data in (
+        [random.randint(0, 1000) for _ in range(1000)],
+        [random.randint(0, 3) for _ in range(1000)],
+        list(range(1000)),
+    ):
+        arr = data.copy()
+        quick_sort(arr, pivot=pivot_type, scheme=scheme, backend=Backend.Python)
+        assert arr == sorted(data)
+
+
+def test_quick_sort_seed_reproducible():
+    """Test a seed makes the random pivots, hence the comparisons, repeatable."""
+    calls = []
+
+    class Counted(int):
+        def __lt__(self, other):
+            calls.append(1)
+            return int(self) < int(other)
+
+    data = [Counted(random.randrange(10**6)) for _ in range(500)]
+    counts = []
+    for _ in range(2):
+        calls.clear()
+        quick_sort(data.copy(), seed=42, scheme=QsPartition.Hoare)
+        counts.append(len(calls))
+    assert counts[0] == counts[1]
+    assert list(quick_sort_iter(data, seed=7)) == sorted(data)
+    with pytest.raises(ValueError):
+        quick_sort(data.copy(), scheme="hoare")